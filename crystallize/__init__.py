@@ -35,6 +35,7 @@ from crystallize.core import (
     explore,
 )
 from crystallize.context import Context
+from crystallize.http import HTTPPool
 from crystallize.protocol import (
     HiddenVariable,
     HiddenVariablesReport,
@@ -56,6 +57,7 @@ __all__ = [
     "ConfirmRun",
     "HypothesisResult",
     "Context",
+    "HTTPPool",
     "IntegrityStatus",
     "HiddenVariable",
     "HiddenVariablesReport",
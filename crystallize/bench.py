@@ -0,0 +1,227 @@
+"""Benchmark of the ctx.http instrumentation overhead.
+
+Drives explore() against a local MockLLMServer at several concurrency
+levels. Each level runs the same batch of chat-completion calls in two
+modes, over the same HTTPPool:
+
+    baseline       the pool's requests.Session, called directly (audit="none")
+    instrumented   ctx.http with audit="calls" (or "sample")
+
+It reports throughput and the wall time the instrumentation adds per
+call: provenance snapshots, deferred analysis, telemetry and protocol
+summaries. Each mode runs ``repeats`` times and the fastest run counts.
+
+Usage
+-----
+    python -m crystallize.bench [--levels 1 8 32] [--calls 512]
+        [--latency-ms 20] [--jitter 0.3] [--rate-limit 0.05] [--audit calls]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .core import explore
+from .http import HTTPPool, _import_requests
+from .memory import MemoryStore
+from .mock_llm import MockLLMServer
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one concurrency level.
+
+    Attributes
+    ----------
+    concurrency : int
+        Calls in flight at once
+    calls : int
+        Calls made per run
+    baseline_s : float
+        Wall time of the uninstrumented run
+    instrumented_s : float
+        Wall time of the instrumented run
+    statuses : dict
+        Response status counts of the instrumented run
+    """
+
+    concurrency: int
+    calls: int
+    baseline_s: float
+    instrumented_s: float
+    statuses: Dict[int, int]
+
+    @property
+    def baseline_throughput(self) -> float:
+        """Uninstrumented calls per second."""
+        return self.calls / self.baseline_s
+
+    @property
+    def throughput(self) -> float:
+        """Instrumented calls per second."""
+        return self.calls / self.instrumented_s
+
+    @property
+    def overhead_ms_per_call(self) -> float:
+        """Wall time added by instrumentation, per call, in milliseconds."""
+        return (self.instrumented_s - self.baseline_s) / self.calls * 1000
+
+
+def _make_calls(
+    post: Any, url: str, model: str, calls: int, concurrency: int
+) -> Dict[int, int]:
+    """Make ``calls`` chat completions, ``concurrency`` at a time."""
+    body = {
+        "model": model,
+        "messages": [{"role": "user", "content": "Say hello"}],
+        "temperature": 0,
+    }
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(
+            pool.map(lambda _: post(url, json=body).status_code, range(calls))
+        )
+    counts: Dict[int, int] = {}
+    for status in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def benchmark_http(
+    levels: Sequence[int] = (1, 8, 32),
+    calls: int = 512,
+    audit: str = "calls",
+    audit_rate: float = 0.1,
+    server: Optional[MockLLMServer] = None,
+    repeats: int = 3,
+) -> List[BenchmarkResult]:
+    """Measure instrumentation overhead at several concurrency levels.
+
+    Parameters
+    ----------
+    levels : sequence of int
+        Concurrency levels (calls in flight at once)
+    calls : int
+        Calls per run
+    audit : str
+        Audit level of the instrumented runs: "calls" or "sample"
+    audit_rate : float
+        Sampling rate for audit="sample"
+    server : MockLLMServer, optional
+        Server to call (started if needed); defaults to one with no latency,
+        which makes overhead most visible
+    repeats : int
+        Runs per mode; the fastest is reported
+
+    Returns
+    -------
+    list
+        BenchmarkResult per level
+    """
+    _import_requests()
+    own_server = server is None
+    server = (server or MockLLMServer()).start()
+    url = f"{server.url}/chat/completions"
+    results = []
+    try:
+        for concurrency in levels:
+            pool = HTTPPool(pool_size=concurrency)
+            statuses: Dict[int, int] = {}
+
+            def baseline(config: Dict[str, Any]) -> None:
+                post = pool.session().post
+                _make_calls(post, url, config["model"], calls, concurrency)
+
+            def instrumented(config: Dict[str, Any], ctx: Any) -> None:
+                counts = _make_calls(
+                    ctx.http.post, url, config["model"], calls, concurrency
+                )
+                statuses.update(counts)
+
+            modes = (
+                (baseline, {"audit": "none"}),
+                (instrumented, {"audit": audit, "audit_rate": audit_rate}),
+            )
+            timings = [float("inf"), float("inf")]
+            for _ in range(repeats):
+                # Alternate the modes so drift affects both alike
+                for i, (fn, kwargs) in enumerate(modes):
+                    start = time.perf_counter()
+                    with redirect_stdout(io.StringIO()):
+                        explore(
+                            fn,
+                            {"bench": {"model": server.model}},
+                            replicates=1,
+                            progress=False,
+                            store=MemoryStore(),
+                            http_pool=pool,
+                            **kwargs,
+                        )
+                    timings[i] = min(timings[i], time.perf_counter() - start)
+            results.append(BenchmarkResult(concurrency, calls, *timings, statuses))
+    finally:
+        if own_server:
+            server.stop()
+    return results
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """Render benchmark results as a table."""
+    lines = [
+        f"{'conc':>5} {'calls':>6} {'base/s':>9} {'instr/s':>9} "
+        f"{'overhead':>12}  statuses",
+    ]
+    for r in results:
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(r.statuses.items()))
+        lines.append(
+            f"{r.concurrency:>5} {r.calls:>6} {r.baseline_throughput:>9.0f} "
+            f"{r.throughput:>9.0f} {r.overhead_ms_per_call:>9.3f} ms  {statuses}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``python -m crystallize.bench``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m crystallize.bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=512, help="Calls per run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median latency")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Lognormal shape")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Share of 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 500s")
+    parser.add_argument("--audit", choices=["calls", "sample"], default="calls")
+    parser.add_argument("--audit-rate", type=float, default=0.1)
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per mode")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        latency_ms=args.latency_ms,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with server:
+        results = benchmark_http(
+            args.levels,
+            args.calls,
+            args.audit,
+            args.audit_rate,
+            server=server,
+            repeats=args.repeats,
+        )
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
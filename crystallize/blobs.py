@@ -0,0 +1,253 @@
+"""Content-addressed blob storage for Crystallize.
+
+Large replicate return values are stored once under
+``.crystallize/blobs/`` keyed by the SHA256 of their encoded bytes, and
+manifests hold only small references to them. Identical values are stored
+once across all runs. Values that are not JSON are converted the way
+manifests convert them (serialize.to_jsonable: NumPy values become lists
+and numbers, dataclasses dicts, anything else its str()), unless a codec
+such as "pickle" is chosen explicitly.
+
+A reference looks like::
+
+    {"$blob": "<sha256>", "codec": "json", "size": 123456}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .serialize import to_jsonable
+
+# Key marking a dict as a blob reference
+BLOB_REF_KEY = "$blob"
+
+
+@dataclass(frozen=True)
+class Codec:
+    """Serializer used to turn a value into blob bytes and back.
+
+    Attributes
+    ----------
+    name : str
+        Name recorded in blob references
+    encode : Callable
+        value -> bytes; may raise TypeError/ValueError for unsupported values
+    decode : Callable
+        bytes -> value
+    """
+
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True).encode()
+
+
+def _jsonable(value: Any) -> Any:
+    """JSON form of a value, with non-JSON parts converted by to_jsonable()."""
+    try:
+        return json.loads(json.dumps(value, default=to_jsonable))
+    except (TypeError, ValueError):
+        return repr(value)  # e.g. circular references
+
+
+_CODECS: Dict[str, Codec] = {
+    "json": Codec("json", _json_encode, lambda data: json.loads(data)),
+    # Local artifacts only: never load blobs from a store you do not trust
+    "pickle": Codec(
+        "pickle",
+        lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+    ),
+}
+
+
+def register_codec(codec: Codec) -> None:
+    """Register a codec so it can be used by name (e.g. msgpack, npz).
+
+    Parameters
+    ----------
+    codec : Codec
+        Codec to register; replaces any codec with the same name
+    """
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """Look up a registered codec by name."""
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown blob codec '{name}'. Registered codecs: {sorted(_CODECS)}"
+        ) from None
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference."""
+    return isinstance(value, dict) and BLOB_REF_KEY in value and "codec" in value
+
+
+class BlobStore:
+    """Content-addressed file store.
+
+    Blobs live at ``<root>/<sha[:2]>/<sha[2:]>`` and are written atomically;
+    writing content that already exists is a no-op.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        fsync: bool = True,
+        on_write: Optional[Callable[[Path], None]] = None,
+        submit: Optional[Callable[..., None]] = None,
+    ):
+        """Initialize the blob store.
+
+        Parameters
+        ----------
+        root : Path
+            Blob directory
+        fsync : bool
+            Whether to fsync new blobs before publishing them
+        on_write : Callable, optional
+            Called with the path of each newly written blob (used by the
+            batched durability mode to fsync it later)
+        submit : Callable, optional
+            ``submit(fn, *args)`` used to run file writes elsewhere, e.g. on
+            the store's background writer; put() still returns the digest
+            immediately
+        """
+        self.root = Path(root)
+        self._fsync = fsync
+        self._on_write = on_write
+        self._submit = submit
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def exists(self, digest: str) -> bool:
+        """Check whether a blob is stored."""
+        return self._path(digest).exists()
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their SHA256 digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest
+        if self._submit is not None:
+            self._submit(self._write, path, data)
+        else:
+            self._write(path, data)
+        return digest
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomically write one blob file."""
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            if self._on_write is not None:
+                self._on_write(path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def get(self, digest: str) -> bytes:
+        """Read a blob's bytes."""
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Blob {digest} is missing from {self.root}") from None
+
+    def put_value(self, value: Any, codec: str) -> Dict[str, Any]:
+        """Encode and store a value.
+
+        Returns
+        -------
+        dict
+            Blob reference
+        """
+        data = get_codec(codec).encode(value)
+        return {BLOB_REF_KEY: self.put(data), "codec": codec, "size": len(data)}
+
+    def get_value(self, ref: Dict[str, Any]) -> Any:
+        """Load the value behind a blob reference."""
+        return get_codec(ref["codec"]).decode(self.get(ref[BLOB_REF_KEY]))
+
+
+def externalize(
+    blobs: BlobStore,
+    value: Any,
+    threshold: int,
+    codec: Optional[str] = None,
+) -> Any:
+    """Replace a value with a blob reference if it is large.
+
+    Parameters
+    ----------
+    blobs : BlobStore
+        Where to store the blob
+    value : Any
+        A replicate return value
+    threshold : int
+        Values whose encoding exceeds this many bytes become blobs
+    codec : str, optional
+        Codec to use instead of JSON (e.g. "pickle"). By default values
+        that are not JSON-serializable are converted by
+        serialize.to_jsonable(). Values the codec cannot encode fall back
+        to the default.
+
+    Returns
+    -------
+    Any
+        The value (in JSON form), or a blob reference
+    """
+    if codec is not None and codec != "json":
+        encode = get_codec(codec).encode
+        try:
+            data = encode(value)
+        except Exception:
+            pass  # e.g. locks or lambdas cannot be pickled
+        else:
+            return {BLOB_REF_KEY: blobs.put(data), "codec": codec, "size": len(data)}
+
+    try:
+        data = _json_encode(value)
+    except (TypeError, ValueError):
+        value = _jsonable(value)
+        data = _json_encode(value)
+    if len(data) <= threshold:
+        return value
+    return {BLOB_REF_KEY: blobs.put(data), "codec": "json", "size": len(data)}
+
+
+def resolve(blobs: BlobStore, value: Any) -> Any:
+    """Load a value if it is a blob reference; return it unchanged otherwise."""
+    if is_blob_ref(value):
+        return blobs.get_value(value)
+    return value
@@ -0,0 +1,205 @@
+"""HTTP record/replay cassettes for Crystallize.
+
+With ``explore(http_mode="record")`` every ctx.http response is saved, keyed
+on a canonical hash of the request's method, URL, query parameters and
+body. ``explore(http_mode="replay")`` then serves those responses without
+touching the network, so metric code can be iterated on for free.
+
+Storage (under the store root):
+    cassettes/http.jsonl  # append-only index, one entry per recorded response
+    blobs/                # response bodies, content-addressed (deduplicated)
+
+Headers are not part of the key, so API keys never influence (or leak into)
+it. Replay is for exploration only; crystallize() always goes live.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .blobs import BlobStore
+
+# Supported http_mode values
+HTTP_MODES = ("live", "record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Raised on replay when no response was recorded for a request."""
+
+
+def validate_http_mode(http_mode: str) -> str:
+    """Check an http_mode value."""
+    if http_mode not in HTTP_MODES:
+        raise ValueError(f"Unknown http_mode {http_mode!r}; expected one of {HTTP_MODES}")
+    return http_mode
+
+
+def _canonical_body(kwargs: Dict[str, Any]) -> Any:
+    """Body of a request in a stable, hashable form."""
+    if kwargs.get("json") is not None:
+        return {"json": kwargs["json"]}
+    data = kwargs.get("data")
+    if isinstance(data, dict):
+        return {"data": sorted((str(k), str(v)) for k, v in data.items())}
+    if isinstance(data, bytes):
+        return {"data": hashlib.sha256(data).hexdigest()}
+    if data is not None:
+        return {"data": str(data)}
+    return None
+
+
+def _canonical_headers(headers: Any) -> Any:
+    """Request headers with lower-cased names, sorted (None if there are none)."""
+    if not headers:
+        return None
+    return sorted((str(k).lower(), str(v).strip()) for k, v in dict(headers).items())
+
+
+def request_key(
+    method: str, url: str, kwargs: Dict[str, Any], include_headers: bool = False
+) -> str:
+    """Canonical SHA256 key of a request (method, URL, params, body).
+
+    Headers are left out by default, so recordings replay whatever the
+    credentials; single-flight keys include them, so requests that differ
+    only in e.g. ``Authorization`` or a routing header are never shared.
+
+    Parameters
+    ----------
+    method : str
+        HTTP method
+    url : str
+        Request URL
+    kwargs : dict
+        Keyword arguments given to ctx.http (``params``, ``json``, ``data``,
+        ``headers``)
+    include_headers : bool
+        Also key on the request's ``headers`` (names compared
+        case-insensitively)
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    params = kwargs.get("params")
+    if isinstance(params, dict):
+        params = sorted((str(k), str(v)) for k, v in params.items())
+    parts = [method.upper(), url, params, _canonical_body(kwargs)]
+    if include_headers:
+        parts.append(_canonical_headers(kwargs.get("headers")))
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Cassette:
+    """Indexed store of recorded HTTP responses.
+
+    Bodies go to a BlobStore when one is given, and stay in memory
+    otherwise (e.g. for MemoryStore).
+    """
+
+    def __init__(self, index_path: Optional[Path] = None, blobs: Optional[BlobStore] = None):
+        """Open a cassette, loading its index.
+
+        Parameters
+        ----------
+        index_path : Path, optional
+            JSON-lines index file; None keeps the cassette in memory
+        blobs : BlobStore, optional
+            Where response bodies are stored
+        """
+        self.index_path = Path(index_path) if index_path is not None else None
+        self._blobs = blobs
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        if self.index_path is not None and self.index_path.exists():
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line
+                    self._entries[entry["key"]] = entry
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def digests(self) -> set:
+        """Body digests referenced by the index (for garbage collection)."""
+        return {entry["body"] for entry in self._entries.values()}
+
+    def record(self, key: str, method: str, url: str, response: Any) -> None:
+        """Save a response.
+
+        Parameters
+        ----------
+        key : str
+            request_key() of the request
+        method, url : str
+            The request (kept for inspection)
+        response : requests.Response
+            The live response; its body is read in full
+        """
+        body = response.content or b""
+        if self._blobs is not None:
+            digest = self._blobs.put(body)
+        else:
+            digest = hashlib.sha256(body).hexdigest()
+            self._bodies[digest] = body
+        entry = {
+            "key": key,
+            "method": method.upper(),
+            "url": url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "body": digest,
+            "size": len(body),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            if self.index_path is not None:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def replay(self, key: str, method: str, url: str) -> Any:
+        """Build a requests.Response from a recorded entry.
+
+        Raises
+        ------
+        CassetteMiss
+            If nothing was recorded for this request
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            raise CassetteMiss(
+                f"No recorded response for {method.upper()} {url}; "
+                "run explore(http_mode='record') first"
+            )
+        if self._blobs is not None:
+            body = self._blobs.get(entry["body"])
+        else:
+            body = self._bodies[entry["body"]]
+
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.encoding = entry.get("encoding")
+        response.url = entry.get("url", url)
+        response._content = body
+        return response
@@ -0,0 +1,363 @@
+"""Run catalog for Crystallize.
+
+A compact SQLite index of every run in a store, so listing and querying runs
+does not require opening each manifest.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    lineage_id TEXT,
+    parent_run_id TEXT,
+    hypothesis TEXT,
+    integrity TEXT,
+    supported INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    has_prereg INTEGER NOT NULL DEFAULT 0,
+    has_manifest INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS run_configs (
+    run_id TEXT NOT NULL,
+    config_name TEXT NOT NULL,
+    config_fingerprint TEXT NOT NULL,
+    PRIMARY KEY (run_id, config_name)
+);
+CREATE TABLE IF NOT EXISTS run_stats (
+    run_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    config_name TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    PRIMARY KEY (run_id, metric, config_name)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_lineage
+    ON runs (lineage_id, type, integrity, supported);
+CREATE INDEX IF NOT EXISTS idx_runs_parent ON runs (parent_run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS idx_run_configs_fp ON run_configs (config_fingerprint);
+"""
+
+# Columns merged on upsert: a NULL in the new row keeps the stored value
+_MERGE_COLUMNS = (
+    "type",
+    "lineage_id",
+    "parent_run_id",
+    "hypothesis",
+    "integrity",
+    "supported",
+)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def run_type_of(run_id: str) -> str:
+    """Infer the run type ("explore" or "confirm") from a run ID."""
+    return "confirm" if run_id.startswith("conf_") else "explore"
+
+
+class Catalog:
+    """SQLite index of runs, prereg artifacts and their config fingerprints.
+
+    Every update runs in a single transaction, so the catalog never holds a
+    half-written entry. The catalog is derived data: it can always be rebuilt
+    from the manifests and prereg artifacts with Store.rebuild_catalog().
+    """
+
+    def __init__(self, path: Union[str, Path], *, synchronous: str = "FULL"):
+        """Initialize the catalog.
+
+        Parameters
+        ----------
+        path : str or Path
+            SQLite database file (":memory:" for an in-memory catalog)
+        synchronous : str
+            SQLite synchronous pragma ("FULL", "NORMAL" or "OFF")
+        """
+        self.path = path
+        self._synchronous = synchronous
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Lazily open the database and create the schema."""
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if str(self.path) != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def record_run(
+        self,
+        run_id: str,
+        *,
+        lineage_id: Optional[str] = None,
+        parent_run_id: Optional[str] = None,
+        hypothesis: Optional[str] = None,
+        integrity: Optional[str] = None,
+        supported: Optional[bool] = None,
+        created_at: Optional[str] = None,
+        config_fingerprints: Optional[Dict[str, str]] = None,
+        prereg: bool = False,
+        manifest: bool = False,
+    ) -> None:
+        """Insert or update the entry for a run.
+
+        Parameters
+        ----------
+        run_id : str
+            Run ID
+        lineage_id, parent_run_id, hypothesis, integrity : str, optional
+            Run attributes; None keeps any previously stored value
+        supported : bool, optional
+            Whether the hypothesis was supported
+        created_at : str, optional
+            ISO timestamp; defaults to now for new entries
+        config_fingerprints : dict, optional
+            {config_name: fingerprint}
+        prereg : bool
+            Mark that a prereg artifact exists
+        manifest : bool
+            Mark that a run manifest exists
+        """
+        now = _now()
+        row = {
+            "run_id": run_id,
+            "type": run_type_of(run_id),
+            "lineage_id": lineage_id,
+            "parent_run_id": parent_run_id,
+            "hypothesis": hypothesis,
+            "integrity": integrity,
+            "supported": None if supported is None else int(bool(supported)),
+            "created_at": created_at or now,
+            "updated_at": now,
+            "has_prereg": int(prereg),
+            "has_manifest": int(manifest),
+        }
+        updates = ", ".join(
+            f"{col} = COALESCE(excluded.{col}, runs.{col})" for col in _MERGE_COLUMNS
+        )
+        sql = (
+            f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))}) "
+            f"ON CONFLICT(run_id) DO UPDATE SET {updates}, "
+            "created_at = COALESCE(runs.created_at, excluded.created_at), "
+            "updated_at = excluded.updated_at, "
+            "has_prereg = MAX(runs.has_prereg, excluded.has_prereg), "
+            "has_manifest = MAX(runs.has_manifest, excluded.has_manifest)"
+        )
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(sql, tuple(row.values()))
+                if manifest:
+                    # A (re)written manifest invalidates cached statistics
+                    conn.execute("DELETE FROM run_stats WHERE run_id = ?", (run_id,))
+                if config_fingerprints:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO run_configs VALUES (?, ?, ?)",
+                        [(run_id, name, fp) for name, fp in config_fingerprints.items()],
+                    )
+
+    def remove_run(self, run_id: str) -> None:
+        """Remove a run from the catalog."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+                conn.execute("DELETE FROM run_configs WHERE run_id = ?", (run_id,))
+                conn.execute("DELETE FROM run_stats WHERE run_id = ?", (run_id,))
+
+    def clear(self) -> None:
+        """Remove every entry (used before a rebuild)."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM runs")
+                conn.execute("DELETE FROM run_configs")
+                conn.execute("DELETE FROM run_stats")
+
+    def query(
+        self,
+        *,
+        run_type: Optional[str] = None,
+        lineage: Optional[str] = None,
+        parent: Optional[str] = None,
+        hypothesis: Optional[str] = None,
+        integrity: Optional[str] = None,
+        supported: Optional[bool] = None,
+        config_fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find runs matching all given filters, newest first.
+
+        Parameters
+        ----------
+        run_type : str, optional
+            "explore" or "confirm"
+        lineage : str, optional
+            Lineage ID
+        parent : str, optional
+            Parent (explore) run ID
+        hypothesis : str, optional
+            Exact hypothesis string
+        integrity : str, optional
+            Integrity status value, e.g. "VALID"
+        supported : bool, optional
+            Whether the hypothesis was supported
+        config_fingerprint : str, optional
+            Runs that used a config with this fingerprint
+        since, until : str, optional
+            ISO timestamp bounds on created_at (inclusive)
+        limit : int, optional
+            Maximum number of rows
+
+        Returns
+        -------
+        list
+            Run entries as dicts, including a config_fingerprints mapping
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("type", run_type),
+            ("lineage_id", lineage),
+            ("parent_run_id", parent),
+            ("hypothesis", hypothesis),
+            ("integrity", getattr(integrity, "value", integrity)),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if supported is not None:
+            clauses.append("supported = ?")
+            params.append(int(bool(supported)))
+        if config_fingerprint is not None:
+            clauses.append(
+                "run_id IN (SELECT run_id FROM run_configs WHERE config_fingerprint = ?)"
+            )
+            params.append(config_fingerprint)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(until)
+
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, run_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            conn = self._connect()
+            rows = [dict(r) for r in conn.execute(sql, params)]
+            if not rows:
+                return []
+
+            fps: Dict[str, Dict[str, str]] = {r["run_id"]: {} for r in rows}
+            ids = list(fps)
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i : i + 500]
+                for cfg in conn.execute(
+                    "SELECT * FROM run_configs WHERE run_id IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    fps[cfg["run_id"]][cfg["config_name"]] = cfg["config_fingerprint"]
+
+        for r in rows:
+            r["supported"] = None if r["supported"] is None else bool(r["supported"])
+            r["has_prereg"] = bool(r["has_prereg"])
+            r["has_manifest"] = bool(r["has_manifest"])
+            r["config_fingerprints"] = fps[r["run_id"]]
+        return rows
+
+    def get_run_stats(
+        self, run_id: str, metric: str
+    ) -> Optional[Dict[str, Tuple[int, float, float]]]:
+        """Get cached per-config sufficient statistics of a run's metric.
+
+        Returns
+        -------
+        dict or None
+            {config_name: (n, mean, m2)}, or None if not cached
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT config_name, n, mean, m2 FROM run_stats WHERE run_id = ? AND metric = ?",
+                (run_id, metric),
+            ).fetchall()
+        if not rows:
+            return None
+        # An empty config_name marks "computed, metric not recorded"
+        return {r["config_name"]: (r["n"], r["mean"], r["m2"]) for r in rows if r["config_name"]}
+
+    def put_run_stats(
+        self, run_id: str, metric: str, stats: Dict[str, Tuple[int, float, float]]
+    ) -> None:
+        """Cache per-config sufficient statistics ({config: (n, mean, m2)})."""
+        rows = [(run_id, metric, config, *values) for config, values in stats.items()]
+        if not rows:
+            rows = [(run_id, metric, "", 0, 0.0, 0.0)]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO run_stats VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def count(self) -> int:
+        """Number of runs in the catalog."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+def catalog_entry_from_manifest(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract catalog fields from a run manifest (or its metadata sidecar)."""
+    return {
+        "lineage_id": manifest.get("lineage_id"),
+        "parent_run_id": manifest.get("parent_run_id"),
+        "hypothesis": manifest.get("hypothesis"),
+        "integrity": manifest.get("integrity"),
+        "supported": manifest.get("supported"),
+        "config_fingerprints": manifest.get("config_fingerprints"),
+    }
+
+
+def catalog_entry_from_prereg(prereg: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract catalog fields from a pre-registration artifact."""
+    return {
+        "lineage_id": prereg.get("lineage_id"),
+        "parent_run_id": prereg.get("parent_run_id"),
+        "hypothesis": prereg.get("hypothesis"),
+        "created_at": prereg.get("timestamp"),
+        "config_fingerprints": prereg.get("config_fingerprints"),
+    }
+
@@ -0,0 +1,117 @@
+"""Command-line interface for Crystallize store maintenance.
+
+Usage
+-----
+    python -m crystallize runs [--lineage LIN] [--type confirm] [--integrity VALID]
+    python -m crystallize catalog rebuild
+    python -m crystallize gc [--keep N] [--older-than 30d] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from .store import DEFAULT_ROOT, Store
+
+
+def _cmd_runs(store: Store, args: argparse.Namespace) -> int:
+    """List runs from the catalog as JSON lines."""
+    supported = None
+    if args.supported is not None:
+        supported = args.supported == "yes"
+    rows = store.query(
+        run_type=args.type,
+        lineage=args.lineage,
+        parent=args.parent,
+        integrity=args.integrity,
+        supported=supported,
+        limit=args.limit,
+    )
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+def _cmd_catalog_rebuild(store: Store, args: argparse.Namespace) -> int:
+    """Rebuild the run catalog from files on disk."""
+    count = store.rebuild_catalog()
+    print(f"Indexed {count} runs in {store.catalog.path}")
+    return 0
+
+
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def _parse_duration(value: str) -> timedelta:
+    """Parse a duration like "90s", "12h" or "30d"."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", value.strip())
+    if match is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid duration {value!r}; use a number followed by s, m, h, d or w"
+        )
+    return timedelta(**{_DURATION_UNITS[match.group(2)]: float(match.group(1))})
+
+
+def _cmd_gc(store: Store, args: argparse.Namespace) -> int:
+    """Remove unneeded runs, blobs and temp files."""
+    report = store.gc(keep=args.keep, older_than=args.older_than, dry_run=args.dry_run)
+    for run_id in report.removed_runs:
+        print(run_id)
+    print(report.summary())
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog="crystallize", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Store root directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    runs = sub.add_parser("runs", help="List runs from the catalog")
+    runs.add_argument("--type", choices=["explore", "confirm"])
+    runs.add_argument("--lineage")
+    runs.add_argument("--parent")
+    runs.add_argument("--integrity")
+    runs.add_argument("--supported", choices=["yes", "no"])
+    runs.add_argument("--limit", type=int)
+    runs.set_defaults(handler=_cmd_runs)
+
+    catalog = sub.add_parser("catalog", help="Manage the run catalog")
+    catalog_sub = catalog.add_subparsers(dest="catalog_command", required=True)
+    rebuild = catalog_sub.add_parser("rebuild", help="Rebuild the catalog from disk")
+    rebuild.set_defaults(handler=_cmd_catalog_rebuild)
+
+    gc = sub.add_parser("gc", help="Remove old explore runs, unused blobs and temp files")
+    gc.add_argument("--keep", type=int, help="Keep the N most recent explore runs")
+    gc.add_argument(
+        "--older-than", type=_parse_duration, help="Only remove runs older than e.g. 30d"
+    )
+    gc.add_argument("--dry-run", action="store_true", help="Report without deleting")
+    gc.set_defaults(handler=_cmd_gc)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``python -m crystallize``."""
+    args = build_parser().parse_args(argv)
+    # Every subcommand works on an existing store; opening a mistyped root
+    # would otherwise create an empty store there.
+    if not Path(args.root).is_dir():
+        print(f"crystallize: no store at {args.root}", file=sys.stderr)
+        return 2
+    store = Store(args.root)
+    try:
+        return args.handler(store, args)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Optional compression for stored artifacts.
+
+Manifests and prereg artifacts can be written gzip- or zstd-compressed.
+Readers detect the format from the file's magic bytes, so compressed and
+plain files can live side by side.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+# File suffix for each supported compression
+SUFFIXES = {
+    None: ".json",
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def validate_compression(compression: Optional[str]) -> Optional[str]:
+    """Check a compression name, importing zstandard if needed.
+
+    Parameters
+    ----------
+    compression : str, optional
+        None, "gzip" or "zstd"
+
+    Returns
+    -------
+    str or None
+        The validated name
+    """
+    if compression not in SUFFIXES:
+        raise ValueError(
+            f"Unknown compression {compression!r}; expected one of: None, 'gzip', 'zstd'"
+        )
+    if compression == "zstd":
+        _import_zstandard()
+    return compression
+
+
+def _import_zstandard() -> Any:
+    """Lazily import zstandard."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The 'zstandard' library is required for zstd compression. "
+            "Install it with: pip install zstandard"
+        )
+    return zstandard
+
+
+def strip_suffix(name: str) -> Optional[str]:
+    """Get the artifact ID from a stored file name, or None if not an artifact."""
+    if name.startswith(".tmp_") or name.endswith(".meta.json"):
+        return None
+    for suffix in (".json.gz", ".json.zst", ".json"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+@contextmanager
+def open_text_writer(raw: IO[bytes], compression: Optional[str]) -> Iterator[IO[str]]:
+    """Wrap a binary file in a (possibly compressing) UTF-8 text stream.
+
+    The compressor streams into ``raw``; ``raw`` itself is left open so the
+    caller can fsync it.
+    """
+    if compression == "gzip":
+        stream: Any = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+    elif compression == "zstd":
+        stream = _import_zstandard().ZstdCompressor().stream_writer(raw, closefd=False)
+    else:
+        stream = None
+
+    text = io.TextIOWrapper(stream if stream is not None else raw, encoding="utf-8")
+    try:
+        yield text
+        text.flush()
+    finally:
+        text.detach()
+        if stream is not None:
+            stream.close()
+
+
+@contextmanager
+def open_text_reader(path: Path) -> Iterator[IO[str]]:
+    """Open a stored artifact for reading, decompressing if needed."""
+    with open(path, "rb") as raw:
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic.startswith(_GZIP_MAGIC):
+            stream: Any = gzip.GzipFile(fileobj=raw, mode="rb")
+        elif magic == _ZSTD_MAGIC:
+            stream = _import_zstandard().ZstdDecompressor().stream_reader(raw)
+        else:
+            stream = raw
+        with io.TextIOWrapper(stream, encoding="utf-8") as text:
+            yield text
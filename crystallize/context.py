@@ -1,14 +1,26 @@
 """Execution context for Crystallize experiments.
 
 Provides ctx.record() for metrics and ctx.http for instrumented HTTP calls.
+While a replicate runs, its Context is also available via current_context(),
+which lets transport hooks (crystallize.transports) audit calls made by
+other HTTP clients.
 """
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-from .http import InstrumentedHTTP, NoAuditHTTP
+from .cassette import Cassette
+from .http import CallSampler, HTTPPool, InstrumentedHTTP, NoAuditHTTP
+from .protocol import ValueInterner
+
+# Context of the replicate running in the current thread or asyncio task
+_current: ContextVar[Optional["Context"]] = ContextVar(
+    "crystallize_context", default=None
+)
 
 
 @dataclass
@@ -108,6 +120,12 @@ class Context:
             return self._http.events
         return []
 
+    def _get_call_count(self) -> int:
+        """Get the number of HTTP calls made, sampled or not (internal)."""
+        if isinstance(self._http, InstrumentedHTTP):
+            return self._http.call_count
+        return 0
+
 
 def create_context(
     replicate: int,
@@ -117,6 +135,11 @@ def create_context(
     seed: Optional[int] = None,
     replicate_id: Optional[str] = None,
     audit: str = "calls",
+    http_pool: Optional[HTTPPool] = None,
+    http_mode: str = "live",
+    cassette: Optional[Cassette] = None,
+    interner: Optional[ValueInterner] = None,
+    sampler: Optional[CallSampler] = None,
 ) -> Context:
     """Create a new context for a replicate.
 
@@ -135,7 +158,17 @@ def create_context(
     replicate_id : str, optional
         Global replicate ID
     audit : str
-        Audit level: "calls" or "none"
+        Audit level: "calls", "sample" or "none"
+    http_pool : HTTPPool, optional
+        Connection pool shared with the run's other replicates
+    http_mode : str
+        "live", "record" or "replay"
+    cassette : Cassette, optional
+        Recorded responses (required unless http_mode is "live")
+    interner : ValueInterner, optional
+        Compacts large protocol field values (shared across the run)
+    sampler : CallSampler, optional
+        Chooses the calls to analyze (required for audit="sample")
 
     Returns
     -------
@@ -151,13 +184,46 @@ def create_context(
     )
 
     # Set up HTTP client based on audit level
-    if audit == "calls":
+    if audit == "sample" and sampler is None:
+        raise ValueError("audit='sample' requires a CallSampler")
+    if audit in ("calls", "sample"):
         ctx._http = InstrumentedHTTP(
             config=config,
             config_name=config_name,
             config_fingerprint=config_fingerprint,
+            pool=http_pool,
+            http_mode=http_mode,
+            cassette=cassette,
+            interner=interner,
+            sampler=sampler if audit == "sample" else None,
+            sample_key=replicate_id or f"{config_fingerprint}:{replicate}",
+            record=ctx.record,
         )
     else:
         ctx._http = NoAuditHTTP()
 
     return ctx
+
+
+def current_context() -> Optional[Context]:
+    """Get the Context of the replicate running in this thread or task.
+
+    Returns
+    -------
+    Context or None
+        None outside a replicate. Threads started by the experiment
+        function do not inherit it; run them with
+        ``contextvars.copy_context().run`` to do so (asyncio tasks inherit
+        it automatically).
+    """
+    return _current.get()
+
+
+@contextmanager
+def active_context(ctx: Context) -> Iterator[Context]:
+    """Make a Context current while a replicate runs."""
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
@@ -16,8 +16,10 @@ from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
-from .context import create_context
+from .cassette import validate_http_mode
+from .context import active_context, create_context
 from .fingerprint import fn_fingerprint, fingerprints_match
+from .http import CallSampler, HTTPPool
 from .ids import config_fingerprint, generate_lineage_id, generate_run_id, manifest_hash
 from .integrity import (
     IntegrityStatus,
@@ -25,9 +27,17 @@ from .integrity import (
     compute_integrity,
     format_integrity_header,
 )
-from .protocol import HiddenVariablesReport, ProtocolDiff, ProtocolSummary
+from .lazy import UNLOADED, LazySection, RunLoader
+from .memory import AnyStore
+from .protocol import (
+    HiddenVariableAggregator,
+    HiddenVariablesReport,
+    ProtocolDiff,
+    ProtocolSummary,
+    display_value,
+)
 from .stats import check_hypothesis
-from .store import Store, get_store
+from .store import get_store
 
 
 # Hypothesis parsing
@@ -66,6 +76,19 @@ def parse_hypothesis(hypothesis: str) -> ParsedHypothesis:
     )
 
 
+def _protocol_from_dict(data: Dict[str, Any]) -> Dict[str, ProtocolSummary]:
+    """Rebuild protocol summaries from a manifest section."""
+    return {name: ProtocolSummary.from_dict(summary) for name, summary in data.items()}
+
+
+def _read_meta(store: AnyStore, run_id: str) -> Dict[str, Any]:
+    """Read run metadata, raising if the run is not in the store."""
+    meta = store.read_run_meta(run_id)
+    if meta is None:
+        raise FileNotFoundError(f"No run '{run_id}' found in {store.runs_dir}")
+    return meta
+
+
 def _get_git_info() -> Dict[str, Any]:
     """Get git commit and dirty status."""
     try:
@@ -127,6 +150,13 @@ class HypothesisResult:
             "n_right": self.n_right,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HypothesisResult":
+        """Rebuild a result from its to_dict() form."""
+        values = dict(data)
+        values["ci"] = tuple(values.get("ci", (float("nan"), float("nan"))))
+        return cls(**values)
+
 
 @dataclass
 class ConfirmRun:
@@ -159,9 +189,11 @@ class ConfirmRun:
     fn_fingerprint : dict
         Function fingerprint
     results : dict
-        Raw return values
+        Raw return values (loaded lazily for stored runs)
     metrics : dict
-        Recorded metrics
+        Recorded metrics (loaded lazily for stored runs)
+    http_mode : str
+        "live" or "record" (confirm runs never replay)
     """
 
     run_id: str
@@ -176,9 +208,65 @@ class ConfirmRun:
     results_path: Optional[str] = None
     git: Dict[str, Any] = field(default_factory=dict)
     fn_fingerprint: Dict[str, Any] = field(default_factory=dict)
-    results: Dict[str, List[Any]] = field(default_factory=dict)
-    metrics: Dict[str, Dict[str, List[Any]]] = field(default_factory=dict)
+    results: Dict[str, List[Any]] = LazySection(default_factory=dict)
+    metrics: Dict[str, Dict[str, List[Any]]] = LazySection(default_factory=dict)
     replicate_range: Tuple[int, int] = (0, 0)
+    http_mode: str = "live"
+    _loader: Optional[RunLoader] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def load(
+        cls,
+        run_id: str,
+        *,
+        store_root: Optional[str] = None,
+        store: Optional[AnyStore] = None,
+    ) -> "ConfirmRun":
+        """Load a stored confirm run.
+
+        Only lightweight metadata is read here; ``results`` and ``metrics``
+        are read from the manifest on first access.
+
+        Parameters
+        ----------
+        run_id : str
+            ID of a confirm run (e.g. "conf_e5f6g7h8")
+        store_root : str, optional
+            Root directory for .crystallize storage (":memory:" for the
+            in-memory store)
+        store : Store or MemoryStore, optional
+            Store to read from instead of the global one
+
+        Returns
+        -------
+        ConfirmRun
+            The stored run
+        """
+        store = store or get_store(store_root)
+        meta = _read_meta(store, run_id)
+        if "hypothesis" not in meta:
+            raise ValueError(f"'{run_id}' is an explore run; use Experiment.load()")
+
+        hyp = meta.get("hypothesis_result")
+        return cls(
+            run_id=meta["run_id"],
+            parent_run_id=meta["parent_run_id"],
+            lineage_id=meta["lineage_id"],
+            hypothesis=meta["hypothesis"],
+            supported=meta.get("supported"),
+            hypothesis_result=HypothesisResult.from_dict(hyp) if hyp else None,
+            integrity=IntegrityStatus(meta.get("integrity", IntegrityStatus.INVALID.value)),
+            integrity_flags=list(meta.get("integrity_flags", [])),
+            prereg_path=meta.get("prereg_path"),
+            results_path=str(store.run_manifest_path(run_id)),
+            git=meta.get("git", {}),
+            fn_fingerprint=meta.get("fn_fingerprint", {}),
+            results=UNLOADED,
+            metrics=UNLOADED,
+            replicate_range=tuple(meta.get("replicate_range", (0, 0))),
+            http_mode=meta.get("http_mode", "live"),
+            _loader=RunLoader(store, run_id),
+        )
 
     def report(self) -> str:
         """Generate a formatted report of the confirm run."""
@@ -241,6 +329,7 @@ class ConfirmRun:
             "results": self.results,
             "metrics": self.metrics,
             "replicate_range": list(self.replicate_range),
+            "http_mode": self.http_mode,
         }
 
 
@@ -262,16 +351,23 @@ class Experiment:
         Fingerprints for each config
     results : dict
         Raw return values: {config_name: [result_per_replicate]}
+        (loaded lazily for stored runs)
     metrics : dict
         Recorded metrics: {config_name: {metric_name: [values]}}
+        (loaded lazily for stored runs)
     protocol : dict
         Protocol summaries: {config_name: ProtocolSummary}
+        (loaded lazily for stored runs)
     audit_level : str
         Audit level used
     fn_fingerprint : dict
         Function fingerprint
     paths : dict
         Paths to stored artifacts
+    http_mode : str
+        "live", "record" or "replay" (responses served from the cassette)
+    audit_rate : float, optional
+        Fraction of calls analyzed when audit_level is "sample"
     """
 
     run_id: str
@@ -279,14 +375,81 @@ class Experiment:
     seed: Optional[int]
     configs: Dict[str, Dict[str, Any]]
     config_fingerprints: Dict[str, str]
-    results: Dict[str, List[Any]]
-    metrics: Dict[str, Dict[str, List[Any]]]
-    protocol: Dict[str, ProtocolSummary]
+    results: Dict[str, List[Any]] = LazySection()
+    metrics: Dict[str, Dict[str, List[Any]]] = LazySection()
+    protocol: Dict[str, ProtocolSummary] = LazySection(transform=_protocol_from_dict)
     audit_level: str
     fn_fingerprint: Dict[str, Any]
-    fn: Callable[..., Any]  # Keep reference for crystallize
+    fn: Optional[Callable[..., Any]]  # Keep reference for crystallize
     paths: Dict[str, str] = field(default_factory=dict)
-    _store: Optional[Store] = field(default=None, repr=False)
+    http_mode: str = "live"
+    audit_rate: Optional[float] = None
+    _store: Optional[AnyStore] = field(default=None, repr=False)
+    _loader: Optional[RunLoader] = field(default=None, repr=False, compare=False)
+    _http_pool: Optional[HTTPPool] = field(default=None, repr=False, compare=False)
+    # Hidden-variable aggregator and the protocol dict it was built from
+    _hidden: Optional[HiddenVariableAggregator] = field(default=None, repr=False, compare=False)
+    _hidden_for: Optional[Dict[str, ProtocolSummary]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @classmethod
+    def load(
+        cls,
+        run_id: str,
+        fn: Optional[Callable[..., Any]] = None,
+        *,
+        store_root: Optional[str] = None,
+        store: Optional[AnyStore] = None,
+    ) -> "Experiment":
+        """Load a stored explore run.
+
+        Only lightweight metadata is read here; ``results``, ``metrics`` and
+        ``protocol`` are read from the manifest on first access.
+
+        Parameters
+        ----------
+        run_id : str
+            ID of an explore run (e.g. "exp_a1b2c3d4")
+        fn : Callable, optional
+            The experiment function. Required to crystallize the loaded run;
+            a changed function is reported as FN_CHANGED.
+        store_root : str, optional
+            Root directory for .crystallize storage (":memory:" for the
+            in-memory store)
+        store : Store or MemoryStore, optional
+            Store to read from instead of the global one
+
+        Returns
+        -------
+        Experiment
+            The stored run, ready to crystallize
+        """
+        store = store or get_store(store_root)
+        meta = _read_meta(store, run_id)
+        if "configs" not in meta:
+            raise ValueError(f"'{run_id}' is not an explore run; use ConfirmRun.load()")
+
+        paths = dict(meta.get("paths", {}))
+        paths.setdefault("manifest", str(store.run_manifest_path(run_id)))
+        return cls(
+            run_id=meta["run_id"],
+            lineage_id=meta["lineage_id"],
+            seed=meta.get("seed"),
+            configs=meta["configs"],
+            config_fingerprints=meta["config_fingerprints"],
+            results=UNLOADED,
+            metrics=UNLOADED,
+            protocol=UNLOADED,
+            audit_level=meta.get("audit_level", "calls"),
+            fn_fingerprint=meta.get("fn_fingerprint", {}),
+            fn=fn,
+            paths=paths,
+            http_mode=meta.get("http_mode", "live"),
+            audit_rate=meta.get("audit_rate"),
+            _store=store,
+            _loader=RunLoader(store, run_id),
+        )
 
     def protocol_report(self) -> str:
         """Generate a formatted protocol report."""
@@ -295,11 +458,21 @@ class Experiment:
         for config_name, summary in self.protocol.items():
             lines.append(f"\n{config_name}:")
             lines.append(f"  Instrumented calls: {summary.audit_evidence.get('instrumented_call_count', 0)}")
+            latency = summary.latency()
+            if latency.count:
+                lines.append(
+                    f"  Latency: p50 {latency.percentile(50):.1f} ms, "
+                    f"p95 {latency.percentile(95):.1f} ms, "
+                    f"p99 {latency.percentile(99):.1f} ms (n={latency.count})"
+                )
 
             for call in summary.api_calls:
-                lines.append(f"  - {call['method']} {call['host']}{call['path']}")
+                count = call.get("count", 1)
+                suffix = f" (x{count})" if count > 1 else ""
+                lines.append(f"  - {call['method']} {call['host']}{call['path']}{suffix}")
                 for field_name, field_info in call.get("fields", {}).items():
-                    lines.append(f"      {field_name}: {field_info.get('value')!r} ({field_info.get('source')})")
+                    value = display_value(field_info.get("value"))
+                    lines.append(f"      {field_name}: {value} ({field_info.get('source')})")
 
         return "\n".join(lines)
 
@@ -308,8 +481,18 @@ class Experiment:
         return ProtocolDiff.from_configs_and_summaries(self.configs, self.protocol)
 
     def hidden_variables(self) -> HiddenVariablesReport:
-        """Get hidden variables report."""
-        return HiddenVariablesReport.from_protocol_summaries(self.protocol)
+        """Get hidden variables report.
+
+        The report is cached; it is rebuilt only if the protocol summaries
+        change (e.g. the stored manifest was rewritten).
+        """
+        protocol = self.protocol
+        if self._hidden is None or self._hidden_for is not protocol:
+            self._hidden = HiddenVariableAggregator()
+            for config_name, summary in protocol.items():
+                self._hidden.add_summary(config_name, summary)
+            self._hidden_for = protocol
+        return self._hidden.report()
 
     def crystallize(
         self,
@@ -323,6 +506,9 @@ class Experiment:
         reason: Optional[str] = None,
         progress: bool = True,
         seed: Optional[int] = None,
+        http_pool: Optional[HTTPPool] = None,
+        http_mode: Literal["live", "record"] = "live",
+        min_audit_coverage: float = 0.0,
     ) -> ConfirmRun:
         """Crystallize: run confirmatory replicates with a hypothesis.
 
@@ -346,6 +532,17 @@ class Experiment:
             Show progress bar
         seed : int, optional
             Random seed for confirm run (defaults to explore seed)
+        http_pool : HTTPPool, optional
+            Connection pool for ctx.http, shared by all replicates and
+            closed when the run ends (defaults to the explore run's pool
+            settings)
+        http_mode : str
+            "live" (default) or "record" (also save responses to the
+            cassette). Replay is rejected: confirmatory evidence must come
+            from live calls.
+        min_audit_coverage : float
+            With audit="sample", the smallest fraction of analyzed calls for
+            the audit to count as sufficient (below it the run is NO_AUDIT)
 
         Returns
         -------
@@ -354,6 +551,18 @@ class Experiment:
         """
         console = Console()
 
+        if validate_http_mode(http_mode) == "replay":
+            raise ValueError(
+                "crystallize() cannot replay recorded HTTP responses; confirmatory "
+                "runs must make live calls (use http_mode='live' or 'record')"
+            )
+
+        if self.fn is None:
+            raise ValueError(
+                f"Experiment '{self.run_id}' has no function; "
+                "pass fn= to Experiment.load() to crystallize it"
+            )
+
         # Parse hypothesis
         parsed = parse_hypothesis(hypothesis)
 
@@ -414,8 +623,10 @@ class Experiment:
                 "allow_fn_change": allow_fn_change,
             },
             "reason": reason,
+            "http_mode": http_mode,
         }
         prereg_path = store.write_prereg(run_id, prereg_data)
+        store.flush()  # prereg and ledger must be durable before any replicate runs
 
         # Print header
         console.print(f"\n[bold green]✓[/] [bold]Confirmatory mode[/] (run: {run_id})")
@@ -435,12 +646,17 @@ class Experiment:
 
         # Run confirm replicates
         confirm_results: Dict[str, List[Any]] = {name: [] for name in self.configs}
+        stored_results: Dict[str, List[Any]] = {name: [] for name in self.configs}
         confirm_metrics: Dict[str, Dict[str, List[Any]]] = {name: {} for name in self.configs}
         protocol_events: Dict[str, List[Any]] = {name: [] for name in self.configs}
 
         total = len(self.configs) * replicates
+        pool = http_pool or self._http_pool or HTTPPool()
+        cassette = store.open_cassette() if http_mode == "record" else None
+        interner = store.value_interner()
+        sampler = CallSampler(self.audit_rate or 1.0) if self.audit_level == "sample" else None
 
-        with Progress(
+        with store.open_event_log(run_id) as log, pool, Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
@@ -449,6 +665,13 @@ class Experiment:
             disable=not progress,
         ) as pbar:
             task = pbar.add_task("Confirming...", total=total)
+            log.append({
+                "type": "start",
+                "run_id": run_id,
+                "configs": list(self.configs.keys()),
+                "replicates": replicates,
+                "hypothesis": hypothesis,
+            })
 
             for config_name, config in self.configs.items():
                 cfg_fp = self.config_fingerprints[config_name]
@@ -477,15 +700,25 @@ class Experiment:
                         seed=confirm_seed,
                         replicate_id=f"rep_{self.lineage_id}_{cfg_fp[:8]}_{global_idx:04d}",
                         audit=self.audit_level,
+                        http_pool=pool,
+                        http_mode=http_mode,
+                        cassette=cassette,
+                        interner=interner,
+                        sampler=sampler,
                     )
 
+                    log.append({"type": "replicate_start", "config": config_name, "replicate": i})
+
                     # Run function
-                    if wants_ctx:
-                        result = self.fn(config, ctx)
-                    else:
-                        result = self.fn(config)
+                    with active_context(ctx):
+                        if wants_ctx:
+                            result = self.fn(config, ctx)
+                        else:
+                            result = self.fn(config)
 
                     confirm_results[config_name].append(result)
+                    stored = store.externalize(result)
+                    stored_results[config_name].append(stored)
 
                     # Collect metrics
                     for metric_name, values in ctx.metrics.items():
@@ -493,12 +726,40 @@ class Experiment:
                             confirm_metrics[config_name][metric_name] = []
                         if values:
                             confirm_metrics[config_name][metric_name].append(values[-1])
+                            log.append({
+                                "type": "metric",
+                                "config": config_name,
+                                "replicate": i,
+                                "metric": metric_name,
+                                "value": values[-1],
+                            })
 
                     # Collect protocol events
-                    protocol_events[config_name].extend(ctx._get_protocol_events())
+                    rep_protocol = ctx._get_protocol_events()
+                    protocol_events[config_name].extend(rep_protocol)
+                    for pe in rep_protocol:
+                        log.append({"type": "protocol", "config": config_name, "replicate": i, "event": pe.to_dict()})
+                    if sampler is not None:
+                        log.append({
+                            "type": "audit_sample",
+                            "config": config_name,
+                            "replicate": i,
+                            "calls": ctx._get_call_count(),
+                            "sampled": len(rep_protocol),
+                        })
+
+                    log.append({
+                        "type": "replicate_end",
+                        "config": config_name,
+                        "replicate": i,
+                        "result": stored,
+                        "calls": ctx._get_call_count(),
+                    })
 
                     pbar.advance(task)
 
+            log.append({"type": "end", "run_id": run_id})
+
         # Run statistical test
         left_vals = confirm_metrics.get(parsed.left_config, {}).get(parsed.left_metric, [])
         right_vals = confirm_metrics.get(parsed.right_config, {}).get(parsed.right_metric, [])
@@ -549,10 +810,11 @@ class Experiment:
             prereg_exists=True,
             replicates_fresh=replicates_fresh,
             hidden_vars=hidden_vars,
-            audit_sufficient=self.audit_level == "calls",
+            audit_sufficient=self.audit_level in ("calls", "sample"),
             fn_changed=not fn_match,
             overrides=overrides,
             sample_size=len(left_vals) + len(right_vals),
+            min_audit_coverage=min_audit_coverage,
         )
 
         # Get git info
@@ -579,12 +841,15 @@ class Experiment:
             results=confirm_results,
             metrics=confirm_metrics,
             replicate_range=overall_range,
+            http_mode=http_mode,
         )
 
         # Write results manifest
         manifest = confirm_run.to_dict()
+        manifest["results"] = stored_results  # large values as blob references
         manifest["manifest_hash"] = manifest_hash(manifest)
         results_path = store.write_run_manifest(run_id, manifest)
+        store.flush()
         confirm_run.results_path = str(results_path)
 
         # Print results
@@ -607,6 +872,8 @@ class Experiment:
             "audit_level": self.audit_level,
             "fn_fingerprint": self.fn_fingerprint,
             "paths": self.paths,
+            "http_mode": self.http_mode,
+            "audit_rate": self.audit_rate,
         }
 
 
@@ -616,10 +883,14 @@ def explore(
     replicates: int = 5,
     *,
     seed: Optional[int] = None,
-    audit: Literal["calls", "none"] = "calls",
+    audit: Literal["calls", "sample", "none"] = "calls",
+    audit_rate: float = 0.1,
     on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
     progress: bool = True,
     store_root: Optional[str] = None,
+    store: Optional[AnyStore] = None,
+    http_pool: Optional[HTTPPool] = None,
+    http_mode: Literal["live", "record", "replay"] = "live",
 ) -> Experiment:
     """Run an exploratory experiment.
 
@@ -641,7 +912,12 @@ def explore(
         Random seed for reproducibility.
 
     audit : str
-        Audit level: "calls" (track HTTP calls) or "none"
+        Audit level: "calls" (track HTTP calls), "sample" (analyze a
+        deterministic sample of calls, always including the first call of
+        each config and call shape) or "none"
+
+    audit_rate : float
+        Fraction of calls analyzed with audit="sample". Default 0.1.
 
     on_event : Callable, optional
         Callback for live updates.
@@ -650,7 +926,22 @@ def explore(
         Show progress bar. Default True.
 
     store_root : str, optional
-        Root directory for .crystallize storage
+        Root directory for .crystallize storage. ":memory:" keeps everything
+        in memory (no disk I/O); see MemoryStore.snapshot() to persist it.
+
+    store : Store or MemoryStore, optional
+        Store to use instead of the global one (overrides store_root).
+
+    http_pool : HTTPPool, optional
+        Connection pool settings for ctx.http (pool size, keep-alive,
+        retries). One pool is shared by all replicates and closed when the
+        run ends.
+
+    http_mode : str
+        "live" (default), "record" (save every ctx.http response to the
+        store's cassette) or "replay" (serve recorded responses with no
+        network; unrecorded requests raise CassetteMiss). Protocol events
+        are recorded in every mode, and the mode is saved in the manifest.
 
     Returns
     -------
@@ -674,7 +965,7 @@ def explore(
     run_id = generate_run_id("explore")
 
     # Get store
-    store = get_store(store_root)
+    store = store or get_store(store_root)
 
     # Compute config fingerprints
     config_fps = {name: config_fingerprint(cfg) for name, cfg in configs.items()}
@@ -692,17 +983,26 @@ def explore(
     console.print("    When ready to prove something: [cyan]exp.crystallize(\"a.x > b.x\")[/]\n")
 
     # Emit start event
+    start_event = {"type": "start", "run_id": run_id, "configs": list(configs.keys()), "replicates": replicates}
     if on_event:
-        on_event({"type": "start", "run_id": run_id, "configs": list(configs.keys()), "replicates": replicates})
+        on_event(start_event)
 
     # Storage
     results: Dict[str, List[Any]] = {name: [] for name in configs}
+    stored_results: Dict[str, List[Any]] = {name: [] for name in configs}
     metrics: Dict[str, Dict[str, List[Any]]] = {name: {} for name in configs}
     protocol_events: Dict[str, List[Any]] = {name: [] for name in configs}
+    hidden = HiddenVariableAggregator()
 
     total = len(configs) * replicates
-
-    with Progress(
+    pool = http_pool or HTTPPool()
+    validate_http_mode(http_mode)
+    cassette = store.open_cassette() if http_mode != "live" else None
+    interner = store.value_interner()
+    sampler = CallSampler(audit_rate) if audit == "sample" else None
+    call_counts: Dict[str, int] = {name: 0 for name in configs}
+
+    with store.open_event_log(run_id) as log, pool, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -711,6 +1011,7 @@ def explore(
         disable=not progress,
     ) as pbar:
         task = pbar.add_task("Exploring...", total=total)
+        log.append(start_event)
 
         for config_name, config in configs.items():
             cfg_fp = config_fps[config_name]
@@ -736,19 +1037,29 @@ def explore(
                     config=config,
                     seed=seed,
                     audit=audit,
+                    http_pool=pool,
+                    http_mode=http_mode,
+                    cassette=cassette,
+                    interner=interner,
+                    sampler=sampler,
                 )
 
                 # Event: start
+                rep_start = {"type": "replicate_start", "config": config_name, "replicate": i}
+                log.append(rep_start)
                 if on_event:
-                    on_event({"type": "replicate_start", "config": config_name, "replicate": i})
+                    on_event(rep_start)
 
                 # Run
-                if wants_ctx:
-                    result = fn(config, ctx)
-                else:
-                    result = fn(config)
+                with active_context(ctx):
+                    if wants_ctx:
+                        result = fn(config, ctx)
+                    else:
+                        result = fn(config)
 
                 results[config_name].append(result)
+                stored = store.externalize(result)
+                stored_results[config_name].append(stored)
 
                 # Collect metrics
                 for metric_name, values in ctx.metrics.items():
@@ -756,27 +1067,54 @@ def explore(
                         metrics[config_name][metric_name] = []
                     if values:
                         metrics[config_name][metric_name].append(values[-1])
+                        metric_event = {
+                            "type": "metric",
+                            "config": config_name,
+                            "replicate": i,
+                            "metric": metric_name,
+                            "value": values[-1],
+                        }
+                        log.append(metric_event)
                         if on_event:
-                            on_event({
-                                "type": "metric",
-                                "config": config_name,
-                                "replicate": i,
-                                "metric": metric_name,
-                                "value": values[-1],
-                            })
+                            on_event(metric_event)
 
                 # Collect protocol events
-                protocol_events[config_name].extend(ctx._get_protocol_events())
+                rep_protocol = ctx._get_protocol_events()
+                rep_calls = ctx._get_call_count()
+                call_counts[config_name] += rep_calls
+                protocol_events[config_name].extend(rep_protocol)
+                hidden.add_events(config_name, rep_protocol, rep_calls, sampled=sampler is not None)
+                for pe in rep_protocol:
+                    log.append({"type": "protocol", "config": config_name, "replicate": i, "event": pe.to_dict()})
+                if sampler is not None:
+                    log.append({
+                        "type": "audit_sample",
+                        "config": config_name,
+                        "replicate": i,
+                        "calls": rep_calls,
+                        "sampled": len(rep_protocol),
+                    })
 
                 # Event: end
+                log.append({
+                    "type": "replicate_end",
+                    "config": config_name,
+                    "replicate": i,
+                    "result": stored,
+                    "calls": rep_calls,
+                })
                 if on_event:
                     on_event({"type": "replicate_end", "config": config_name, "replicate": i, "result": result})
 
                 pbar.advance(task)
 
+        log.append({"type": "end", "run_id": run_id})
+
     # Build protocol summaries
     protocol_summaries = {
-        name: ProtocolSummary.from_events(name, events)
+        name: ProtocolSummary.from_events(
+            name, events, call_counts[name], sampled=sampler is not None
+        )
         for name, events in protocol_events.items()
     }
 
@@ -798,12 +1136,19 @@ def explore(
         audit_level=audit,
         fn_fingerprint=fn_fp,
         fn=fn,
+        http_mode=http_mode,
+        audit_rate=audit_rate if audit == "sample" else None,
         _store=store,
+        _http_pool=http_pool,
+        _hidden=hidden,
+        _hidden_for=protocol_summaries,
     )
 
     # Write explore manifest
     manifest = experiment.to_dict()
+    manifest["results"] = stored_results  # large values as blob references
     manifest_path = store.write_run_manifest(run_id, manifest)
+    store.flush()
     experiment.paths["manifest"] = str(manifest_path)
 
     # Emit end event
@@ -0,0 +1,224 @@
+"""Append-only run event logs for Crystallize.
+
+Each run streams its progress to a JSON-lines file as replicates complete.
+External tools can tail the file, and a crashed run can be recovered by
+compacting the log into manifest sections. Finished runs write their
+manifest from the sections they already hold in memory, so the log is not
+re-read at the end of every run.
+
+Event schema (one JSON object per line, mirroring explore()'s on_event):
+    {"type": "start", "run_id", "configs", "replicates"}
+    {"type": "replicate_start", "config", "replicate"}
+    {"type": "metric", "config", "replicate", "metric", "value"}
+    {"type": "protocol", "config", "replicate", "event"}
+    {"type": "audit_sample", "config", "replicate", "calls", "sampled"}  # audit="sample"
+    {"type": "replicate_end", "config", "replicate", "result", "calls"}
+    {"type": "end", "run_id"}
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .protocol import ProtocolEvent, ProtocolSummary
+from .serialize import Serializer, get_serializer
+
+
+class EventLog:
+    """Buffered, append-only JSON-lines writer for one run.
+
+    Events are buffered and written in batches; the file is fsynced at most
+    once per ``fsync_interval`` seconds, and always on close().
+
+    Parameters
+    ----------
+    path : str or Path
+        Log file path (opened in append mode)
+    batch_size : int
+        Number of buffered events that triggers a write
+    fsync_interval : float
+        Minimum seconds between fsyncs
+    fsync : bool
+        Whether to fsync at all
+    serializer : Serializer, optional
+        JSON backend (defaults to the standard library)
+    submit : Callable, optional
+        ``submit(fn, *args)`` used to run file writes elsewhere, e.g. on the
+        store's background writer; writes run inline by default
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        batch_size: int = 64,
+        fsync_interval: float = 1.0,
+        fsync: bool = True,
+        serializer: Optional[Serializer] = None,
+        submit: Optional[Callable[..., None]] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._batch_size = batch_size
+        self._fsync_interval = fsync_interval
+        self._fsync = fsync
+        self._last_fsync = time.monotonic()
+        self._seq = 0
+        self._serializer = serializer or get_serializer()
+        self._submit = submit
+        self._closed = False
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Append an event, writing the batch if it is full."""
+        record = {"seq": self._seq, **event}
+        self._seq += 1
+        self._buffer.append(self._serializer.dumps(record, None).decode("utf-8"))
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write buffered events.
+
+        Parameters
+        ----------
+        fsync : bool
+            Force an fsync regardless of the interval
+        """
+        if self._closed:
+            return
+        lines = "\n".join(self._buffer) + "\n" if self._buffer else ""
+        self._buffer.clear()
+
+        now = time.monotonic()
+        do_fsync = self._fsync and (fsync or now - self._last_fsync >= self._fsync_interval)
+        if do_fsync:
+            self._last_fsync = now
+        self._dispatch(lines, do_fsync, False)
+
+    def close(self) -> None:
+        """Flush, fsync and close the log."""
+        if self._closed:
+            return
+        lines = "\n".join(self._buffer) + "\n" if self._buffer else ""
+        self._buffer.clear()
+        self._closed = True
+        self._dispatch(lines, self._fsync, True)
+
+    def _dispatch(self, lines: str, fsync: bool, close: bool) -> None:
+        if self._submit is not None:
+            self._submit(self._write, lines, fsync, close)
+        else:
+            self._write(lines, fsync, close)
+
+    def _write(self, lines: str, fsync: bool, close: bool) -> None:
+        """Write, flush and optionally fsync/close (may run on a writer thread)."""
+        if lines:
+            self._file.write(lines)
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        if close:
+            self._file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_events(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Iterate over events in a log file.
+
+    A truncated final line (from a crash mid-write) is skipped.
+
+    Parameters
+    ----------
+    path : str or Path
+        Log file path
+
+    Yields
+    ------
+    dict
+        Events in write order
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def compact_events(events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold an event stream into manifest sections.
+
+    Parameters
+    ----------
+    events : iterable
+        Events from read_events()
+
+    Returns
+    -------
+    dict
+        {run_id, configs, complete, results, metrics, protocol} where
+        results/metrics/protocol match the shape written by explore()
+    """
+    run_id: Optional[str] = None
+    configs: List[str] = []
+    complete = False
+    results: Dict[str, List[Any]] = {}
+    metrics: Dict[str, Dict[str, List[Any]]] = {}
+    protocol_events: Dict[str, List[ProtocolEvent]] = {}
+    call_counts: Dict[str, int] = {}
+    sampled_calls: Dict[str, int] = {}
+
+    for event in events:
+        etype = event.get("type")
+        config = event.get("config")
+        if etype == "start":
+            run_id = event.get("run_id")
+            configs = list(event.get("configs", []))
+            for name in configs:
+                results.setdefault(name, [])
+                metrics.setdefault(name, {})
+                protocol_events.setdefault(name, [])
+        elif etype == "metric":
+            metrics.setdefault(config, {}).setdefault(event["metric"], []).append(event["value"])
+        elif etype == "protocol":
+            protocol_events.setdefault(config, []).append(ProtocolEvent.from_dict(event["event"]))
+        elif etype == "audit_sample":
+            sampled_calls[config] = sampled_calls.get(config, 0) + event.get("calls", 0)
+        elif etype == "replicate_end":
+            results.setdefault(config, []).append(event.get("result"))
+            if "calls" in event:
+                call_counts[config] = call_counts.get(config, 0) + event["calls"]
+        elif etype == "end":
+            complete = True
+
+    return {
+        "run_id": run_id,
+        "configs": configs,
+        "complete": complete,
+        "results": results,
+        "metrics": metrics,
+        "protocol": {
+            name: ProtocolSummary.from_events(
+                name,
+                evts,
+                # Older logs count calls only in audit_sample events
+                call_counts.get(name, sampled_calls.get(name)),
+                sampled=name in sampled_calls,
+            ).to_dict()
+            for name, evts in protocol_events.items()
+        },
+    }
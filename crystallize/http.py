@@ -5,19 +5,310 @@ Wraps the requests library to track field provenance for audit.
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional
-
-from .protocol import ProtocolEvent, SENSITIVE_FIELDS, determine_provenance
+import copy
+import hashlib
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .cassette import Cassette, request_key
+from .protocol import (
+    SENSITIVE_FIELDS,
+    ProtocolEvent,
+    ProvenanceIndex,
+    ValueInterner,
+    nested_keys,
+)
+from .telemetry import LatencyHistogram, response_telemetry
 
 # Type for response objects (we don't want to import requests at module level)
 ResponseType = Any
 
 
+def _import_requests() -> Any:
+    """Lazily import requests."""
+    try:
+        import requests
+    except ImportError:
+        raise ImportError(
+            "The 'requests' library is required for ctx.http. "
+            "Install it with: pip install requests"
+        )
+    return requests
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy the dicts and lists of a request body, sharing immutable leaves.
+
+    Cheaper than copy.deepcopy(): strings and numbers are not copied and
+    there is no memo bookkeeping.
+    """
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    return value
+
+
+class _Call(NamedTuple):
+    """Snapshot of a request, analyzed into a ProtocolEvent later."""
+
+    method: str
+    url: str
+    body: Optional[Dict[str, Any]]
+    ts: float  # time.perf_counter() when the call was made
+    coalesced: bool
+    telemetry: Dict[str, Any]  # filled in when the call completes
+
+
+class _Flight:
+    """One in-flight request awaited by its followers."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        """Wait for the leader and return a copy of its response."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return copy.copy(self.response)
+
+
+class SingleFlight:
+    """Coalesces concurrent identical requests into one network round-trip.
+
+    The first caller with a given request key (the leader) makes the
+    request; callers arriving with the same key while it is in flight
+    (followers) wait for it and each receive a copy of its response, or
+    its exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def join(self, key: str) -> Tuple[_Flight, bool]:
+        """Join the flight for a key; returns (flight, is_leader)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def land(
+        self,
+        key: str,
+        flight: _Flight,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Publish the leader's outcome and release the followers."""
+        with self._lock:
+            del self._flights[key]
+        flight.response = response
+        flight.error = error
+        flight.done.set()
+
+
+class CallSampler:
+    """Chooses which calls are analyzed under ``audit="sample"``.
+
+    A call is kept with probability ``rate``, decided by hashing the
+    replicate's sampling key (its replicate ID) with the call's index in
+    the replicate, so re-running a replicate samples the same calls. The
+    first call of each (config, call shape) in a run is always kept. Here
+    the shape is the method, URL without query, and top-level body keys,
+    because values are not analyzed before sampling.
+
+    One sampler is shared by all replicates of a run.
+    """
+
+    def __init__(self, rate: float):
+        """Initialize the sampler.
+
+        Parameters
+        ----------
+        rate : float
+            Fraction of calls to analyze, in (0, 1]
+        """
+        if not 0 < rate <= 1:
+            raise ValueError(f"audit_rate must be in (0, 1], got {rate}")
+        self.rate = rate
+        self._seen: Set[Tuple[Any, ...]] = set()
+        self._lock = threading.Lock()
+
+    def keep(
+        self,
+        config_name: str,
+        sample_key: str,
+        index: int,
+        method: str,
+        url: str,
+        body: Any,
+    ) -> bool:
+        """Decide whether to analyze a call."""
+        keys = tuple(sorted(str(k) for k in body)) if isinstance(body, dict) else ()
+        shape = (config_name, method.upper(), url.split("?", 1)[0], keys)
+        if shape not in self._seen:
+            with self._lock:
+                if shape not in self._seen:
+                    self._seen.add(shape)
+                    return True
+        if self.rate >= 1:
+            return True
+        digest = hashlib.sha256(f"{sample_key}:{index}".encode()).digest()
+        return int.from_bytes(digest[:8], "big") / 2**64 < self.rate
+
+
+class HTTPPool:
+    """Connection pool shared by every replicate of a run.
+
+    explore() and crystallize() create one per run (or use the one passed
+    as ``http_pool=``) and close it when the run ends, so connections and
+    TLS sessions are reused across replicates instead of re-established for
+    each one. A closed pool reopens lazily on next use, so one instance can
+    be passed to several runs.
+
+    Protocol events are still recorded per replicate by InstrumentedHTTP;
+    the pool only carries connections.
+
+    With ``single_flight=True``, concurrent byte-identical requests (same
+    method, URL, params, body and headers; see cassette.request_key) share
+    one round-trip. Every caller still records its own protocol event, marked
+    ``coalesced`` for those that did not hit the network. Only enable it
+    for deterministic requests (e.g. temperature=0 prompts).
+
+    Example
+    -------
+    >>> exp = explore(fn, configs, http_pool=HTTPPool(pool_size=32, retries=3))
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        *,
+        keep_alive: bool = True,
+        retries: int = 0,
+        backoff_factor: float = 0.5,
+        retry_statuses: Iterable[int] = (429, 502, 503, 504),
+        retry_methods: Optional[Iterable[str]] = None,
+        single_flight: bool = False,
+    ):
+        """Initialize the pool (no connections are opened until first use).
+
+        Parameters
+        ----------
+        pool_size : int
+            Maximum connections kept open per host
+        keep_alive : bool
+            Reuse connections between requests; False sends
+            ``Connection: close`` on every request
+        retries : int
+            Retries for connection errors and ``retry_statuses`` responses
+        backoff_factor : float
+            Exponential backoff between retries, in seconds
+        retry_statuses : iterable of int
+            Response statuses that trigger a retry
+        retry_methods : iterable of str, optional
+            Methods that may be retried. Defaults to urllib3's idempotent
+            methods; include "POST" to retry e.g. rate-limited LLM calls.
+        single_flight : bool
+            Coalesce concurrent identical requests (streamed requests are
+            never coalesced)
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_methods = (
+            None if retry_methods is None else frozenset(m.upper() for m in retry_methods)
+        )
+        self.flights = SingleFlight() if single_flight else None
+        self._session: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def session(self) -> Any:
+        """Get the shared requests.Session, creating it on first use."""
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self) -> Any:
+        requests = _import_requests()
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry_kwargs: Dict[str, Any] = {}
+        if self.retry_methods is not None:
+            retry_kwargs["allowed_methods"] = self.retry_methods
+        max_retries = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.retry_statuses,
+            raise_on_status=False,
+            **retry_kwargs,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=max_retries,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self) -> "HTTPPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
 class InstrumentedHTTP:
     """HTTP client that tracks field provenance for audit.
 
     Use this via ctx.http in your experiment function to enable protocol auditing.
 
+    A request only snapshots its method, URL, body (its dicts and lists are
+    copied, so later changes to e.g. a ``messages`` list are not recorded)
+    and a monotonic timestamp;
+    provenance analysis runs in bulk when ``events`` is read, after the
+    replicate returns, so it stays off the request path.
+
+    Each call is also timed on a monotonic clock; latency, time to first
+    byte, status, request/response sizes and retries are attached to its
+    event as ``telemetry`` (see crystallize.telemetry). ``stream()`` iterates
+    over a streamed body and records per-chunk timings as metrics.
+
     Example
     -------
     >>> def my_experiment(config, ctx):
@@ -33,6 +324,13 @@ class InstrumentedHTTP:
         config: Dict[str, Any],
         config_name: str,
         config_fingerprint: str,
+        pool: Optional[HTTPPool] = None,
+        http_mode: str = "live",
+        cassette: Optional[Cassette] = None,
+        interner: Optional[ValueInterner] = None,
+        sampler: Optional[CallSampler] = None,
+        sample_key: str = "",
+        record: Optional[Callable[[str, Any], None]] = None,
     ):
         """Initialize the instrumented HTTP client.
 
@@ -44,30 +342,63 @@ class InstrumentedHTTP:
             Name of the config
         config_fingerprint : str
             Fingerprint of the config
+        pool : HTTPPool, optional
+            Shared connection pool; without one a private session is used
+        http_mode : str
+            "live", "record" (save responses to the cassette) or "replay"
+            (serve them from the cassette, no network)
+        cassette : Cassette, optional
+            Recorded responses (required unless http_mode is "live")
+        interner : ValueInterner, optional
+            Compacts large field values; share one across a run's replicates
+            so repeated values are stored once
+        sampler : CallSampler, optional
+            Analyze only the calls it keeps (audit="sample"); all calls are
+            still counted
+        sample_key : str
+            Seed of this replicate's sampling decisions (its replicate ID)
+        record : callable, optional
+            Metric recorder (ctx.record) receiving stream() timings
         """
+        if http_mode != "live" and cassette is None:
+            raise ValueError(f"http_mode={http_mode!r} requires a cassette")
         self._config = config
         self._config_name = config_name
         self._config_fingerprint = config_fingerprint
         self._events: List[ProtocolEvent] = []
+        self._calls: Deque[_Call] = deque()
+        # Calls are timed on the monotonic clock; this maps it to epoch time
+        self._epoch = time.time() - time.perf_counter()
+        self._interner = interner or ValueInterner()
+        self._sampler = sampler
+        self._sample_key = sample_key
+        self._record = record
+        self._call_count = 0
+        self._count_lock = threading.Lock()
+        self._provenance: Optional[ProvenanceIndex] = None
         self._session: Optional[Any] = None
+        self._pool = pool
+        self._http_mode = http_mode
+        self._cassette = cassette
+
+    @property
+    def call_count(self) -> int:
+        """Number of calls made, including calls not sampled for analysis."""
+        return self._call_count
 
     @property
     def events(self) -> List[ProtocolEvent]:
-        """Get all recorded protocol events."""
+        """Get all recorded protocol events (analyzing any pending calls)."""
+        while self._calls:
+            self._events.append(self._analyze_call(self._calls.popleft()))
         return self._events.copy()
 
     def _get_session(self) -> Any:
-        """Lazily import and create requests session."""
+        """Get the pool's shared session, or lazily create a private one."""
+        if self._pool is not None:
+            return self._pool.session()
         if self._session is None:
-            try:
-                import requests
-
-                self._session = requests.Session()
-            except ImportError:
-                raise ImportError(
-                    "The 'requests' library is required for ctx.http. "
-                    "Install it with: pip install requests"
-                )
+            self._session = _import_requests().Session()
         return self._session
 
     def _analyze_fields(
@@ -91,20 +422,17 @@ class InstrumentedHTTP:
         """
         fields: Dict[str, Dict[str, Any]] = {}
         body = json_body or data or {}
+        if self._provenance is None:
+            self._provenance = ProvenanceIndex(self._config)
 
-        # Analyze each field in the request
-        for field_name, value in body.items():
-            source = determine_provenance(
-                field_name=field_name,
-                value=value,
-                config=self._config,
-                present_in_request=True,
-            )
+        # Analyze each (possibly nested) field in the request
+        for field_name, value, source in self._provenance.iter_fields(body):
             fields[field_name] = {"value": value, "source": source}
 
         # Check for sensitive fields that are MISSING from the request
+        present = nested_keys(body)
         for sensitive_field in SENSITIVE_FIELDS:
-            if sensitive_field not in body:
+            if sensitive_field not in present:
                 # Only mark as implicit_default if this looks like an API call
                 # (we check for common LLM API fields)
                 llm_api_indicators = {"messages", "prompt", "input", "model"}
@@ -122,18 +450,68 @@ class InstrumentedHTTP:
         url: str,
         json_body: Optional[Dict[str, Any]],
         data: Optional[Dict[str, Any]],
-    ) -> None:
-        """Record a protocol event for this request."""
-        fields = self._analyze_fields(json_body, data)
+        coalesced: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot a request for deferred analysis (if it is sampled).
+
+        Returns the call's telemetry dict to fill in, or None if the call
+        is not sampled.
+        """
+        body = json_body if json_body is not None else data
+        with self._count_lock:
+            index = self._call_count
+            self._call_count += 1
+        if self._sampler is not None and not self._sampler.keep(
+            self._config_name, self._sample_key, index, method, url, body
+        ):
+            return None
+        if isinstance(body, dict):
+            body = _snapshot(body)
+        telemetry: Dict[str, Any] = {}
+        self._calls.append(
+            _Call(method, url, body, time.perf_counter(), coalesced, telemetry)
+        )
+        return telemetry
+
+    def observe(
+        self, method: str, url: str, body: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """Record a call made by another HTTP client (see crystallize.transports).
 
-        event = ProtocolEvent.create(
+        Parameters
+        ----------
+        method : str
+            HTTP method
+        url : str
+            Request URL
+        body : Any
+            Decoded request body; a dict is analyzed for provenance
+
+        Returns
+        -------
+        dict or None
+            The call's telemetry dict, for the caller to fill in when the
+            call completes (keys starting with "_" are private to the
+            caller and never recorded); None if the call is not sampled
+        """
+        json_body = body if isinstance(body, dict) else None
+        return self._record_event(method, url, json_body, None)
+
+    def _analyze_call(self, call: _Call) -> ProtocolEvent:
+        """Build the protocol event of a snapshotted request."""
+        body = call.body if isinstance(call.body, dict) else None
+        return ProtocolEvent.create(
             config_name=self._config_name,
             config_fingerprint=self._config_fingerprint,
-            method=method,
-            url=url,
-            fields=fields,
+            method=call.method,
+            url=call.url,
+            fields=self._interner.compact_fields(self._analyze_fields(body, None)),
+            coalesced=call.coalesced,
+            ts=self._epoch + call.ts,
+            telemetry={
+                k: v for k, v in call.telemetry.items() if not k.startswith("_")
+            } or None,
         )
-        self._events.append(event)
 
     def request(
         self,
@@ -157,17 +535,129 @@ class InstrumentedHTTP:
         Response
             requests.Response object
         """
-        session = self._get_session()
+        return self._perform(method, url, kwargs)[0]
 
+    def _perform(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> Tuple[ResponseType, Optional[Dict[str, Any]]]:
+        """Make a request; returns (response, telemetry of the call or None)."""
         # Extract body for analysis
         json_body = kwargs.get("json")
         data = kwargs.get("data") if isinstance(kwargs.get("data"), dict) else None
 
-        # Record the event before making the request
-        self._record_event(method, url, json_body, data)
+        flights = self._pool.flights if self._pool is not None else None
+        if flights is None or self._http_mode == "replay" or kwargs.get("stream"):
+            # Record the event before making the request
+            telemetry = self._record_event(method, url, json_body, data)
+            response = self._timed(telemetry, lambda: self._send(method, url, kwargs))
+            return response, telemetry
+
+        key = request_key(method, url, kwargs, include_headers=True)
+        flight, leader = flights.join(key)
+        telemetry = self._record_event(method, url, json_body, data, coalesced=not leader)
+        if not leader:
+            return self._timed(telemetry, flight.wait), telemetry
+        try:
+            response = self._timed(telemetry, lambda: self._send(method, url, kwargs))
+            response.content  # read the body once, for every follower
+        except BaseException as e:
+            flights.land(key, flight, error=e)
+            raise
+        flights.land(key, flight, response=response)
+        return response, telemetry
+
+    def _timed(
+        self, telemetry: Optional[Dict[str, Any]], send: Callable[[], ResponseType]
+    ) -> ResponseType:
+        """Make a call, filling in its telemetry (if it is sampled)."""
+        start = time.perf_counter()
+        try:
+            response = send()
+        except Exception as e:
+            if telemetry is not None:
+                telemetry["latency_ms"] = (time.perf_counter() - start) * 1000
+                telemetry["error"] = type(e).__name__
+            raise
+        if telemetry is not None:
+            telemetry.update(response_telemetry(response, (time.perf_counter() - start) * 1000))
+        return response
+
+    def _send(self, method: str, url: str, kwargs: Dict[str, Any]) -> ResponseType:
+        """Make the request live, or through the cassette."""
+        if self._cassette is None:
+            return self._get_session().request(method, url, **kwargs)
+
+        key = request_key(method, url, kwargs)
+        if self._http_mode == "replay":
+            return self._cassette.replay(key, method, url)
+        response = self._get_session().request(method, url, **kwargs)
+        self._cassette.record(key, method, url, response)
+        return response
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        lines: bool = False,
+        chunk_size: Optional[int] = None,
+        count_tokens: Optional[Callable[[Any], int]] = None,
+        metric_prefix: str = "stream",
+        **kwargs: Any,
+    ) -> "HTTPStream":
+        """Make a streamed request and iterate over its body as it arrives.
+
+        The body is never buffered whole. Once iteration ends (or the stream
+        is closed), time to first chunk, total time, inter-chunk latency
+        percentiles, chunk and byte counts (bytes yielded, so without line
+        separators when ``lines`` is set) and token counts (with
+        ``count_tokens``) are recorded as replicate metrics named
+        ``<metric_prefix>_ttfb_ms``, ``_total_ms``, ``_chunk_p50_ms``,
+        ``_chunk_p95_ms``, ``_chunk_p99_ms``, ``_chunks``, ``_bytes`` and
+        ``_tokens``, and added to the call's protocol telemetry.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method
+        url : str
+            Request URL
+        lines : bool
+            Yield lines (e.g. server-sent events) instead of raw chunks
+        chunk_size : int, optional
+            Read size; None yields data as it is received
+        count_tokens : callable, optional
+            Number of tokens in a yielded chunk or line
+        metric_prefix : str
+            Prefix of the recorded metric names
+        **kwargs
+            Additional arguments passed to requests
+
+        Returns
+        -------
+        HTTPStream
+            Iterable of chunks (bytes) or lines; use as a context manager
+            to close the connection if iteration stops early
 
-        # Make the actual request
-        return session.request(method, url, **kwargs)
+        Example
+        -------
+        >>> with ctx.http.stream("POST", url, json=body, lines=True) as events:
+        ...     for line in events:
+        ...         handle(line)
+        """
+        kwargs["stream"] = True
+        start = time.perf_counter()
+        response, telemetry = self._perform(method, url, kwargs)
+        return HTTPStream(
+            response,
+            start,
+            telemetry=telemetry,
+            record=self._record,
+            lines=lines,
+            chunk_size=chunk_size,
+            count_tokens=count_tokens,
+            metric_prefix=metric_prefix,
+        )
 
     def get(self, url: str, **kwargs: Any) -> ResponseType:
         """Make a GET request with provenance tracking."""
@@ -198,6 +688,112 @@ class InstrumentedHTTP:
         return self.request("OPTIONS", url, **kwargs)
 
 
+class HTTPStream:
+    """Streamed response body, timed chunk by chunk (see InstrumentedHTTP.stream).
+
+    Attributes
+    ----------
+    response : requests.Response
+        The underlying response (status and headers are available at once)
+    metrics : dict
+        Timing metrics, filled in when the stream ends or is closed
+    """
+
+    def __init__(
+        self,
+        response: ResponseType,
+        start: float,
+        *,
+        telemetry: Optional[Dict[str, Any]] = None,
+        record: Optional[Callable[[str, Any], None]] = None,
+        lines: bool = False,
+        chunk_size: Optional[int] = None,
+        count_tokens: Optional[Callable[[Any], int]] = None,
+        metric_prefix: str = "stream",
+    ):
+        self.response = response
+        self.metrics: Dict[str, Any] = {}
+        self._start = start
+        self._telemetry = telemetry
+        self._record = record
+        self._lines = lines
+        self._chunk_size = chunk_size
+        self._count_tokens = count_tokens
+        self._prefix = metric_prefix
+        self._first: Optional[float] = None
+        self._gaps = LatencyHistogram()
+        self._chunks = 0
+        self._bytes = 0
+        self._tokens = 0
+        self._started = False
+        self._closed = False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._started:
+            raise RuntimeError("A stream can only be iterated once")
+        self._started = True
+        if self._lines:
+            body = self.response.iter_lines(chunk_size=self._chunk_size)
+        else:
+            body = self.response.iter_content(chunk_size=self._chunk_size)
+        last = None
+        try:
+            for chunk in body:
+                if not chunk:
+                    continue  # keep-alive blank lines
+                now = time.perf_counter()
+                if last is None:
+                    self._first = now
+                else:
+                    self._gaps.record((now - last) * 1000)
+                last = now
+                self._chunks += 1
+                self._bytes += len(chunk)
+                if self._count_tokens is not None:
+                    self._tokens += self._count_tokens(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the connection and record the stream's metrics (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        self.response.close()
+
+        p = self._prefix
+        metrics: Dict[str, Any] = {
+            f"{p}_total_ms": (time.perf_counter() - self._start) * 1000,
+            f"{p}_chunks": self._chunks,
+            f"{p}_bytes": self._bytes,
+        }
+        if self._first is not None:
+            metrics[f"{p}_ttfb_ms"] = (self._first - self._start) * 1000
+        if self._gaps.count:
+            for q in (50, 95, 99):
+                metrics[f"{p}_chunk_p{q}_ms"] = self._gaps.percentile(q)
+        if self._count_tokens is not None:
+            metrics[f"{p}_tokens"] = self._tokens
+        self.metrics = metrics
+
+        if self._telemetry is not None:
+            self._telemetry["latency_ms"] = metrics[f"{p}_total_ms"]
+            self._telemetry["response_bytes"] = self._bytes
+            self._telemetry["chunks"] = self._chunks
+            if self._first is not None:
+                self._telemetry["ttfb_ms"] = metrics[f"{p}_ttfb_ms"]
+        if self._record is not None:
+            for name, value in metrics.items():
+                self._record(name, value)
+
+    def __enter__(self) -> "HTTPStream":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
 class NoAuditHTTP:
     """Placeholder HTTP client that raises errors when used.
 
@@ -10,6 +10,8 @@ import json
 import secrets
 from typing import Any, Dict, Literal
 
+from .serialize import hash_canonical
+
 
 def generate_run_id(run_type: Literal["explore", "confirm"] = "explore") -> str:
     """Generate a unique run ID.
@@ -94,5 +96,6 @@ def manifest_hash(manifest: Dict[str, Any]) -> str:
     str
         Full SHA256 hash
     """
-    canonical = json.dumps(manifest, sort_keys=True, separators=(",", ":"), default=str)
-    return hashlib.sha256(canonical.encode()).hexdigest()
+    # Streamed per top-level key; same digest as hashing the sorted, compact
+    # json.dumps() of the whole manifest
+    return hash_canonical(manifest)
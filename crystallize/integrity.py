@@ -93,8 +93,17 @@ FLAGS = {
         severity="warning",
         overridable=False,
     ),
+    "sampled_audit": IntegrityFlag(
+        code="AUDIT_SAMPLED",
+        message="Audit evidence is sampled (not every HTTP call was analyzed)",
+        severity="warning",
+        overridable=False,
+    ),
 }
 
+# Flags that leave the status VALID (alone or together)
+WARNING_FLAGS = ("CONFOUNDED_MED", "LOW_N", "AUDIT_SAMPLED")
+
 
 def compute_integrity(
     prereg_exists: bool,
@@ -104,6 +113,7 @@ def compute_integrity(
     fn_changed: bool,
     overrides: Optional[List[str]] = None,
     sample_size: int = 0,
+    min_audit_coverage: float = 0.0,
 ) -> Tuple[IntegrityStatus, List[str]]:
     """Compute integrity status and flags.
 
@@ -123,6 +133,11 @@ def compute_integrity(
         List of allow_* flags that were set
     sample_size : int
         Total sample size
+    min_audit_coverage : float
+        Smallest fraction of analyzed calls for sampled audit evidence
+        (audit="sample") to count as sufficient. Sampled evidence always
+        covers every call shape, so by default any coverage is accepted,
+        with an AUDIT_SAMPLED warning.
 
     Returns
     -------
@@ -145,8 +160,14 @@ def compute_integrity(
         elif any(item.risk == "MED" for item in hidden_vars.items):
             flags.append("CONFOUNDED_MED")
 
+    coverage = hidden_vars.coverage if hidden_vars else 1.0
+    if audit_sufficient and coverage < min_audit_coverage:
+        audit_sufficient = False
+
     if not audit_sufficient and "allow_no_audit" not in overrides:
         flags.append("NO_AUDIT")
+    elif audit_sufficient and coverage < 1.0:
+        flags.append("AUDIT_SAMPLED")
 
     if fn_changed and "allow_fn_change" not in overrides:
         flags.append("FN_CHANGED")
@@ -155,11 +176,11 @@ def compute_integrity(
         flags.append("LOW_N")
 
     # Determine overall status
-    if not flags or (flags == ["CONFOUNDED_MED"]) or (flags == ["LOW_N"]):
+    blocking_flags = [f for f in flags if f not in WARNING_FLAGS]
+    if not blocking_flags:
         return (IntegrityStatus.VALID, flags)
 
     # Check for specific single-issue statuses
-    blocking_flags = [f for f in flags if f not in ("CONFOUNDED_MED", "LOW_N")]
 
     if len(blocking_flags) == 1:
         if blocking_flags[0] == "NO_PREREG":
@@ -198,6 +219,7 @@ def get_flag_info(code: str) -> Optional[IntegrityFlag]:
         "NO_AUDIT": "no_audit",
         "FN_CHANGED": "fn_changed",
         "LOW_N": "low_sample_size",
+        "AUDIT_SAMPLED": "sampled_audit",
     }
     key = code_to_key.get(code)
     return FLAGS.get(key) if key else None
@@ -259,7 +281,7 @@ def check_blocking_conditions(
     hidden_vars : HiddenVariablesReport, optional
         Hidden variables report
     audit_level : str
-        Audit level ("calls" or "none")
+        Audit level ("calls", "sample" or "none")
     fn_fingerprint_match : bool
         Whether function fingerprint matches
     allow_confounds : bool
@@ -0,0 +1,159 @@
+"""Lazy loading of stored runs for Crystallize.
+
+Run metadata is read eagerly; heavy manifest sections (results, metrics,
+protocol) are read on first access and cached until the manifest changes.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .memory import AnyStore
+
+
+class _Sentinel:
+    """Marker object with a readable repr."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __repr__(self) -> str:
+        return self._name
+
+
+# Field value meaning "read this section from the manifest on access"
+UNLOADED: Any = _Sentinel("<unloaded>")
+
+# Default placeholder used by dataclass __init__ for optional lazy fields
+_DEFAULT: Any = _Sentinel("<default>")
+
+
+class RunLoader:
+    """Reads individual sections of a stored run manifest on demand.
+
+    Each section is cached together with the manifest's (mtime, size) and
+    re-read if the file changes on disk. Blob references in ``results`` are
+    resolved when the section is loaded.
+    """
+
+    def __init__(self, store: "AnyStore", run_id: str):
+        """Initialize the loader.
+
+        Parameters
+        ----------
+        store : Store or MemoryStore
+            Store holding the run
+        run_id : str
+            Run ID
+        """
+        self._store = store
+        self._run_id = run_id
+        self._cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    @property
+    def run_id(self) -> str:
+        """ID of the run being loaded."""
+        return self._run_id
+
+    def _stamp(self) -> Tuple[int, int]:
+        """Get the manifest's change stamp (mtime_ns, size for files)."""
+        stamp = self._store.manifest_stamp(self._run_id)
+        if stamp is None:
+            raise FileNotFoundError(
+                f"Run manifest for '{self._run_id}' is missing: "
+                f"{self._store.run_manifest_path(self._run_id)}"
+            )
+        return stamp
+
+    def section(
+        self,
+        name: str,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Get one manifest section, loading it if needed.
+
+        Parameters
+        ----------
+        name : str
+            Top-level manifest key
+        transform : Callable, optional
+            Applied to the raw section before caching
+
+        Returns
+        -------
+        Any
+            The (transformed) section, or an empty dict if absent
+        """
+        stamp = self._stamp()
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        manifest = self._store.read_run_manifest(self._run_id)
+        if manifest is None:
+            raise FileNotFoundError(f"Run manifest for '{self._run_id}' could not be read")
+        value = manifest.get(name) or {}
+        del manifest  # keep only the requested section alive
+
+        if name == "results":
+            value = self._store.resolve_results(value)
+
+        if transform is not None:
+            value = transform(value)
+        self._cache[name] = (stamp, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop all cached sections."""
+        self._cache.clear()
+
+
+class LazySection:
+    """Dataclass field descriptor backed by a RunLoader.
+
+    Values assigned normally (e.g. by explore()) are returned as-is. A value of
+    UNLOADED is resolved through the instance's ``_loader`` on every access,
+    which hits the loader's mtime-validated cache.
+
+    Parameters
+    ----------
+    transform : Callable, optional
+        Converts the raw JSON section into its in-memory form
+    default_factory : Callable, optional
+        Makes the field optional in __init__, like dataclasses.field()
+    """
+
+    def __init__(
+        self,
+        transform: Optional[Callable[[Any], Any]] = None,
+        default_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self._transform = transform
+        self._default_factory = default_factory
+        self._name = ""
+        self._attr = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+        self._attr = f"_{name}_value"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            # Dataclass machinery asks the class for a default value
+            if self._default_factory is None:
+                raise AttributeError(self._name)
+            return _DEFAULT
+
+        value = obj.__dict__.get(self._attr, UNLOADED)
+        if value is UNLOADED:
+            loader: Optional[RunLoader] = getattr(obj, "_loader", None)
+            if loader is None:
+                raise AttributeError(f"'{self._name}' was not loaded and has no loader")
+            return loader.section(self._name, self._transform)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if value is _DEFAULT:
+            value = self._default_factory() if self._default_factory else UNLOADED
+        obj.__dict__[self._attr] = value
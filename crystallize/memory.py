@@ -0,0 +1,316 @@
+"""In-memory store backend for Crystallize.
+
+MemoryStore implements the Store interface (ledger, prereg, manifests,
+event logs, catalog queries, gc) without touching the filesystem, for test
+suites and throwaway runs. Select it with ``explore(store_root=":memory:")``
+or pass an instance as ``explore(store=...)``; snapshot() copies everything
+into a filesystem Store when a run turns out to be worth keeping.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .cassette import Cassette
+from .catalog import Catalog, catalog_entry_from_manifest, catalog_entry_from_prereg
+from .events import compact_events
+from .ids import manifest_hash
+from .meta import LineageSummary, lineage_summary
+from .protocol import ValueInterner
+from .serialize import get_serializer
+from .store import HEAVY_SECTIONS, GCReport, Store
+
+# store_root value selecting a MemoryStore
+MEMORY_ROOT = ":memory:"
+
+
+class MemoryEventLog:
+    """In-memory counterpart of events.EventLog."""
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self._events = events
+        self._seq = len(events)
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Append an event."""
+        self._events.append({"seq": self._seq, **event})
+        self._seq += 1
+
+    def flush(self, fsync: bool = False) -> None:
+        """No-op (events are stored on append)."""
+
+    def close(self) -> None:
+        """No-op (events are stored on append)."""
+
+    def __enter__(self) -> "MemoryEventLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class MemoryStore:
+    """Store backend holding every artifact in memory.
+
+    Manifests and prereg artifacts are normalized through the JSON
+    serializer on write, so reads return the same types a filesystem store
+    would. Replicate return values in ``results`` are kept as-is (there is
+    no blob store), which also preserves values that are not JSON.
+
+    Paths returned by run_manifest_path() and friends are placeholders
+    under ``:memory:/`` and do not exist on disk.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.root = Path(MEMORY_ROOT)
+        self.durability = "none"
+        self.serializer = get_serializer()
+        self.catalog = Catalog(MEMORY_ROOT)
+        self._ledger: Dict[Tuple[str, str], int] = {}
+        self._prereg: Dict[str, Dict[str, Any]] = {}
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._created: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._cassette = Cassette()
+
+    def _normalize(self, data: Dict[str, Any], keep: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """JSON round-trip a document, except for the ``keep`` sections."""
+        plain = {k: v for k, v in data.items() if k not in keep}
+        normalized = json.loads(self.serializer.dumps(plain, None))
+        for key in keep:
+            if key in data:
+                normalized[key] = copy.copy(data[key])
+        return normalized
+
+    def flush(self) -> None:
+        """No-op (nothing to make durable)."""
+
+    def close(self) -> None:
+        """Close the in-memory catalog."""
+        self.catalog.close()
+
+    def read_ledger(self, lineage_id: str, config_fp: str) -> int:
+        """Read the next available replicate index (0 if unknown)."""
+        return self._ledger.get((lineage_id, config_fp), 0)
+
+    def update_ledger(self, lineage_id: str, config_fp: str, new_index: int) -> None:
+        """Update the next available replicate index."""
+        self._ledger[(lineage_id, config_fp)] = new_index
+
+    def allocate_replicates(
+        self, lineage_id: str, config_fp: str, count: int
+    ) -> tuple[int, int]:
+        """Allocate a range of fresh replicate indices (see Store)."""
+        start = self.read_ledger(lineage_id, config_fp)
+        self.update_ledger(lineage_id, config_fp, start + count)
+        return start, start + count - 1
+
+    def write_prereg(self, run_id: str, prereg_data: Dict[str, Any]) -> Path:
+        """Store a pre-registration artifact."""
+        self._prereg[run_id] = self._normalize(prereg_data)
+        self.catalog.record_run(run_id, prereg=True, **catalog_entry_from_prereg(prereg_data))
+        return self.prereg_dir / f"{run_id}.json"
+
+    def write_run_manifest(self, run_id: str, manifest: Dict[str, Any]) -> Path:
+        """Store a run manifest."""
+        self._manifests[run_id] = self._normalize(manifest, keep=("results",))
+        self._created.setdefault(run_id, time.time())
+        self._versions[run_id] = self._versions.get(run_id, 0) + 1
+        meta = {k: v for k, v in manifest.items() if k not in HEAVY_SECTIONS}
+        self.catalog.record_run(run_id, manifest=True, **catalog_entry_from_manifest(meta))
+        return self.run_manifest_path(run_id)
+
+    def run_manifest_path(self, run_id: str) -> Path:
+        """Placeholder path of a run manifest."""
+        return self.runs_dir / f"{run_id}.json"
+
+    def manifest_stamp(self, run_id: str) -> Optional[Tuple[int, int]]:
+        """Version stamp of a manifest (changes on rewrite), or None if absent."""
+        if run_id not in self._manifests:
+            return None
+        return (self._versions[run_id], 0)
+
+    def read_run_manifest(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Read a run manifest, or None if not found."""
+        manifest = self._manifests.get(run_id)
+        return dict(manifest) if manifest is not None else None
+
+    def read_run_meta(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Read a run manifest without its heavy sections, or None."""
+        manifest = self._manifests.get(run_id)
+        if manifest is None:
+            return None
+        return {k: v for k, v in manifest.items() if k not in HEAVY_SECTIONS}
+
+    def read_prereg(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Read a pre-registration artifact, or None if not found."""
+        prereg = self._prereg.get(run_id)
+        return dict(prereg) if prereg is not None else None
+
+    def externalize(self, value: Any) -> Any:
+        """Return the value unchanged (there is no blob store in memory)."""
+        return value
+
+    def resolve_results(self, results: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Return the results section unchanged."""
+        return results
+
+    def open_event_log(self, run_id: str) -> MemoryEventLog:
+        """Open the event log for a run."""
+        return MemoryEventLog(self._events.setdefault(run_id, []))
+
+    def open_cassette(self) -> Cassette:
+        """Get the store's in-memory HTTP cassette."""
+        return self._cassette
+
+    def value_interner(self) -> ValueInterner:
+        """Create an interner for protocol field values (nothing is spilled)."""
+        return ValueInterner()
+
+    def read_event_log(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the logged events of a run (empty if there is no log)."""
+        return iter(list(self._events.get(run_id, ())))
+
+    def compact_event_log(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild manifest sections of a run from its log (see Store)."""
+        if run_id not in self._events:
+            return None
+        return compact_events(self.read_event_log(run_id))
+
+    def lineage_summary(
+        self,
+        lineage_id: str,
+        metric: str,
+        configs: Optional[Tuple[str, str]] = None,
+    ) -> LineageSummary:
+        """Pool a metric's effect across a lineage's confirm runs (see Store.lineage_summary())."""
+        return lineage_summary(self, lineage_id, metric, configs)
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Query the run catalog (see Catalog.query())."""
+        return self.catalog.query(**filters)
+
+    def rebuild_catalog(self) -> int:
+        """Rebuild the run catalog from stored artifacts."""
+        self.catalog.clear()
+        for run_id, prereg in self._prereg.items():
+            self.catalog.record_run(run_id, prereg=True, **catalog_entry_from_prereg(prereg))
+        for run_id in self._manifests:
+            self.catalog.record_run(
+                run_id, manifest=True, **catalog_entry_from_manifest(self.read_run_meta(run_id))
+            )
+        return self.catalog.count()
+
+    def gc(
+        self,
+        *,
+        keep: Optional[int] = None,
+        older_than: Optional[Union[float, timedelta]] = None,
+        dry_run: bool = False,
+    ) -> GCReport:
+        """Drop old explore runs, with the same rules as Store.gc()."""
+        report = GCReport(dry_run=dry_run)
+        if keep is None and older_than is None:
+            return report
+        if isinstance(older_than, timedelta):
+            older_than = older_than.total_seconds()
+
+        referenced = {p.get("parent_run_id") for p in self._prereg.values()}
+        referenced.update(m.get("parent_run_id") for m in self._manifests.values())
+        now = time.time()
+        explore_runs = sorted(
+            (r for r in self._manifests if r.startswith("exp_")),
+            key=lambda r: self._created[r],
+            reverse=True,
+        )
+        for i, run_id in enumerate(explore_runs):
+            if keep is not None and i < keep:
+                continue
+            if older_than is not None and now - self._created[run_id] <= older_than:
+                continue
+            if run_id in referenced:
+                continue
+            report.removed_runs.append(run_id)
+            if not dry_run:
+                del self._manifests[run_id]
+                self._events.pop(run_id, None)
+                self.catalog.remove_run(run_id)
+        return report
+
+    def snapshot(self, root: Optional[str] = None, **store_kwargs: Any) -> Store:
+        """Copy every artifact into a filesystem store.
+
+        Large or non-JSON results are written to the target's blob store.
+
+        Parameters
+        ----------
+        root : str, optional
+            Target store root (defaults to ".crystallize")
+        **store_kwargs
+            Passed to Store (e.g. compression="gzip")
+
+        Returns
+        -------
+        Store
+            The filesystem store holding the copy
+        """
+        target = Store(root, **store_kwargs)
+        for (lineage_id, config_fp), next_index in self._ledger.items():
+            current = target.read_ledger(lineage_id, config_fp)
+            target.update_ledger(lineage_id, config_fp, max(current, next_index))
+        for run_id, prereg in self._prereg.items():
+            target.write_prereg(run_id, prereg)
+        for run_id, events in self._events.items():
+            with target.open_event_log(run_id) as log:
+                for event in events:
+                    event = dict(event)
+                    if "result" in event:
+                        event["result"] = target.externalize(event["result"])
+                    log.append(event)
+        for run_id, manifest in self._manifests.items():
+            manifest = dict(manifest)
+            results = manifest.get("results") or {}
+            stored = {
+                name: [target.externalize(value) for value in values]
+                for name, values in results.items()
+            }
+            if stored != results:
+                manifest["results"] = stored
+                if "manifest_hash" in manifest:
+                    # Hash the manifest as written, with blob references
+                    del manifest["manifest_hash"]
+                    manifest["manifest_hash"] = manifest_hash(manifest)
+            target.write_run_manifest(run_id, manifest)
+        target.flush()
+        return target
+
+    @property
+    def runs_dir(self) -> Path:
+        """Placeholder runs directory path."""
+        return self.root / "runs"
+
+    @property
+    def prereg_dir(self) -> Path:
+        """Placeholder prereg directory path."""
+        return self.root / "prereg"
+
+    @property
+    def ledger_dir(self) -> Path:
+        """Placeholder ledger directory path."""
+        return self.root / "ledger"
+
+    @property
+    def events_dir(self) -> Path:
+        """Placeholder event log directory path."""
+        return self.root / "events"
+
+
+# Either store backend
+AnyStore = Union[Store, MemoryStore]
@@ -0,0 +1,275 @@
+"""Cross-run meta-analysis for Crystallize lineages.
+
+Pools the effect of each confirm run in a lineage (difference in metric
+means between the hypothesis' two configs) with inverse-variance weights,
+under a fixed-effect and a DerSimonian-Laird random-effects model.
+
+Per-run sufficient statistics (n, mean, sum of squared deviations) are
+cached in the store's catalog, so repeat queries read one small table row
+per run instead of the run's raw metric arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .memory import AnyStore
+
+# Two-sided 95% normal quantile
+_Z95 = 1.959963984540054
+
+
+def sufficient_stats(values: Sequence[Any]) -> Tuple[int, float, float]:
+    """Compute (n, mean, m2) of the numeric values in a sample.
+
+    ``m2`` is the sum of squared deviations from the mean, so the sample
+    variance is ``m2 / (n - 1)``. Non-numeric values (e.g. None) are skipped.
+    """
+    numbers = [
+        float(v) for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)
+    ]
+    n = len(numbers)
+    if n == 0:
+        return 0, 0.0, 0.0
+    try:
+        import numpy as np
+    except ImportError:
+        mean = sum(numbers) / n
+        return n, mean, sum((x - mean) ** 2 for x in numbers)
+    arr = np.asarray(numbers, dtype=float)
+    mean = float(arr.mean())
+    return n, mean, float(((arr - mean) ** 2).sum())
+
+
+@dataclass
+class RunEffect:
+    """Effect estimate of one confirm run.
+
+    Attributes
+    ----------
+    run_id : str
+        Confirm run ID
+    left_config, right_config : str
+        Configs compared (effect = mean(left) - mean(right))
+    effect : float
+        Difference in means
+    variance : float
+        Sampling variance of the difference (var_l/n_l + var_r/n_r)
+    n_left, n_right : int
+        Sample sizes
+    """
+
+    run_id: str
+    left_config: str
+    right_config: str
+    effect: float
+    variance: float
+    n_left: int
+    n_right: int
+
+
+@dataclass
+class PooledEstimate:
+    """Pooled effect with its standard error and 95% confidence interval."""
+
+    estimate: float
+    se: float
+    ci: Tuple[float, float]
+
+
+@dataclass
+class LineageSummary:
+    """Meta-analysis of a metric across the confirm runs of a lineage.
+
+    Attributes
+    ----------
+    lineage_id : str
+        Lineage ID
+    metric : str
+        Metric name
+    runs : list
+        RunEffect per included run
+    skipped : dict
+        {run_id: reason} for runs that could not be included
+    fixed : PooledEstimate, optional
+        Inverse-variance fixed-effect estimate
+    random : PooledEstimate, optional
+        DerSimonian-Laird random-effects estimate
+    tau2 : float
+        Between-run variance
+    q : float
+        Cochran's Q heterogeneity statistic
+    i2 : float
+        I² (share of variation due to heterogeneity), 0-1
+    """
+
+    lineage_id: str
+    metric: str
+    runs: List[RunEffect] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    fixed: Optional[PooledEstimate] = None
+    random: Optional[PooledEstimate] = None
+    tau2: float = 0.0
+    q: float = 0.0
+    i2: float = 0.0
+
+    def pretty(self) -> str:
+        """Human-readable summary."""
+        lines = [f"Lineage {self.lineage_id} — {self.metric} ({len(self.runs)} runs)"]
+        for label, est in (("fixed", self.fixed), ("random", self.random)):
+            if est is not None:
+                lines.append(
+                    f"  {label:>6}: {est.estimate:+.4f} ± {est.se:.4f} "
+                    f"[{est.ci[0]:+.4f}, {est.ci[1]:+.4f}]"
+                )
+        lines.append(f"  tau²={self.tau2:.4g}  Q={self.q:.3f}  I²={self.i2:.1%}")
+        for run_id, reason in self.skipped.items():
+            lines.append(f"  skipped {run_id}: {reason}")
+        return "\n".join(lines)
+
+
+def _interval(weighted_sum: float, total_weight: float) -> PooledEstimate:
+    """Build a pooled estimate from sum(w*y) and sum(w)."""
+    estimate = weighted_sum / total_weight
+    se = math.sqrt(1.0 / total_weight)
+    return PooledEstimate(estimate, se, (estimate - _Z95 * se, estimate + _Z95 * se))
+
+
+def pool(
+    effects: Sequence[float], variances: Sequence[float]
+) -> Tuple[PooledEstimate, PooledEstimate, float, float, float]:
+    """Pool per-run effects under fixed- and random-effects models.
+
+    Uses NumPy when available and pure Python otherwise.
+
+    Parameters
+    ----------
+    effects : sequence
+        Per-run effect estimates
+    variances : sequence
+        Per-run sampling variances (all > 0)
+
+    Returns
+    -------
+    tuple
+        (fixed, random, tau2, q, i2)
+    """
+    k = len(effects)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        y = np.asarray(effects, dtype=float)
+        v = np.asarray(variances, dtype=float)
+        w = 1.0 / v
+        fixed = _interval(float(np.dot(w, y)), float(w.sum()))
+        q = float(np.dot(w, (y - fixed.estimate) ** 2))
+        c = float(w.sum() - np.dot(w, w) / w.sum())
+    else:
+        y, v = list(effects), list(variances)
+        w = [1.0 / vi for vi in v]
+        fixed = _interval(sum(wi * yi for wi, yi in zip(w, y)), sum(w))
+        q = sum(wi * (yi - fixed.estimate) ** 2 for wi, yi in zip(w, y))
+        c = sum(w) - sum(wi * wi for wi in w) / sum(w)
+
+    tau2 = max(0.0, (q - (k - 1)) / c) if k > 1 and c > 0 else 0.0
+    i2 = max(0.0, (q - (k - 1)) / q) if q > 0 else 0.0
+
+    if np is not None:
+        w_star = 1.0 / (v + tau2)
+        random = _interval(float(np.dot(w_star, y)), float(w_star.sum()))
+    else:
+        w_star = [1.0 / (vi + tau2) for vi in v]
+        random = _interval(sum(wi * yi for wi, yi in zip(w_star, y)), sum(w_star))
+    return fixed, random, tau2, q, i2
+
+
+def _run_stats(
+    store: "AnyStore", run_id: str, metric: str
+) -> Dict[str, Tuple[int, float, float]]:
+    """Get {config: (n, mean, m2)} for a run, computing and caching if needed."""
+    cached = store.catalog.get_run_stats(run_id, metric)
+    if cached is not None:
+        return cached
+
+    manifest = store.read_run_manifest(run_id) or {}
+    metrics = manifest.get("metrics") or {}
+    del manifest
+    stats = {
+        config: sufficient_stats(values[metric])
+        for config, values in metrics.items()
+        if metric in values
+    }
+    store.catalog.put_run_stats(run_id, metric, stats)
+    return stats
+
+
+def lineage_summary(
+    store: "AnyStore",
+    lineage_id: str,
+    metric: str,
+    configs: Optional[Tuple[str, str]] = None,
+) -> LineageSummary:
+    """Meta-analyse a metric across the confirm runs of a lineage.
+
+    Parameters
+    ----------
+    store : Store or MemoryStore
+        Store holding the lineage
+    lineage_id : str
+        Lineage ID
+    metric : str
+        Metric name
+    configs : tuple, optional
+        (left, right) configs to compare. By default each run's hypothesis
+        configs are used.
+
+    Returns
+    -------
+    LineageSummary
+        Per-run effects and pooled estimates (None if no run qualifies)
+    """
+    summary = LineageSummary(lineage_id=lineage_id, metric=metric)
+    rows = store.query(lineage=lineage_id, run_type="confirm")
+    rows.sort(key=lambda r: r["created_at"] or "")
+    for row in rows:
+        run_id = row["run_id"]
+        if not row["has_manifest"]:
+            summary.skipped[run_id] = "no manifest"
+            continue
+        if configs is not None:
+            left, right = configs
+        else:
+            meta = store.read_run_meta(run_id) or {}
+            hyp = meta.get("hypothesis_result") or {}
+            left, right = hyp.get("left_config"), hyp.get("right_config")
+            if left is None or right is None:
+                summary.skipped[run_id] = "no hypothesis result"
+                continue
+
+        stats = _run_stats(store, run_id, metric)
+        if left not in stats or right not in stats:
+            summary.skipped[run_id] = f"metric '{metric}' not recorded for {left}/{right}"
+            continue
+        (n_l, mean_l, m2_l), (n_r, mean_r, m2_r) = stats[left], stats[right]
+        if n_l < 2 or n_r < 2:
+            summary.skipped[run_id] = "fewer than 2 values per config"
+            continue
+        variance = m2_l / (n_l - 1) / n_l + m2_r / (n_r - 1) / n_r
+        if variance <= 0:
+            summary.skipped[run_id] = "zero variance"
+            continue
+        summary.runs.append(
+            RunEffect(run_id, left, right, mean_l - mean_r, variance, n_l, n_r)
+        )
+
+    if summary.runs:
+        summary.fixed, summary.random, summary.tau2, summary.q, summary.i2 = pool(
+            [r.effect for r in summary.runs], [r.variance for r in summary.runs]
+        )
+    return summary
@@ -0,0 +1,268 @@
+"""Local stand-in for an LLM chat-completions API.
+
+MockLLMServer answers OpenAI-style requests on localhost with configurable
+latency, streaming, rate limiting (429) and server errors, so ctx.http and
+the transport hooks can be load-tested without API spend. It uses only
+the standard library.
+
+Endpoints
+---------
+    POST /v1/chat/completions   chat completion (SSE when "stream": true)
+    POST /v1/completions        text completion (SSE when "stream": true)
+    GET  /v1/models             model list
+
+Example
+-------
+>>> with MockLLMServer(latency_ms=50, jitter=0.3, rate_limit=0.05) as server:
+...     exp = explore(fn, {"a": {"base_url": server.url}})
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Tokens generated when a request sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 16
+
+
+class _Server(ThreadingHTTPServer):
+    """Threaded HTTP server with a deep accept backlog."""
+
+    daemon_threads = True
+    request_queue_size = 256  # accept bursts of concurrent connections
+
+
+class _MockLLMHandler(BaseHTTPRequestHandler):
+    """Request handler; configuration lives on the server (MockLLMServer)."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like real APIs
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def _send_json(
+        self, status: int, payload: Dict[str, Any], **headers: str
+    ) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        mock: MockLLMServer = self.server.mock  # type: ignore[attr-defined]
+        if self.path.rstrip("/") != "/v1/models":
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        models = [{"id": mock.model, "object": "model"}]
+        self._send_json(200, {"object": "list", "data": models})
+
+    def do_POST(self) -> None:
+        mock: MockLLMServer = self.server.mock  # type: ignore[attr-defined]
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path not in ("/v1/chat/completions", "/v1/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        outcome, delay = mock._draw()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                Retry_After="0",
+            )
+            return
+        if outcome == "error":
+            error = {"message": "Internal error", "type": "server"}
+            self._send_json(500, {"error": error})
+            return
+
+        chat = path == "/v1/chat/completions"
+        model = body.get("model", mock.model)
+        n_tokens = int(body.get("max_tokens") or mock.completion_tokens)
+        tokens = [f"tok{i} " for i in range(n_tokens)]
+        prompt = body.get("messages", body.get("prompt", ""))
+        prompt_tokens = len(json.dumps(prompt).split())
+        completion_id = f"mock-{mock.stats['requests']}"
+        if not body.get("stream"):
+            text = "".join(tokens)
+            choice = (
+                {"index": 0, "message": {"role": "assistant", "content": text}}
+                if chat
+                else {"index": 0, "text": text}
+            )
+            choice["finish_reason"] = "length" if body.get("max_tokens") else "stop"
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion" if chat else "text_completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [choice],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": n_tokens,
+                    "total_tokens": prompt_tokens + n_tokens,
+                },
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i and mock.token_latency_ms:
+                time.sleep(mock.token_latency_ms / 1000)
+            delta = (
+                {"index": 0, "delta": {"content": token}}
+                if chat
+                else {"index": 0, "text": token}
+            )
+            event = {"id": completion_id, "model": model, "choices": [delta]}
+            self._send_chunk(b"data: " + json.dumps(event).encode() + b"\n\n")
+        self._send_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class MockLLMServer:
+    """Threaded local server mimicking chat-completion endpoints.
+
+    Latency is drawn per request from a lognormal distribution with median
+    ``latency_ms`` and shape ``jitter`` (0 gives a fixed delay), or from a
+    callable. Rate-limited and failed requests get the same delay.
+
+    Attributes
+    ----------
+    url : str
+        Base URL (e.g. "http://127.0.0.1:54321/v1") once started
+    stats : dict
+        Request counts {requests, ok, rate_limited, errors}
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: Union[float, Callable[[random.Random], float]] = 0.0,
+        jitter: float = 0.0,
+        token_latency_ms: float = 0.0,
+        completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+        rate_limit: float = 0.0,
+        error_rate: float = 0.0,
+        model: str = "mock-llm",
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """Configure the server (call start() or use it as a context manager).
+
+        Parameters
+        ----------
+        latency_ms : float or callable
+            Median time to respond, in milliseconds, or a function drawing
+            it from a random.Random
+        jitter : float
+            Lognormal shape (sigma) of the latency; 0.5 gives a long tail
+        token_latency_ms : float
+            Delay between streamed tokens
+        completion_tokens : int
+            Tokens generated when a request sets no max_tokens
+        rate_limit : float
+            Fraction of requests answered with 429 (Retry-After: 0)
+        error_rate : float
+            Fraction of requests answered with 500
+        model : str
+            Model name reported by /v1/models
+        seed : int, optional
+            Seed of the latency and failure draws
+        host, port : str, int
+            Address to bind (port 0 picks a free port)
+        """
+        if not 0 <= rate_limit + error_rate <= 1:
+            raise ValueError("rate_limit + error_rate must be in [0, 1]")
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.token_latency_ms = token_latency_ms
+        self.completion_tokens = completion_tokens
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.model = model
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+        self._address = (host, port)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the API (ends in /v1)."""
+        if self._httpd is None:
+            raise RuntimeError("MockLLMServer is not running; call start() first")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _draw(self) -> Tuple[str, float]:
+        """Draw (outcome, delay in seconds) for a request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if callable(self.latency_ms):
+                latency = self.latency_ms(self._rng)
+            elif self.jitter:
+                latency = self.latency_ms * math.exp(self._rng.gauss(0, self.jitter))
+            else:
+                latency = self.latency_ms
+            roll = self._rng.random()
+            if roll < self.rate_limit:
+                outcome = "rate_limited"
+            elif roll < self.rate_limit + self.error_rate:
+                outcome = "error"
+            else:
+                outcome = "ok"
+            self.stats["errors" if outcome == "error" else outcome] += 1
+        return outcome, max(0.0, latency) / 1000
+
+    def start(self) -> "MockLLMServer":
+        """Start serving in a background thread."""
+        if self._httpd is None:
+            httpd = _Server(self._address, _MockLLMHandler)
+            httpd.mock = self  # type: ignore[attr-defined]
+            self._httpd = httpd
+            self._thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
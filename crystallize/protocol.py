@@ -5,9 +5,14 @@ Captures and analyzes HTTP call provenance to detect hidden variables.
 
 from __future__ import annotations
 
+import hashlib
+import json
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Set
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from .telemetry import LatencyHistogram, summarize_telemetry
 
 # Sensitive fields that affect model behavior (hardcoded for a2, configurable in a3)
 SENSITIVE_FIELDS: Set[str] = {
@@ -25,6 +30,25 @@ SENSITIVE_FIELDS: Set[str] = {
     "frequency_penalty",
 }
 
+# Most fields recorded per request body; nested values past this stay whole
+MAX_PROVENANCE_FIELDS = 256
+
+# Most config values (at any depth) indexed for provenance lookups
+MAX_PROVENANCE_NODES = 4096
+
+# Field values whose JSON encoding is longer than this are stored as references
+MAX_INLINE_VALUE_CHARS = 256
+
+# Characters of a referenced value kept as a preview
+VALUE_PREVIEW_CHARS = 80
+
+# Example event indices kept per call shape
+MAX_SHAPE_EXAMPLES = 3
+
+# Key marking a dict as a compacted field value:
+#   {"$value": "<sha256>", "size": 12345, "preview": "[{\"role\": ..."}
+VALUE_REF_KEY = "$value"
+
 
 @dataclass
 class ProtocolEvent:
@@ -47,6 +71,12 @@ class ProtocolEvent:
     fields : dict
         Field provenance {field_name: {value, source}}
         Source is one of: "config.<key>", "hardcoded", "implicit_default", "unknown"
+    coalesced : bool
+        True if the call shared another identical in-flight request's
+        response instead of making its own round-trip (single-flight)
+    telemetry : dict, optional
+        Latency, status and size of the call (see crystallize.telemetry);
+        None for events recorded without timing
     """
 
     type: str
@@ -56,6 +86,8 @@ class ProtocolEvent:
     method: str
     url: Dict[str, str]
     fields: Dict[str, Dict[str, Any]]
+    coalesced: bool = False
+    telemetry: Optional[Dict[str, Any]] = None
 
     @classmethod
     def create(
@@ -65,19 +97,27 @@ class ProtocolEvent:
         method: str,
         url: str,
         fields: Dict[str, Dict[str, Any]],
+        coalesced: bool = False,
+        ts: Optional[float] = None,
+        telemetry: Optional[Dict[str, Any]] = None,
     ) -> "ProtocolEvent":
-        """Create a new protocol event with current timestamp."""
+        """Create a new protocol event, timestamped now or at ``ts`` (epoch seconds)."""
         from urllib.parse import urlparse
 
         parsed = urlparse(url)
+        when = datetime.utcnow() if ts is None else (
+            datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+        )
         return cls(
             type="http_call",
-            ts=datetime.utcnow().isoformat() + "Z",
+            ts=when.isoformat() + "Z",
             config_name=config_name,
             config_fingerprint=config_fingerprint,
             method=method.upper(),
             url={"host": parsed.netloc, "path": parsed.path, "full": url},
             fields=fields,
+            coalesced=coalesced,
+            telemetry=telemetry,
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -90,8 +130,25 @@ class ProtocolEvent:
             "method": self.method,
             "url": self.url,
             "fields": self.fields,
+            "coalesced": self.coalesced,
+            "telemetry": self.telemetry,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProtocolEvent":
+        """Rebuild an event from its to_dict() form."""
+        return cls(
+            type=data.get("type", "http_call"),
+            ts=data.get("ts", ""),
+            config_name=data.get("config_name", ""),
+            config_fingerprint=data.get("config_fingerprint", ""),
+            method=data.get("method", ""),
+            url=dict(data.get("url", {})),
+            fields=dict(data.get("fields", {})),
+            coalesced=data.get("coalesced", False),
+            telemetry=data.get("telemetry"),
+        )
+
 
 @dataclass
 class ProtocolSummary:
@@ -102,46 +159,124 @@ class ProtocolSummary:
     config_name : str
         Config name
     api_calls : list
-        List of API call summaries
+        Distinct call shapes, in order of first appearance. A shape is a
+        method, host, path and set of (field, source, value) triples; each
+        entry carries its ``fields`` plus ``count``, ``first_ts``,
+        ``last_ts`` and ``examples`` (indices of the first matching events).
+        Entries from older manifests have one call each and no count.
     audit_evidence : dict
-        Audit level info {level, instrumented_call_count}
+        Audit level info {level, instrumented_call_count, coalesced_call_count},
+        plus sampled_call_count (calls analyzed) when level is "sample"
+    telemetry : dict
+        Aggregated call telemetry (see telemetry.summarize_telemetry()):
+        latency and time-to-first-byte histograms, status and error
+        counts, byte and retry totals. Covers the analyzed calls only.
     """
 
     config_name: str
     api_calls: List[Dict[str, Any]] = field(default_factory=list)
     audit_evidence: Dict[str, Any] = field(default_factory=dict)
+    telemetry: Dict[str, Any] = field(default_factory=dict)
 
     @classmethod
-    def from_events(cls, config_name: str, events: List[ProtocolEvent]) -> "ProtocolSummary":
-        """Create summary from a list of events."""
-        api_calls = []
-        for event in events:
-            api_calls.append(
-                {
+    def from_events(
+        cls,
+        config_name: str,
+        events: List[ProtocolEvent],
+        total_calls: Optional[int] = None,
+        sampled: bool = False,
+    ) -> "ProtocolSummary":
+        """Create summary from a list of events, grouped by call shape.
+
+        Parameters
+        ----------
+        config_name : str
+            Config name
+        events : list
+            Analyzed protocol events
+        total_calls : int, optional
+            Calls made, if more than were analyzed (audit="sample")
+        sampled : bool
+            Whether the events are a sample of the calls
+        """
+        shapes: Dict[Any, Dict[str, Any]] = {}
+        for index, event in enumerate(events):
+            key = (
+                event.method,
+                event.url.get("host"),
+                event.url.get("path"),
+                frozenset(
+                    (name, info.get("source"), value_key(info.get("value")))
+                    for name, info in event.fields.items()
+                ),
+            )
+            shape = shapes.get(key)
+            if shape is None:
+                shapes[key] = {
                     "method": event.method,
                     "host": event.url.get("host"),
                     "path": event.url.get("path"),
                     "fields": event.fields,
+                    "count": 1,
+                    "first_ts": event.ts,
+                    "last_ts": event.ts,
+                    "examples": [index],
                 }
-            )
-
+                continue
+            shape["count"] += 1
+            shape["last_ts"] = event.ts
+            if len(shape["examples"]) < MAX_SHAPE_EXAMPLES:
+                shape["examples"].append(index)
+        api_calls = list(shapes.values())
+
+        evidence: Dict[str, Any] = {
+            "level": ("sample" if sampled else "calls") if events else "none",
+            "instrumented_call_count": len(events) if total_calls is None else total_calls,
+            "coalesced_call_count": sum(1 for e in events if e.coalesced),
+        }
+        if sampled:
+            evidence["sampled_call_count"] = len(events)
         return cls(
             config_name=config_name,
             api_calls=api_calls,
-            audit_evidence={
-                "level": "calls" if events else "none",
-                "instrumented_call_count": len(events),
-            },
+            audit_evidence=evidence,
+            telemetry=summarize_telemetry(e.telemetry for e in events),
         )
 
+    def latency(self, metric: str = "latency_ms") -> LatencyHistogram:
+        """Latency histogram of the config's calls.
+
+        Parameters
+        ----------
+        metric : str
+            "latency_ms" (whole call) or "ttfb_ms" (time to first byte)
+
+        Returns
+        -------
+        LatencyHistogram
+            Empty if no telemetry was recorded
+        """
+        return LatencyHistogram.from_dict(self.telemetry.get(metric))
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
             "config_name": self.config_name,
             "api_calls": self.api_calls,
             "audit_evidence": self.audit_evidence,
+            "telemetry": self.telemetry,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProtocolSummary":
+        """Rebuild a summary from its to_dict() form."""
+        return cls(
+            config_name=data.get("config_name", ""),
+            api_calls=list(data.get("api_calls", [])),
+            audit_evidence=dict(data.get("audit_evidence", {})),
+            telemetry=dict(data.get("telemetry") or {}),
+        )
+
 
 @dataclass
 class HiddenVariable:
@@ -197,7 +332,7 @@ def classify_risk(field_name: str, source: str) -> str:
     str
         Risk level: "HIGH", "MED", or "LOW"
     """
-    is_sensitive = field_name.lower() in SENSITIVE_FIELDS
+    is_sensitive = field_leaf(field_name).lower() in SENSITIVE_FIELDS
 
     if source in ("implicit_default", "unknown"):
         return "HIGH" if is_sensitive else "MED"
@@ -223,16 +358,16 @@ def generate_why(field_name: str, source: str, value: Any) -> str:
     str
         Human-readable explanation
     """
-    is_sensitive = field_name.lower() in SENSITIVE_FIELDS
+    is_sensitive = field_leaf(field_name).lower() in SENSITIVE_FIELDS
     sensitive_note = " (affects model behavior)" if is_sensitive else ""
 
     if source == "implicit_default":
         return f"'{field_name}'{sensitive_note} was not set; API will use default"
     elif source == "hardcoded":
-        return f"'{field_name}'{sensitive_note} is hardcoded to {value!r}"
+        return f"'{field_name}'{sensitive_note} is hardcoded to {display_value(value)}"
     elif source == "unknown":
-        return f"'{field_name}'{sensitive_note} value {value!r} has unknown origin"
-    return f"'{field_name}' set to {value!r}"
+        return f"'{field_name}'{sensitive_note} value {display_value(value)} has unknown origin"
+    return f"'{field_name}' set to {display_value(value)}"
 
 
 @dataclass
@@ -244,85 +379,35 @@ class HiddenVariablesReport:
     items : list
         List of HiddenVariable instances
     audit_evidence_level : str
-        Overall audit level
+        Overall audit level ("calls", "sample" or "none")
     instrumented_call_count : int
         Total number of instrumented calls
+    analyzed_call_count : int, optional
+        Calls whose fields were analyzed, when fewer than all were
+        (audit="sample"); None means every call was analyzed
     """
 
     items: List[HiddenVariable] = field(default_factory=list)
     audit_evidence_level: str = "none"
     instrumented_call_count: int = 0
+    analyzed_call_count: Optional[int] = None
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of instrumented calls that were analyzed."""
+        if self.analyzed_call_count is None or self.instrumented_call_count == 0:
+            return 1.0
+        return min(1.0, self.analyzed_call_count / self.instrumented_call_count)
 
     @classmethod
     def from_protocol_summaries(
         cls, summaries: Dict[str, ProtocolSummary]
     ) -> "HiddenVariablesReport":
         """Build report from protocol summaries across configs."""
-        # Aggregate all field observations
-        field_observations: Dict[str, Dict[str, Any]] = {}  # field -> {values, sources, seen_in}
-
-        total_calls = 0
-        has_audit = False
-
+        aggregator = HiddenVariableAggregator()
         for config_name, summary in summaries.items():
-            total_calls += summary.audit_evidence.get("instrumented_call_count", 0)
-            if summary.audit_evidence.get("level") == "calls":
-                has_audit = True
-
-            for call in summary.api_calls:
-                for field_name, field_info in call.get("fields", {}).items():
-                    source = field_info.get("source", "unknown")
-                    value = field_info.get("value")
-
-                    # Skip fields that come from config
-                    if source.startswith("config."):
-                        continue
-
-                    if field_name not in field_observations:
-                        field_observations[field_name] = {
-                            "values": set(),
-                            "sources": set(),
-                            "seen_in": set(),
-                        }
-
-                    # Handle unhashable values
-                    try:
-                        field_observations[field_name]["values"].add(value)
-                    except TypeError:
-                        field_observations[field_name]["values"].add(str(value))
-
-                    field_observations[field_name]["sources"].add(source)
-                    field_observations[field_name]["seen_in"].add(config_name)
-
-        # Build hidden variable items
-        items = []
-        for field_name, obs in field_observations.items():
-            # Take first source (they should be consistent)
-            source = next(iter(obs["sources"]))
-            value = next(iter(obs["values"]))
-            risk = classify_risk(field_name, source)
-            why = generate_why(field_name, source, value)
-
-            items.append(
-                HiddenVariable(
-                    field=field_name,
-                    value=value,
-                    source=source,
-                    risk=risk,
-                    why=why,
-                    seen_in=sorted(obs["seen_in"]),
-                )
-            )
-
-        # Sort by risk (HIGH first)
-        risk_order = {"HIGH": 0, "MED": 1, "LOW": 2}
-        items.sort(key=lambda x: (risk_order.get(x.risk, 3), x.field))
-
-        return cls(
-            items=items,
-            audit_evidence_level="calls" if has_audit else "none",
-            instrumented_call_count=total_calls,
-        )
+            aggregator.add_summary(config_name, summary)
+        return aggregator.report()
 
     def has_high_risk(self) -> bool:
         """Check if there are any HIGH risk hidden variables."""
@@ -330,21 +415,30 @@ class HiddenVariablesReport:
 
     def pretty(self) -> str:
         """Generate pretty-printed report."""
+        coverage_note = (
+            f"Audit coverage: {self.coverage:.1%} of calls analyzed (sampled); "
+            "values seen only in unsampled calls are not reported"
+            if self.coverage < 1.0
+            else None
+        )
         if not self.items:
-            return "No hidden variables detected."
+            message = "No hidden variables detected."
+            return f"{message}\n{coverage_note}" if coverage_note else message
 
         lines = ["Hidden Variables Report", "=" * 40]
 
         for item in self.items:
             risk_emoji = {"HIGH": "🔴", "MED": "🟡", "LOW": "🟢"}.get(item.risk, "⚪")
             lines.append(f"\n{risk_emoji} [{item.risk}] {item.field}")
-            lines.append(f"   Value: {item.value!r}")
+            lines.append(f"   Value: {display_value(item.value)}")
             lines.append(f"   Source: {item.source}")
             lines.append(f"   Why: {item.why}")
             lines.append(f"   Seen in: {', '.join(item.seen_in)}")
 
         lines.append(f"\nAudit level: {self.audit_evidence_level}")
         lines.append(f"Instrumented calls: {self.instrumented_call_count}")
+        if coverage_note:
+            lines.append(coverage_note)
 
         return "\n".join(lines)
 
@@ -354,9 +448,130 @@ class HiddenVariablesReport:
             "items": [item.to_dict() for item in self.items],
             "audit_evidence_level": self.audit_evidence_level,
             "instrumented_call_count": self.instrumented_call_count,
+            "analyzed_call_count": self.analyzed_call_count,
+            "coverage": self.coverage,
         }
 
 
+class HiddenVariableAggregator:
+    """Incrementally aggregates field observations into a HiddenVariablesReport.
+
+    Fed protocol events as replicates complete (or whole summaries), it
+    keeps one observation record per field, so report() costs
+    O(distinct fields). The report is cached until new observations arrive.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty aggregator."""
+        # field -> {"values": {value_key: value}, "sources": set, "seen_in": set}
+        self._fields: Dict[str, Dict[str, Any]] = {}
+        self._total_calls = 0
+        self._analyzed_calls = 0
+        self._has_audit = False
+        self._sampled = False
+        self._report: Optional[HiddenVariablesReport] = None
+
+    def _observe(self, config_name: str, fields: Dict[str, Dict[str, Any]]) -> None:
+        """Record the fields of one call (or call shape)."""
+        for field_name, field_info in fields.items():
+            source = field_info.get("source", "unknown")
+            # Skip fields that come from config
+            if source.startswith("config."):
+                continue
+            obs = self._fields.get(field_name)
+            if obs is None:
+                obs = self._fields[field_name] = {
+                    "values": {},
+                    "sources": set(),
+                    "seen_in": set(),
+                }
+            # Distinct values, compared on their keys (hashes for large ones)
+            value = field_info.get("value")
+            obs["values"].setdefault(value_key(value), value)
+            obs["sources"].add(source)
+            obs["seen_in"].add(config_name)
+
+    def add_events(
+        self,
+        config_name: str,
+        events: List[ProtocolEvent],
+        total_calls: Optional[int] = None,
+        sampled: bool = False,
+    ) -> None:
+        """Add the protocol events of a completed replicate.
+
+        Parameters
+        ----------
+        config_name : str
+            Config name
+        events : list
+            Analyzed protocol events
+        total_calls : int, optional
+            Calls made, if more than were analyzed (audit="sample")
+        sampled : bool
+            Whether the events are a sample of the calls
+        """
+        self._total_calls += len(events) if total_calls is None else total_calls
+        self._analyzed_calls += len(events)
+        self._sampled = self._sampled or sampled
+        self._report = None
+        if not events:
+            return
+        self._has_audit = True
+        for event in events:
+            self._observe(config_name, event.fields)
+
+    def add_summary(self, config_name: str, summary: ProtocolSummary) -> None:
+        """Add a config's protocol summary (e.g. of a stored run)."""
+        evidence = summary.audit_evidence
+        total = evidence.get("instrumented_call_count", 0)
+        self._total_calls += total
+        self._analyzed_calls += evidence.get("sampled_call_count", total)
+        if evidence.get("level") in ("calls", "sample"):
+            self._has_audit = True
+        if "sampled_call_count" in evidence:
+            self._sampled = True
+        for call in summary.api_calls:
+            self._observe(config_name, call.get("fields", {}))
+        self._report = None
+
+    def report(self) -> HiddenVariablesReport:
+        """Get the report (cached until new observations are added)."""
+        if self._report is not None:
+            return self._report
+
+        items = []
+        for field_name, obs in self._fields.items():
+            # Take first source and value (they should be consistent)
+            source = next(iter(obs["sources"]))
+            value = next(iter(obs["values"].values()))
+            items.append(
+                HiddenVariable(
+                    field=field_name,
+                    value=value,
+                    source=source,
+                    risk=classify_risk(field_name, source),
+                    why=generate_why(field_name, source, value),
+                    seen_in=sorted(obs["seen_in"]),
+                )
+            )
+
+        # Sort by risk (HIGH first)
+        risk_order = {"HIGH": 0, "MED": 1, "LOW": 2}
+        items.sort(key=lambda x: (risk_order.get(x.risk, 3), x.field))
+
+        level = "none"
+        if self._has_audit:
+            level = "sample" if self._sampled else "calls"
+        self._report = HiddenVariablesReport(
+            items=items,
+            audit_evidence_level=level,
+            instrumented_call_count=self._total_calls,
+            analyzed_call_count=self._analyzed_calls if self._sampled else None,
+        )
+        return self._report
+
+
 @dataclass
 class ConfigPairDiff:
     """Diff between two configs."""
@@ -382,13 +597,64 @@ class ConfigPairDiff:
 class ProtocolDiff:
     """Analysis of protocol differences between configs.
 
+    Built from inverted indexes rather than by comparing every pair of
+    configs: for each declared config key and each observed request field
+    it records the value per config. A field is a confound when its
+    observed values are not explained by the declared keys it can come
+    from (the key with the same name, or the config key its provenance
+    points to): two configs that agree on those keys but send different
+    values. This takes O(configs × fields); pairwise diffs are only built
+    when asked for (``pair()``, ``pairs``).
+
     Attributes
     ----------
-    pairs : list
-        List of ConfigPairDiff instances
+    config_names : list
+        Compared configs, sorted
+    declared : dict
+        {config_key: {config_name: value}}
+    observed : dict
+        {field: {config_name: {value, source}}} for configs with a summary
+    confounded_fields : dict
+        {field: groups}; each group lists configs that agree on the
+        explaining keys but were observed with different values
+
+    ``ProtocolDiff(pairs=[...])`` is still accepted: the given pairwise
+    diffs seed the cache and are what ``pairs`` returns.
     """
 
-    pairs: List[ConfigPairDiff] = field(default_factory=list)
+    config_names: List[str] = field(default_factory=list)
+    declared: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    observed: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    confounded_fields: Dict[str, List[List[str]]] = field(default_factory=dict)
+    _pairs: Dict[Tuple[str, str], ConfigPairDiff] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        config_names: Optional[List[str]] = None,
+        declared: Optional[Dict[str, Dict[str, Any]]] = None,
+        observed: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        confounded_fields: Optional[Dict[str, List[List[str]]]] = None,
+        pairs: Optional[List[ConfigPairDiff]] = None,
+    ):
+        self.config_names = list(config_names or [])
+        self.declared = declared or {}
+        self.observed = observed or {}
+        self.confounded_fields = confounded_fields or {}
+        self._pairs = {}
+        self._given_pairs = None if pairs is None else list(pairs)
+        for pair in self._given_pairs or ():
+            self._pairs[(pair.config_a, pair.config_b)] = pair
+            if confounded_fields is None:
+                for fld in pair.confounds:
+                    self.confounded_fields.setdefault(fld, []).append(
+                        sorted((pair.config_a, pair.config_b))
+                    )
+        if self._given_pairs and not self.config_names:
+            self.config_names = sorted(
+                {name for pair in self._given_pairs for name in (pair.config_a, pair.config_b)}
+            )
 
     @classmethod
     def from_configs_and_summaries(
@@ -398,63 +664,128 @@ class ProtocolDiff:
     ) -> "ProtocolDiff":
         """Build diff from configs and their protocol summaries."""
         config_names = sorted(configs.keys())
-        pairs = []
-
-        # Compare each pair of configs
-        for i, name_a in enumerate(config_names):
-            for name_b in config_names[i + 1 :]:
-                # Declared diffs (from config dictionaries)
-                declared = {}
-                all_keys = set(configs[name_a].keys()) | set(configs[name_b].keys())
-                for key in all_keys:
-                    val_a = configs[name_a].get(key)
-                    val_b = configs[name_b].get(key)
-                    if val_a != val_b:
-                        declared[key] = (val_a, val_b)
-
-                # Observed diffs (from protocol summaries)
-                observed = {}
-                summary_a = summaries.get(name_a)
-                summary_b = summaries.get(name_b)
-
-                if summary_a and summary_b:
-                    # Extract all observed fields from calls
-                    fields_a = _extract_fields(summary_a)
-                    fields_b = _extract_fields(summary_b)
-                    all_observed = set(fields_a.keys()) | set(fields_b.keys())
-
-                    for fld in all_observed:
-                        val_a = fields_a.get(fld, {}).get("value")
-                        val_b = fields_b.get(fld, {}).get("value")
-                        if val_a != val_b:
-                            observed[fld] = (val_a, val_b)
-
-                # Confounds: observed diffs that weren't declared
-                confounds = [k for k in observed if k not in declared]
-
-                pairs.append(
-                    ConfigPairDiff(
-                        config_a=name_a,
-                        config_b=name_b,
-                        declared_diffs=declared,
-                        observed_diffs=observed,
-                        confounds=confounds,
-                    )
-                )
 
-        return cls(pairs=pairs)
+        # Declared values per config key (missing keys count as None)
+        all_keys = {key for config in configs.values() for key in config}
+        declared = {
+            key: {name: configs[name].get(key) for name in config_names}
+            for key in sorted(all_keys)
+        }
+
+        # Observed values per field, for configs that made calls
+        extracted = {
+            name: _extract_fields(summaries[name]) for name in config_names if summaries.get(name)
+        }
+        all_fields = {fld for fields in extracted.values() for fld in fields}
+        observed = {
+            fld: {name: fields.get(fld, {}) for name, fields in extracted.items()}
+            for fld in sorted(all_fields)
+        }
+
+        diff = cls(config_names=config_names, declared=declared, observed=observed)
+        for fld, per_config in observed.items():
+            keys = diff._explaining_keys(fld)
+            groups: Dict[Any, Dict[Any, List[str]]] = {}
+            for name, info in per_config.items():
+                group = tuple(value_key(declared[key][name]) for key in keys)
+                groups.setdefault(group, {}).setdefault(
+                    value_key(info.get("value")), []
+                ).append(name)
+            conflicting = [
+                sorted(n for names in by_value.values() for n in names)
+                for by_value in groups.values()
+                if len(by_value) > 1
+            ]
+            if conflicting:
+                diff.confounded_fields[fld] = conflicting
+        return diff
+
+    def _explaining_keys(self, fld: str) -> List[str]:
+        """Declared keys that may explain differences in an observed field."""
+        keys = {fld} if fld in self.declared else set()
+        for info in self.observed.get(fld, {}).values():
+            source = info.get("source") or ""
+            if source.startswith("config."):
+                key = source[len("config."):].split(".", 1)[0].split("[", 1)[0]
+                if key in self.declared:
+                    keys.add(key)
+        return sorted(keys)
+
+    def pair(self, config_a: str, config_b: str) -> ConfigPairDiff:
+        """Get (and cache) the diff between two configs."""
+        cached = self._pairs.get((config_a, config_b))
+        if cached is not None:
+            return cached
+
+        declared = {}
+        for key, values in self.declared.items():
+            val_a, val_b = values.get(config_a), values.get(config_b)
+            if value_key(val_a) != value_key(val_b):
+                declared[key] = (val_a, val_b)
+
+        observed = {}
+        confounds = []
+        for fld, per_config in self.observed.items():
+            if config_a not in per_config or config_b not in per_config:
+                continue
+            val_a = per_config[config_a].get("value")
+            val_b = per_config[config_b].get("value")
+            if value_key(val_a) != value_key(val_b):
+                observed[fld] = (val_a, val_b)
+                if not any(key in declared for key in self._explaining_keys(fld)):
+                    confounds.append(fld)
+
+        diff = ConfigPairDiff(
+            config_a=config_a,
+            config_b=config_b,
+            declared_diffs=declared,
+            observed_diffs=observed,
+            confounds=confounds,
+        )
+        self._pairs[(config_a, config_b)] = diff
+        return diff
+
+    @property
+    def pairs(self) -> List[ConfigPairDiff]:
+        """Diffs of every pair of configs (built on first access)."""
+        if self._given_pairs is not None:
+            return list(self._given_pairs)
+        names = self.config_names
+        return [self.pair(a, b) for i, a in enumerate(names) for b in names[i + 1 :]]
 
     def has_confounds(self) -> bool:
         """Check if any pair has confounds."""
-        return any(pair.confounds for pair in self.pairs)
-
-    def pretty(self) -> str:
-        """Generate pretty-printed diff report."""
-        if not self.pairs:
+        return bool(self.confounded_fields)
+
+    def pretty(self, max_pairs: int = 28) -> str:
+        """Generate pretty-printed diff report.
+
+        Parameters
+        ----------
+        max_pairs : int
+            Print pairwise details only if there are at most this many
+            pairs (8 configs); larger sweeps get a per-field summary.
+        """
+        n = len(self.config_names)
+        if n < 2:
             return "No config pairs to compare."
 
         lines = ["Protocol Diff Report", "=" * 40]
 
+        if n * (n - 1) // 2 > max_pairs:
+            lines.append(f"{n} configs, {len(self.declared)} declared keys, "
+                         f"{len(self.observed)} observed fields")
+            if not self.confounded_fields:
+                lines.append("No confounds detected")
+            for fld, groups in self.confounded_fields.items():
+                lines.append(f"⚠️ CONFOUND {fld}: differs within {len(groups)} group(s)")
+                for group in groups[:3]:
+                    values = {
+                        display_value(self.observed[fld][name].get("value")) for name in group
+                    }
+                    lines.append(f"   {', '.join(group[:5])}: {', '.join(sorted(values))}")
+            return "\n".join(lines)
+
         for pair in self.pairs:
             lines.append(f"\n{pair.config_a} vs {pair.config_b}")
             lines.append("-" * 30)
@@ -468,7 +799,9 @@ class ProtocolDiff:
                 lines.append("Observed differences (in API calls):")
                 for field, (val_a, val_b) in pair.observed_diffs.items():
                     marker = " ⚠️" if field in pair.confounds else ""
-                    lines.append(f"  {field}: {val_a!r} → {val_b!r}{marker}")
+                    lines.append(
+                        f"  {field}: {display_value(val_a)} → {display_value(val_b)}{marker}"
+                    )
 
             if pair.confounds:
                 lines.append(f"⚠️ CONFOUNDS: {', '.join(pair.confounds)}")
@@ -479,54 +812,264 @@ class ProtocolDiff:
 
         return "\n".join(lines)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {"pairs": [pair.to_dict() for pair in self.pairs]}
+    def to_dict(self, include_pairs: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary.
+
+        Parameters
+        ----------
+        include_pairs : bool
+            Include every pairwise diff (O(configs²); pass False for large
+            sweeps)
+        """
+        data: Dict[str, Any] = {
+            "configs": self.config_names,
+            "confounded_fields": self.confounded_fields,
+        }
+        if include_pairs:
+            data["pairs"] = [pair.to_dict() for pair in self.pairs]
+        return data
 
 
 def _extract_fields(summary: ProtocolSummary) -> Dict[str, Dict[str, Any]]:
     """Extract all fields from a protocol summary, taking last seen value."""
     fields: Dict[str, Dict[str, Any]] = {}
-    for call in summary.api_calls:
+    for call in sorted(summary.api_calls, key=lambda c: c.get("last_ts") or ""):
         for field_name, field_info in call.get("fields", {}).items():
             fields[field_name] = field_info
     return fields
 
 
-def determine_provenance(
-    field_name: str,
-    value: Any,
-    config: Dict[str, Any],
-    present_in_request: bool = True,
-) -> str:
-    """Determine the provenance (source) of a field value.
+def field_leaf(field_name: str) -> str:
+    """Last key of a field path ("options.temperature" -> "temperature")."""
+    return field_name.rsplit(".", 1)[-1].split("[", 1)[0]
 
-    Parameters
-    ----------
-    field_name : str
-        Name of the field
-    value : Any
-        The value in the request
-    config : dict
-        The experiment config
-    present_in_request : bool
-        Whether the field was present in the request
 
-    Returns
-    -------
-    str
-        Source: "config.<key>", "hardcoded", "implicit_default", or "unknown"
+def _value_key(value: Any) -> Any:
+    """Hashable lookup key for a value (equal values get equal keys)."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    try:
+        return ("json", json.dumps(value, sort_keys=True, default=str))
+    except (TypeError, ValueError):
+        return ("repr", repr(value))
+
+
+def _children(path: str, value: Any, collapse: bool = False) -> List[Tuple[str, Any]]:
+    """Child (path, value) pairs of a dict or list ("a.b", "a[0]").
+
+    With ``collapse``, list items share the path "a[]".
     """
-    if not present_in_request:
-        # Field not in request - check if it's sensitive
-        if field_name.lower() in SENSITIVE_FIELDS:
-            return "implicit_default"
-        return "implicit_default"
-
-    # Check if value matches any config key
-    for key, config_val in config.items():
-        if value == config_val:
-            return f"config.{key}"
-
-    # Value present but not from config
+    if isinstance(value, dict):
+        return [(f"{path}.{k}", v) for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        if collapse:
+            return [(f"{path}[]", v) for v in value]
+        return [(f"{path}[{i}]", v) for i, v in enumerate(value)]
+    return []
+
+
+def _merge_sources(sources: List[str]) -> str:
+    """Source of a collapsed list field ("hardcoded" if any item is untraced)."""
+    unique = list(dict.fromkeys(sources))
+    if len(unique) == 1 or "hardcoded" not in unique:
+        return unique[0]
     return "hardcoded"
+
+
+def _is_branch(value: Any) -> bool:
+    """Whether a body value is expanded into nested fields.
+
+    Dicts are; lists only when they hold dicts or lists (e.g. messages),
+    so scalar lists such as ``stop`` stay one field.
+    """
+    if isinstance(value, dict):
+        return bool(value)
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(v, (dict, list, tuple)) for v in value)
+    return False
+
+
+def nested_keys(body: Dict[str, Any], max_nodes: int = MAX_PROVENANCE_NODES) -> Set[str]:
+    """Every dict key in a request body, at any depth (breadth-first, capped)."""
+    keys: Set[str] = set()
+    queue: Deque[Any] = deque([body])
+    seen = 0
+    while queue and seen < max_nodes:
+        value = queue.popleft()
+        seen += 1
+        if isinstance(value, dict):
+            keys.update(str(k) for k in value)
+            queue.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            queue.extend(value)
+    return keys
+
+
+class ProvenanceIndex:
+    """Maps every config value, at any depth, to its dotted key path.
+
+    Built once per context, so each request field resolves with a single
+    dict lookup instead of a scan of the config, and values nested in the
+    config (``options.temperature``) or in the request
+    (``messages[].content``) are traced too. When a value occurs more than
+    once, the shallowest path wins.
+    """
+
+    def __init__(self, config: Dict[str, Any], max_nodes: int = MAX_PROVENANCE_NODES):
+        """Index a config.
+
+        Parameters
+        ----------
+        config : dict
+            The experiment config
+        max_nodes : int
+            Stop indexing after this many values (breadth-first)
+        """
+        self._paths: Dict[Any, str] = {}
+        queue: Deque[Tuple[str, Any]] = deque((str(k), v) for k, v in config.items())
+        seen = 0
+        while queue and seen < max_nodes:
+            path, value = queue.popleft()
+            seen += 1
+            self._paths.setdefault(_value_key(value), path)
+            queue.extend(_children(path, value))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def resolve(self, value: Any) -> Optional[str]:
+        """Source of a value ("config.<path>"), or None if not from the config."""
+        path = self._paths.get(_value_key(value))
+        return None if path is None else f"config.{path}"
+
+    def iter_fields(
+        self, body: Dict[str, Any], max_fields: int = MAX_PROVENANCE_FIELDS
+    ) -> Iterator[Tuple[str, Any, str]]:
+        """Resolve the fields of a request body, descending into nested values.
+
+        A value that matches the config as a whole is reported as one field;
+        otherwise dicts and lists of objects are expanded breadth-first.
+        List items are collapsed into one field per key
+        (``messages[].content``) whose value lists the items' values, so a
+        long conversation does not become one field per message. Top-level
+        fields are always reported; nested values are only expanded while
+        the total stays within ``max_fields``.
+
+        Yields
+        ------
+        tuple
+            (field path, value, source)
+        """
+        leaves: Dict[str, List[Tuple[Any, str]]] = {}
+        queue: Deque[Tuple[str, Any]] = deque((str(k), v) for k, v in body.items())
+        emitted = 0
+        while queue:
+            path, value = queue.popleft()
+            source = self.resolve(value)
+            if source is None and _is_branch(value):
+                children = _children(path, value, collapse=True)
+                if emitted + len(queue) + len(children) <= max_fields:
+                    queue.extend(children)
+                    continue
+            emitted += 1
+            leaves.setdefault(path, []).append((value, source or "hardcoded"))
+
+        for path, items in leaves.items():
+            if "[]" in path:
+                values = [value for value, _ in items]
+                yield path, values, _merge_sources([source for _, source in items])
+            else:
+                value, source = items[0]
+                yield path, value, source
+
+
+def is_value_ref(value: Any) -> bool:
+    """Check whether a field value is a compacted reference."""
+    return isinstance(value, dict) and VALUE_REF_KEY in value
+
+
+def value_key(value: Any) -> Any:
+    """Hashable comparison key of a field value (the hash for references)."""
+    if is_value_ref(value):
+        return (VALUE_REF_KEY, value[VALUE_REF_KEY])
+    return _value_key(value)
+
+
+def display_value(value: Any) -> str:
+    """Short printable form of a field value."""
+    if is_value_ref(value):
+        return f"{value['preview']}... ({value['size']} chars, sha256 {value[VALUE_REF_KEY][:12]})"
+    return repr(value)
+
+
+def find_value_refs(obj: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every compacted value reference nested in a document."""
+    if is_value_ref(obj):
+        yield obj
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            yield from find_value_refs(item)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from find_value_refs(item)
+
+
+class ValueInterner:
+    """Compacts the field values of protocol events.
+
+    Values whose canonical JSON is longer than ``max_inline`` chars (e.g. a
+    chat ``messages`` array) are replaced by a reference holding their
+    SHA256, size and a preview. References are interned: every event of a
+    run that carries the same value shares one reference object. With
+    ``spill``, the full value is also written once to the blob store (the
+    reference's hash is then its blob digest).
+    """
+
+    def __init__(
+        self,
+        spill: Optional[Callable[[bytes], str]] = None,
+        max_inline: int = MAX_INLINE_VALUE_CHARS,
+    ):
+        """Initialize the interner.
+
+        Parameters
+        ----------
+        spill : Callable, optional
+            Stores bytes and returns their SHA256 (e.g. BlobStore.put)
+        max_inline : int
+            Longest JSON encoding kept inline
+        """
+        self._spill = spill
+        self._max_inline = max_inline
+        self._refs: Dict[str, Dict[str, Any]] = {}
+
+    def compact(self, value: Any) -> Any:
+        """Return the value itself if small, or its interned reference."""
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, str) and len(value) <= self._max_inline // 6:
+            return value  # short enough whatever its escaping
+        text = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+        if len(text) <= self._max_inline:
+            return value
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        ref = self._refs.get(digest)
+        if ref is None:
+            if self._spill is not None:
+                self._spill(data)
+            ref = self._refs[digest] = {
+                VALUE_REF_KEY: digest,
+                "size": len(text),
+                "preview": text[:VALUE_PREVIEW_CHARS],
+            }
+        return ref
+
+    def compact_fields(self, fields: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Compact the values of an analyzed field dict in place."""
+        for info in fields.values():
+            info["value"] = self.compact(info["value"])
+        return fields
@@ -0,0 +1,200 @@
+"""Pluggable JSON serializers for Crystallize artifacts.
+
+Manifests, prereg artifacts and event logs are encoded by a Serializer.
+The default is the standard library, whose output is exactly what
+hash_canonical() hashes; orjson and msgspec are faster and opt-in
+(``Store(serializer="orjson")``). All backends share one hook
+(to_jsonable) so NumPy arrays and scalars become lists/numbers and
+dataclasses become dicts, instead of their repr strings.
+
+Note: orjson and msgspec write NaN/Infinity as null (strict JSON) and
+datetimes in their own format, so a stored manifest holding such values
+no longer re-hashes to its manifest_hash. The standard library writes
+NaN/Infinity literals and round-trips them.
+
+Hashes never depend on the backend: hash_canonical() always streams the
+standard library's canonical encoding (sorted keys, compact separators).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Optional
+
+_CANONICAL_SEPARATORS = (",", ":")
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert a value the JSON encoders don't handle natively.
+
+    NumPy arrays become (nested) lists, NumPy scalars Python numbers,
+    dataclasses dicts; anything else falls back to ``str(value)``.
+    """
+    if type(value).__module__ == "numpy" and hasattr(value, "tolist"):
+        # Checked by module name so numpy is never imported here
+        return value.tolist()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class Serializer:
+    """JSON encoder backend.
+
+    Attributes
+    ----------
+    name : str
+        Backend name
+    dumps : Callable
+        (obj, indent) -> UTF-8 bytes; indent is 2 or None (compact)
+    """
+
+    name: str
+    dumps: Callable[[Any, Optional[int]], bytes]
+
+    def dump(self, obj: Any, f: IO[str], indent: Optional[int] = 2) -> None:
+        """Encode an object into a text stream."""
+        f.write(self.dumps(obj, indent).decode("utf-8"))
+
+
+def _json_dumps(obj: Any, indent: Optional[int]) -> bytes:
+    separators = None if indent else _CANONICAL_SEPARATORS
+    return json.dumps(obj, indent=indent, separators=separators, default=to_jsonable).encode()
+
+
+class _StdlibSerializer(Serializer):
+    """Standard library backend; streams into the file instead of building bytes."""
+
+    def dump(self, obj: Any, f: IO[str], indent: Optional[int] = 2) -> None:
+        separators = None if indent else _CANONICAL_SEPARATORS
+        json.dump(obj, f, indent=indent, separators=separators, default=to_jsonable)
+
+
+def _make_orjson() -> Serializer:
+    import orjson
+
+    compact = orjson.OPT_NON_STR_KEYS
+    indented = compact | orjson.OPT_INDENT_2
+
+    # NumPy values go through to_jsonable (not OPT_SERIALIZE_NUMPY) so
+    # float32 values are written exactly as the canonical hash sees them
+    def dumps(obj: Any, indent: Optional[int]) -> bytes:
+        try:
+            return orjson.dumps(obj, default=to_jsonable, option=indented if indent else compact)
+        except orjson.JSONEncodeError:
+            return _json_dumps(obj, indent)  # e.g. integers beyond 64 bits
+
+    return Serializer("orjson", dumps)
+
+
+def _make_msgspec() -> Serializer:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=to_jsonable)
+
+    def dumps(obj: Any, indent: Optional[int]) -> bytes:
+        try:
+            data = encoder.encode(obj)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return _json_dumps(obj, indent)  # e.g. integers beyond 64 bits
+        return msgspec.json.format(data, indent=indent) if indent else data
+
+    return Serializer("msgspec", dumps)
+
+
+_FACTORIES: Dict[str, Callable[[], Serializer]] = {
+    "orjson": _make_orjson,
+    "msgspec": _make_msgspec,
+    "json": lambda: _StdlibSerializer("json", _json_dumps),
+}
+
+# Backend for None/"auto": matches the canonical hash encoding
+_DEFAULT = "json"
+
+_cache: Dict[str, Serializer] = {}
+
+
+def register_serializer(name: str, factory: Callable[[], Serializer]) -> None:
+    """Register a serializer backend.
+
+    Parameters
+    ----------
+    name : str
+        Backend name; replaces any backend with the same name
+    factory : Callable
+        Builds the Serializer (may raise ImportError if unavailable)
+    """
+    _FACTORIES[name] = factory
+    _cache.pop(name, None)
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Get a serializer backend.
+
+    Parameters
+    ----------
+    name : str, optional
+        "orjson", "msgspec", "json" or a registered name. None or "auto"
+        gives the standard library backend.
+
+    Returns
+    -------
+    Serializer
+        The backend
+    """
+    if name is None or name == "auto":
+        name = _DEFAULT
+    if name in _cache:
+        return _cache[name]
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown serializer {name!r}. Available: {sorted(_FACTORIES)}")
+    try:
+        serializer = _FACTORIES[name]()
+    except ImportError:
+        raise ImportError(
+            f"The '{name}' library is required for the {name} serializer. "
+            f"Install it with: pip install {name}"
+        ) from None
+    _cache[name] = serializer
+    return serializer
+
+
+def hash_canonical(obj: Dict[str, Any]) -> str:
+    """SHA256 of the canonical JSON encoding of a dict, computed streaming.
+
+    Produces the same digest as hashing
+    ``json.dumps(obj, sort_keys=True, separators=(",", ":"))``, but encodes
+    one top-level value at a time so the full document is never held as a
+    single string.
+
+    Parameters
+    ----------
+    obj : dict
+        Dict with string keys (e.g. a manifest)
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    h = hashlib.sha256()
+    h.update(b"{")
+    for i, key in enumerate(sorted(obj)):
+        if i:
+            h.update(b",")
+        h.update(json.dumps(key).encode())
+        h.update(b":")
+        h.update(
+            json.dumps(
+                obj[key],
+                sort_keys=True,
+                separators=_CANONICAL_SEPARATORS,
+                default=to_jsonable,
+            ).encode()
+        )
+    h.update(b"}")
+    return h.hexdigest()
@@ -8,12 +8,100 @@ from __future__ import annotations
 import json
 import os
 import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .blobs import BLOB_REF_KEY, BlobStore, externalize, is_blob_ref, resolve
+from .cassette import Cassette
+from .catalog import Catalog, catalog_entry_from_manifest, catalog_entry_from_prereg
+from .compression import (
+    SUFFIXES,
+    open_text_reader,
+    open_text_writer,
+    strip_suffix,
+    validate_compression,
+)
+from .events import EventLog, compact_events, read_events
+from .meta import LineageSummary, lineage_summary
+from .protocol import VALUE_REF_KEY, ValueInterner, find_value_refs
+from .serialize import get_serializer
+from .writer import BackgroundWriter
+
+if TYPE_CHECKING:
+    from .memory import AnyStore
 
 # Default storage root
 DEFAULT_ROOT = ".crystallize"
 
+# Manifest sections that grow with replicate count; kept out of the metadata sidecar
+HEAVY_SECTIONS = ("results", "metrics", "protocol")
+
+# Return values whose JSON encoding exceeds this many bytes go to the blob store
+DEFAULT_BLOB_THRESHOLD = 64 * 1024
+
+# Durability policies:
+#   strict  - fsync every file before it is renamed into place (default)
+#   batched - defer fsyncs and ledger writes to flush(), which commits them
+#             together with one fsync per touched directory
+#   none    - never fsync (tests, throwaway runs)
+DURABILITY_MODES = ("strict", "batched", "none")
+
+# gc() leaves temp files and unreferenced blobs younger than this alone, as
+# they may belong to a write or run still in progress
+GC_GRACE_SECONDS = 3600.0
+
+
+@dataclass
+class GCReport:
+    """What Store.gc() removed (or would remove, for a dry run).
+
+    Attributes
+    ----------
+    removed_runs : list
+        Explore run IDs whose manifests, sidecars and event logs were removed
+    removed_blobs : int
+        Unreferenced blobs removed
+    removed_temp_files : int
+        Orphaned ``.tmp_*`` files removed
+    compacted_ledgers : int
+        Per-config ledger files merged into per-lineage ledgers
+    reclaimed_bytes : int
+        Total size of the removed files
+    dry_run : bool
+        Whether nothing was actually deleted
+    """
+
+    removed_runs: List[str] = field(default_factory=list)
+    removed_blobs: int = 0
+    removed_temp_files: int = 0
+    compacted_ledgers: int = 0
+    reclaimed_bytes: int = 0
+    dry_run: bool = False
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        verb = "Would remove" if self.dry_run else "Removed"
+        return (
+            f"{verb} {len(self.removed_runs)} runs, {self.removed_blobs} blobs, "
+            f"{self.removed_temp_files} temp files; compacted {self.compacted_ledgers} "
+            f"ledgers; {self.reclaimed_bytes / 1e6:.2f} MB reclaimed"
+        )
+
 
 class Store:
     """Filesystem storage for experiment artifacts.
@@ -22,23 +110,92 @@ class Store:
         .crystallize/
         ├── runs/           # Run manifests (explore and confirm)
         ├── prereg/         # Pre-registration artifacts
-        └── ledger/         # Replicate index tracking per lineage/config
+        ├── ledger/         # Replicate index tracking per lineage/config
+        ├── events/         # Append-only per-run event logs (JSON lines)
+        ├── blobs/          # Content-addressed large return values
+        ├── cassettes/      # Recorded HTTP responses (http_mode="record")
+        └── catalog.sqlite  # Index of all runs (rebuildable)
     """
 
-    def __init__(self, root: Optional[str] = None):
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        *,
+        compression: Optional[str] = None,
+        blob_threshold: int = DEFAULT_BLOB_THRESHOLD,
+        blob_codec: Optional[str] = None,
+        durability: str = "strict",
+        async_writes: bool = False,
+        write_queue_size: int = 256,
+        on_write_error: str = "raise",
+        serializer: Optional[str] = None,
+    ):
         """Initialize the store.
 
         Parameters
         ----------
         root : str, optional
             Root directory for storage. Defaults to ".crystallize"
+        compression : str, optional
+            Compress new manifests and prereg artifacts with "gzip" or
+            "zstd" (requires the zstandard package). Reads always detect
+            the format, whatever this is set to.
+        blob_threshold : int
+            Replicate return values larger than this (in encoded bytes) are
+            stored in the blob store and referenced from manifests
+        blob_codec : str, optional
+            Registered blob codec to use (e.g. "pickle"); by default JSON,
+            with NumPy values and dataclasses converted as in manifests
+        durability : str
+            "strict", "batched" or "none" (see DURABILITY_MODES). In batched
+            mode nothing is guaranteed durable until flush() returns.
+        async_writes : bool
+            Run manifest, ledger, blob and event-log writes on a background
+            thread. Reads and flush() wait for queued writes; prereg writes
+            stay synchronous. Call close() (or flush()) when done.
+        write_queue_size : int
+            Maximum queued writes before callers block (backpressure)
+        on_write_error : str
+            "raise" re-raises a failed background write on the next store
+            call or flush(); "warn" only emits a RuntimeWarning
+        serializer : str, optional
+            JSON backend for manifests, prereg artifacts and event logs:
+            "json" (default), "orjson" or "msgspec". The faster backends
+            write NaN as null, so manifests holding it stop verifying.
         """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown durability {durability!r}; expected one of {DURABILITY_MODES}"
+            )
+        self.durability = durability
+        self.compression = validate_compression(compression)
+        self.serializer = get_serializer(serializer)
         self.root = Path(root or DEFAULT_ROOT)
         self._ensure_structure()
+        # Batched-mode state: files renamed but not yet fsynced, and ledger
+        # updates not yet written ({lineage_id: {config_fp: next_index}})
+        self._unsynced: Set[Path] = set()
+        self._pending_ledgers: Dict[str, Dict[str, int]] = {}
+        self._writer = (
+            BackgroundWriter(write_queue_size, on_write_error) if async_writes else None
+        )
+
+        self.catalog = Catalog(
+            self.root / "catalog.sqlite",
+            synchronous={"strict": "FULL", "batched": "NORMAL", "none": "OFF"}[durability],
+        )
+        self.blobs = BlobStore(
+            self.root / "blobs",
+            fsync=durability == "strict",
+            on_write=self._unsynced.add if durability == "batched" else None,
+            submit=self._writer.submit if self._writer else None,
+        )
+        self.blob_threshold = blob_threshold
+        self.blob_codec = blob_codec
 
     def _ensure_structure(self) -> None:
         """Create directory structure if it doesn't exist."""
-        for subdir in ["runs", "prereg", "ledger"]:
+        for subdir in ["runs", "prereg", "ledger", "events"]:
             (self.root / subdir).mkdir(parents=True, exist_ok=True)
 
     def _atomic_write(self, path: Path, data: str) -> None:
@@ -51,6 +208,28 @@ class Store:
         data : str
             Content to write
         """
+        self._atomic_write_stream(path, lambda f: f.write(data))
+
+    def _atomic_write_stream(
+        self,
+        path: Path,
+        write: Callable[[IO[str]], Any],
+        compression: Optional[str] = None,
+    ) -> None:
+        """Atomically write a file whose content is produced by a callback.
+
+        Lets large documents be streamed (e.g. json.dump) into the temp file,
+        through the compressor if any, instead of being built as one string.
+
+        Parameters
+        ----------
+        path : Path
+            Target file path
+        write : Callable
+            Called with the open (text) temp file
+        compression : str, optional
+            "gzip" or "zstd"
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write to temp file in same directory (for atomic rename)
@@ -60,11 +239,15 @@ class Store:
             suffix=".json",
         )
         try:
-            with os.fdopen(fd, "w") as f:
-                f.write(data)
+            with os.fdopen(fd, "wb") as f:
+                with open_text_writer(f, compression) as text:
+                    write(text)
                 f.flush()
-                os.fsync(f.fileno())
+                if self.durability == "strict":
+                    os.fsync(f.fileno())
             os.rename(temp_path, path)
+            if self.durability == "batched":
+                self._unsynced.add(path)
         except Exception:
             # Clean up temp file on failure
             try:
@@ -73,10 +256,81 @@ class Store:
                 pass
             raise
 
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Run a write on the background writer, or inline without one."""
+        if self._writer is not None:
+            self._writer.submit(fn, *args)
+        else:
+            fn(*args)
+
+    def _drain(self) -> None:
+        """Wait for queued background writes (so reads see them)."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def flush(self) -> None:
+        """Make every write so far visible and durable.
+
+        Waits for queued background writes, surfacing any error. In batched
+        mode it then writes pending ledger updates (one file per lineage),
+        fsyncs each file written since the last flush, then fsyncs each
+        touched directory once.
+        """
+        self._drain()
+        if self.durability != "batched":
+            return
+
+        for lineage_id, updates in self._pending_ledgers.items():
+            path = self._lineage_ledger_path(lineage_id)
+            configs = self._read_lineage_ledger(lineage_id)
+            for config_fp, next_index in updates.items():
+                configs[config_fp] = max(configs.get(config_fp, 0), next_index)
+            data = {"lineage_id": lineage_id, "configs": configs}
+            self._atomic_write(path, json.dumps(data, indent=2, sort_keys=True))
+        self._pending_ledgers.clear()
+
+        dirs: Set[Path] = set()
+        for path in self._unsynced:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            dirs.add(path.parent)
+        self._unsynced.clear()
+
+        for directory in dirs:
+            _fsync_dir(directory)
+
+    def close(self) -> None:
+        """Flush, stop the background writer and close the catalog."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        self.catalog.close()
+
     def _ledger_path(self, lineage_id: str, config_fp: str) -> Path:
         """Get path to ledger file for a lineage/config pair."""
         return self.root / "ledger" / f"{lineage_id}_{config_fp}.json"
 
+    def _lineage_ledger_path(self, lineage_id: str) -> Path:
+        """Get path to the combined ledger file for a lineage."""
+        return self.root / "ledger" / f"{lineage_id}.json"
+
+    def _read_lineage_ledger(self, lineage_id: str) -> Dict[str, int]:
+        """Read {config_fp: next_index} from a combined lineage ledger."""
+        path = self._lineage_ledger_path(lineage_id)
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return dict(json.load(f).get("configs", {}))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
     def read_ledger(self, lineage_id: str, config_fp: str) -> int:
         """Read the next available replicate index.
 
@@ -92,15 +346,21 @@ class Store:
         int
             Next available index (0 if ledger doesn't exist)
         """
+        self._drain()
+        # Indices only grow, so the highest of the per-config file, the
+        # combined lineage file and any unflushed update wins
+        candidates = [
+            self._pending_ledgers.get(lineage_id, {}).get(config_fp, 0),
+            self._read_lineage_ledger(lineage_id).get(config_fp, 0),
+        ]
         path = self._ledger_path(lineage_id, config_fp)
-        if not path.exists():
-            return 0
-        try:
-            with open(path) as f:
-                data = json.load(f)
-                return data.get("next_index", 0)
-        except (json.JSONDecodeError, OSError):
-            return 0
+        if path.exists():
+            try:
+                with open(path) as f:
+                    candidates.append(json.load(f).get("next_index", 0))
+            except (json.JSONDecodeError, OSError):
+                pass
+        return max(candidates)
 
     def update_ledger(self, lineage_id: str, config_fp: str, new_index: int) -> None:
         """Update the next available replicate index.
@@ -114,9 +374,13 @@ class Store:
         new_index : int
             New next index value
         """
+        if self.durability == "batched":
+            self._pending_ledgers.setdefault(lineage_id, {})[config_fp] = new_index
+            return
+
         path = self._ledger_path(lineage_id, config_fp)
         data = {"lineage_id": lineage_id, "config_fingerprint": config_fp, "next_index": new_index}
-        self._atomic_write(path, json.dumps(data, indent=2))
+        self._submit(self._atomic_write, path, json.dumps(data, indent=2))
 
     def allocate_replicates(
         self, lineage_id: str, config_fp: str, count: int
@@ -157,8 +421,14 @@ class Store:
         Path
             Path to the written file
         """
-        path = self.root / "prereg" / f"{run_id}.json"
-        self._atomic_write(path, json.dumps(prereg_data, indent=2, default=str))
+        # Synchronous barrier: everything queued before the prereg lands first
+        self._drain()
+        path = self._write_artifact(
+            self.prereg_dir,
+            run_id,
+            lambda f: self.serializer.dump(prereg_data, f),
+        )
+        self.catalog.record_run(run_id, prereg=True, **catalog_entry_from_prereg(prereg_data))
         return path
 
     def write_run_manifest(self, run_id: str, manifest: Dict[str, Any]) -> Path:
@@ -169,17 +439,89 @@ class Store:
         run_id : str
             Run ID
         manifest : dict
-            Run manifest data
+            Run manifest data (not to be mutated afterwards when writes are
+            asynchronous)
 
         Returns
         -------
         Path
-            Path to the written file
+            Path to the written file (possibly still being written)
+        """
+        self._submit(self._write_run_manifest, run_id, manifest)
+        return self.runs_dir / f"{run_id}{SUFFIXES[self.compression]}"
+
+    def _write_run_manifest(self, run_id: str, manifest: Dict[str, Any]) -> None:
+        """Write a manifest, its metadata sidecar and its catalog entry."""
+        self._write_artifact(
+            self.runs_dir,
+            run_id,
+            lambda f: self.serializer.dump(manifest, f),
+        )
+
+        # Lightweight sidecar so loaders can skip the heavy sections
+        meta = {k: v for k, v in manifest.items() if k not in HEAVY_SECTIONS}
+        self._atomic_write_stream(self._meta_path(run_id), lambda f: self.serializer.dump(meta, f))
+        self.catalog.record_run(run_id, manifest=True, **catalog_entry_from_manifest(meta))
+
+    def _find_artifact(self, directory: Path, run_id: str) -> Optional[Path]:
+        """Find the stored file for a run in any supported format."""
+        for suffix in SUFFIXES.values():
+            path = directory / f"{run_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _write_artifact(
+        self, directory: Path, run_id: str, write: Callable[[IO[str]], Any]
+    ) -> Path:
+        """Write a manifest/prereg in the configured format.
+
+        Variants in other formats are removed, so each run has one file.
         """
-        path = self.root / "runs" / f"{run_id}.json"
-        self._atomic_write(path, json.dumps(manifest, indent=2, default=str))
+        path = directory / f"{run_id}{SUFFIXES[self.compression]}"
+        self._atomic_write_stream(path, write, self.compression)
+        for suffix in SUFFIXES.values():
+            stale = directory / f"{run_id}{suffix}"
+            if stale != path and stale.exists():
+                stale.unlink()
         return path
 
+    def _read_artifact(self, directory: Path, run_id: str) -> Optional[Dict[str, Any]]:
+        """Read a manifest/prereg, decompressing if needed."""
+        path = self._find_artifact(directory, run_id)
+        if path is None:
+            return None
+        try:
+            with open_text_reader(path) as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def run_manifest_path(self, run_id: str) -> Path:
+        """Get path to the manifest file for a run.
+
+        Returns the existing file in whatever format it was written, or the
+        path a new manifest would be written to.
+        """
+        self._drain()
+        existing = self._find_artifact(self.runs_dir, run_id)
+        return existing or self.runs_dir / f"{run_id}{SUFFIXES[self.compression]}"
+
+    def manifest_stamp(self, run_id: str) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) of a run manifest, or None if it is missing.
+
+        Used by RunLoader to tell whether cached sections are stale.
+        """
+        try:
+            st = self.run_manifest_path(run_id).stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _meta_path(self, run_id: str) -> Path:
+        """Get path to the metadata sidecar for a run."""
+        return self.root / "runs" / f"{run_id}.meta.json"
+
     def read_run_manifest(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Read a run manifest.
 
@@ -193,14 +535,38 @@ class Store:
         dict or None
             Manifest data, or None if not found
         """
-        path = self.root / "runs" / f"{run_id}.json"
-        if not path.exists():
-            return None
-        try:
-            with open(path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
+        self._drain()
+        return self._read_artifact(self.runs_dir, run_id)
+
+    def read_run_meta(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Read a run manifest without its heavy sections.
+
+        Uses the metadata sidecar when present, and falls back to the full
+        manifest for runs written before sidecars existed.
+
+        Parameters
+        ----------
+        run_id : str
+            Run ID
+
+        Returns
+        -------
+        dict or None
+            Manifest data minus results/metrics/protocol, or None if not found
+        """
+        self._drain()
+        path = self._meta_path(run_id)
+        if path.exists():
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        manifest = self.read_run_manifest(run_id)
+        if manifest is None:
             return None
+        return {k: v for k, v in manifest.items() if k not in HEAVY_SECTIONS}
 
     def read_prereg(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Read a pre-registration artifact.
@@ -215,14 +581,359 @@ class Store:
         dict or None
             Pre-registration data, or None if not found
         """
-        path = self.root / "prereg" / f"{run_id}.json"
+        self._drain()
+        return self._read_artifact(self.prereg_dir, run_id)
+
+    def externalize(self, value: Any) -> Any:
+        """Prepare a replicate return value for a manifest.
+
+        Large values are written to the blob store (deduplicated by content
+        hash) and replaced by a reference.
+
+        Parameters
+        ----------
+        value : Any
+            A replicate return value
+
+        Returns
+        -------
+        Any
+            The value, or a blob reference dict
+        """
+        return externalize(self.blobs, value, self.blob_threshold, self.blob_codec)
+
+    def resolve_results(self, results: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Replace blob references in a manifest results section with values."""
+        self._drain()
+        return {
+            name: [resolve(self.blobs, value) for value in values]
+            for name, values in results.items()
+        }
+
+    def _event_log_path(self, run_id: str) -> Path:
+        """Get path to the event log for a run."""
+        return self.root / "events" / f"{run_id}.jsonl"
+
+    def open_event_log(self, run_id: str) -> EventLog:
+        """Open the append-only event log for a run.
+
+        Parameters
+        ----------
+        run_id : str
+            Run ID
+
+        Returns
+        -------
+        EventLog
+            Writer; close it (or use it as a context manager) when done
+        """
+        return EventLog(
+            self._event_log_path(run_id),
+            fsync=self.durability != "none",
+            serializer=self.serializer,
+            submit=self._writer.submit if self._writer else None,
+        )
+
+    def open_cassette(self) -> Cassette:
+        """Open the store's HTTP cassette (recorded responses, see cassette.py).
+
+        Returns
+        -------
+        Cassette
+            Index under ``cassettes/http.jsonl``; bodies live in the blob store
+        """
+        self._drain()
+        return Cassette(self.root / "cassettes" / "http.jsonl", self.blobs)
+
+    def value_interner(self) -> ValueInterner:
+        """Create an interner that spills large protocol field values to blobs."""
+        return ValueInterner(spill=self.blobs.put)
+
+    def read_protocol_value(self, ref: Dict[str, Any]) -> Any:
+        """Load the full value behind a compacted protocol field value.
+
+        Parameters
+        ----------
+        ref : dict
+            Reference from a protocol event's fields (``{"$value": ...}``)
+
+        Returns
+        -------
+        Any
+            The original value
+        """
+        self._drain()
+        return json.loads(self.blobs.get(ref[VALUE_REF_KEY]))
+
+    def read_event_log(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the logged events of a run (empty if there is no log)."""
+        self._drain()
+        path = self._event_log_path(run_id)
         if not path.exists():
+            return iter(())
+        return read_events(path)
+
+    def compact_event_log(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the results/metrics/protocol sections of a run from its log.
+
+        Useful for recovering runs that crashed before writing a manifest.
+
+        Parameters
+        ----------
+        run_id : str
+            Run ID
+
+        Returns
+        -------
+        dict or None
+            Compacted sections (see events.compact_events), or None if no log
+        """
+        self._drain()
+        if not self._event_log_path(run_id).exists():
             return None
-        try:
-            with open(path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            return None
+        return compact_events(self.read_event_log(run_id))
+
+    def gc(
+        self,
+        *,
+        keep: Optional[int] = None,
+        older_than: Optional[Union[float, timedelta]] = None,
+        dry_run: bool = False,
+    ) -> GCReport:
+        """Remove unneeded files from the store.
+
+        - Orphaned ``.tmp_*`` files from interrupted writes are deleted.
+        - Explore runs are deleted if they are outside the ``keep`` most
+          recent and older than ``older_than`` (with neither given, no runs
+          are deleted). Explore runs referenced by a confirm run are always
+          kept, and confirm runs are never deleted.
+        - Blobs no longer referenced by any manifest or event log are deleted.
+        - Per-config ledger files are merged into one file per lineage.
+          Ledgers are never dropped, so replicate indices stay fresh.
+
+        Parameters
+        ----------
+        keep : int, optional
+            Number of most recent explore runs to keep
+        older_than : float or timedelta, optional
+            Only delete explore runs older than this (seconds)
+        dry_run : bool
+            Report what would be removed without deleting anything
+
+        Returns
+        -------
+        GCReport
+            What was removed and how many bytes were reclaimed
+        """
+        self.flush()
+        report = GCReport(dry_run=dry_run)
+        now = time.time()
+        if isinstance(older_than, timedelta):
+            older_than = older_than.total_seconds()
+
+        def remove(path: Path) -> None:
+            try:
+                report.reclaimed_bytes += path.stat().st_size
+                if not dry_run:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+        # Orphaned temp files
+        for directory in (self.runs_dir, self.prereg_dir, self.ledger_dir, self.blobs.root):
+            if not directory.exists():
+                continue
+            for path in directory.rglob(".tmp_*"):
+                if now - path.stat().st_mtime > GC_GRACE_SECONDS:
+                    remove(path)
+                    report.removed_temp_files += 1
+
+        # Explore runs, newest first, minus those a confirm run builds on
+        referenced: Set[str] = set()
+        runs: List[Tuple[float, str, Path]] = []
+        for path in self.runs_dir.iterdir():
+            run_id = strip_suffix(path.name)
+            if run_id is None:
+                continue
+            if run_id.startswith("exp_"):
+                runs.append((path.stat().st_mtime, run_id, path))
+            else:
+                meta = self.read_run_meta(run_id) or {}
+                referenced.add(meta.get("parent_run_id"))
+        for path in self.prereg_dir.iterdir():
+            run_id = strip_suffix(path.name)
+            prereg = self.read_prereg(run_id) if run_id else None
+            if prereg is not None:
+                referenced.add(prereg.get("parent_run_id"))
+
+        runs.sort(reverse=True)
+        if keep is not None or older_than is not None:
+            for i, (mtime, run_id, path) in enumerate(runs):
+                if keep is not None and i < keep:
+                    continue
+                if older_than is not None and now - mtime <= older_than:
+                    continue
+                if run_id in referenced:
+                    continue
+                remove(path)
+                remove(self._meta_path(run_id))
+                remove(self._event_log_path(run_id))
+                if not dry_run:
+                    self.catalog.remove_run(run_id)
+                report.removed_runs.append(run_id)
+
+        # Blobs referenced by what remains
+        removed = set(report.removed_runs)
+        live: Set[str] = set()
+        for path in self.runs_dir.iterdir():
+            run_id = strip_suffix(path.name)
+            if run_id is None or run_id in removed:
+                continue
+            manifest = self.read_run_manifest(run_id) or {}
+            for values in (manifest.get("results") or {}).values():
+                live.update(v[BLOB_REF_KEY] for v in values if is_blob_ref(v))
+            live.update(ref[VALUE_REF_KEY] for ref in find_value_refs(manifest.get("protocol")))
+        for path in self.events_dir.glob("*.jsonl"):
+            if path.stem in removed:
+                continue
+            for event in read_events(path):
+                if is_blob_ref(event.get("result")):
+                    live.add(event["result"][BLOB_REF_KEY])
+                if event.get("type") == "protocol":
+                    live.update(ref[VALUE_REF_KEY] for ref in find_value_refs(event))
+        live.update(self.open_cassette().digests())
+        if self.blobs.root.exists():
+            for path in self.blobs.root.glob("*/*"):
+                digest = path.parent.name + path.name
+                if path.name.startswith(".tmp_") or digest in live:
+                    continue
+                if now - path.stat().st_mtime > GC_GRACE_SECONDS:
+                    remove(path)
+                    report.removed_blobs += 1
+
+        report.compacted_ledgers = self._compact_ledgers(dry_run)
+        return report
+
+    def _compact_ledgers(self, dry_run: bool = False) -> int:
+        """Merge per-config ledger files into per-lineage ledger files.
+
+        Returns
+        -------
+        int
+            Number of per-config files merged
+        """
+        per_lineage: Dict[str, Dict[str, int]] = {}
+        files: Dict[str, List[Path]] = {}
+        for path in self.ledger_dir.glob("*.json"):
+            if path.name.startswith(".tmp_"):
+                continue
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                continue
+            if "config_fingerprint" not in data or "lineage_id" not in data:
+                continue  # already a combined lineage ledger
+            lineage_id = data["lineage_id"]
+            configs = per_lineage.setdefault(lineage_id, {})
+            fp = data["config_fingerprint"]
+            configs[fp] = max(configs.get(fp, 0), data.get("next_index", 0))
+            files.setdefault(lineage_id, []).append(path)
+
+        merged = sum(len(paths) for paths in files.values())
+        if dry_run or not per_lineage:
+            return merged
+        for lineage_id, updates in per_lineage.items():
+            configs = self._read_lineage_ledger(lineage_id)
+            for fp, next_index in updates.items():
+                configs[fp] = max(configs.get(fp, 0), next_index)
+            data = {"lineage_id": lineage_id, "configs": configs}
+            self._atomic_write(
+                self._lineage_ledger_path(lineage_id), json.dumps(data, indent=2, sort_keys=True)
+            )
+
+        # The merged ledgers must be durable before their sources go, or a
+        # crash could lose allocated replicate indices
+        self.flush()
+        if self.durability == "strict":
+            _fsync_dir(self.ledger_dir)
+        for paths in files.values():
+            for path in paths:
+                path.unlink()
+        return merged
+
+    def lineage_summary(
+        self,
+        lineage_id: str,
+        metric: str,
+        configs: Optional[Tuple[str, str]] = None,
+    ) -> LineageSummary:
+        """Pool a metric's effect across the confirm runs of a lineage.
+
+        Fixed- and random-effects (DerSimonian-Laird) estimates of the
+        difference in means between each run's hypothesis configs. Per-run
+        sufficient statistics are cached in the catalog.
+
+        Parameters
+        ----------
+        lineage_id : str
+            Lineage ID
+        metric : str
+            Metric name
+        configs : tuple, optional
+            (left, right) configs to compare instead of each run's
+            hypothesis configs
+
+        Returns
+        -------
+        LineageSummary
+            Per-run effects and pooled estimates
+        """
+        return lineage_summary(self, lineage_id, metric, configs)
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Query the run catalog.
+
+        Accepts the filters of Catalog.query(), e.g.
+        ``store.query(lineage="lin_abc", run_type="confirm", integrity="VALID")``.
+
+        Returns
+        -------
+        list
+            Matching run entries, newest first
+        """
+        self._drain()
+        return self.catalog.query(**filters)
+
+    def rebuild_catalog(self) -> int:
+        """Rebuild the run catalog from prereg artifacts and manifests.
+
+        Returns
+        -------
+        int
+            Number of runs indexed
+        """
+        self._drain()
+        self.catalog.clear()
+        for path in sorted(self.prereg_dir.iterdir()):
+            run_id = strip_suffix(path.name)
+            prereg = self.read_prereg(run_id) if run_id else None
+            if prereg is not None:
+                self.catalog.record_run(
+                    run_id, prereg=True, **catalog_entry_from_prereg(prereg)
+                )
+        for path in sorted(self.runs_dir.iterdir()):
+            run_id = strip_suffix(path.name)
+            meta = self.read_run_meta(run_id) if run_id else None
+            if meta is not None:
+                created = datetime.utcfromtimestamp(path.stat().st_mtime).isoformat() + "Z"
+                self.catalog.record_run(
+                    run_id,
+                    manifest=True,
+                    created_at=created,
+                    **catalog_entry_from_manifest(meta),
+                )
+        return self.catalog.count()
 
     @property
     def runs_dir(self) -> Path:
@@ -239,27 +950,56 @@ class Store:
         """Get the ledger directory path."""
         return self.root / "ledger"
 
+    @property
+    def events_dir(self) -> Path:
+        """Get the event log directory path."""
+        return self.root / "events"
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Fsync a directory so renames inside it are durable (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 # Global store instance (created on first use)
-_store: Optional[Store] = None
+_store: Optional["AnyStore"] = None
 
 
-def get_store(root: Optional[str] = None) -> Store:
+def get_store(root: Optional[str] = None) -> "AnyStore":
     """Get the global store instance.
 
     Parameters
     ----------
     root : str, optional
-        Root directory. Only used on first call.
+        Root directory, or ":memory:" for an in-memory store. Replaces the
+        global store if it differs from the current root (closing the old
+        one, which flushes its pending writes); otherwise the existing
+        instance is reused.
 
     Returns
     -------
-    Store
+    Store or MemoryStore
         The global store instance
     """
     global _store
-    if _store is None:
-        _store = Store(root)
+    if _store is None or (root is not None and Path(root) != _store.root):
+        if _store is not None:
+            _store.close()
+        if root is not None and str(root) == ":memory:":
+            from .memory import MemoryStore
+
+            _store = MemoryStore()
+        else:
+            _store = Store(root)
     return _store
 
 
@@ -0,0 +1,229 @@
+"""Per-call HTTP telemetry for Crystallize.
+
+InstrumentedHTTP times every ctx.http call and attaches the result to its
+ProtocolEvent as ``telemetry``:
+
+    {"latency_ms", "ttfb_ms", "status", "request_bytes", "response_bytes",
+     "retries", "error"}
+
+(keys that could not be measured are left out). ProtocolSummary aggregates
+them per config, with latencies kept in LatencyHistogram, a log-bucketed
+(HDR-style) histogram of fixed maximum size.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+# Sub-bucket precision bits: relative bucket width is at most 2**-(P-1) (~1.6%)
+_PRECISION_BITS = 7
+_SUB_BUCKETS = 1 << _PRECISION_BITS
+_HALF = _SUB_BUCKETS >> 1
+# Largest trackable latency, in microseconds (one hour); larger values clamp
+_MAX_MICROS = 3_600_000_000
+
+
+def _bucket(micros: int) -> int:
+    """Bucket index of a value in microseconds."""
+    if micros < _SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - _PRECISION_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF + ((micros >> shift) - _HALF)
+
+
+def _bucket_midpoint(index: int) -> float:
+    """Midpoint of a bucket, in microseconds."""
+    if index < _SUB_BUCKETS:
+        return float(index)
+    shift = (index - _SUB_BUCKETS) // _HALF + 1
+    low = ((index - _SUB_BUCKETS) % _HALF + _HALF) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (HDR-style) with bounded memory.
+
+    Values are bucketed at microsecond resolution with ~1.6% relative
+    precision, from 0 to one hour (about 1,800 possible buckets, stored
+    sparsely). Exact count, sum, min and max are kept alongside, so the
+    mean is exact and percentiles are accurate to a bucket width.
+
+    Example
+    -------
+    >>> hist = LatencyHistogram()
+    >>> for ms in (12.0, 15.5, 230.0):
+    ...     hist.record(ms)
+    >>> round(hist.percentile(50))
+    16
+    """
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def record(self, ms: float) -> None:
+        """Add one value, in milliseconds."""
+        ms = max(0.0, float(ms))
+        index = _bucket(min(int(ms * 1000), _MAX_MICROS))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's values into this one (returns self)."""
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        for value in (other.min_ms, other.max_ms):
+            if value is not None:
+                self.min_ms = value if self.min_ms is None else min(self.min_ms, value)
+                self.max_ms = value if self.max_ms is None else max(self.max_ms, value)
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean in milliseconds (None if empty)."""
+        return self.total_ms / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Value at percentile ``q`` (0-100), in milliseconds (None if empty).
+
+        Returns the midpoint of the bucket holding the q-th value, clamped
+        to the exact min and max (q=100 gives the exact max).
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * q // 100))  # ceil, at least the first value
+        if rank >= self.count:
+            return self.max_ms
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                value = _bucket_midpoint(index) / 1000
+                return min(max(value, self.min_ms), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (bucket counts keyed by index)."""
+        return {
+            "count": self.count,
+            "sum_ms": self.total_ms,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "buckets": {str(index): n for index, n in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "LatencyHistogram":
+        """Rebuild a histogram from its to_dict() form (empty if None)."""
+        hist = cls()
+        if not data:
+            return hist
+        hist.counts = {int(index): n for index, n in data.get("buckets", {}).items()}
+        hist.count = data.get("count", sum(hist.counts.values()))
+        hist.total_ms = data.get("sum_ms", 0.0)
+        hist.min_ms = data.get("min_ms")
+        hist.max_ms = data.get("max_ms")
+        return hist
+
+
+def response_telemetry(response: Any, latency_ms: float) -> Dict[str, Any]:
+    """Telemetry of a completed call from its requests.Response.
+
+    Time to first byte is taken from ``response.elapsed`` (time until the
+    headers were parsed). The response size is only known once the body
+    has been read; for streamed responses Content-Length is used if sent.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The response (live, replayed or shared by single-flight)
+    latency_ms : float
+        Wall time of the call on a monotonic clock
+
+    Returns
+    -------
+    dict
+        Telemetry entries that could be measured
+    """
+    telemetry: Dict[str, Any] = {"latency_ms": latency_ms}
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        telemetry["status"] = status
+    elapsed = getattr(response, "elapsed", None)
+    if elapsed:
+        telemetry["ttfb_ms"] = elapsed.total_seconds() * 1000
+
+    body = getattr(getattr(response, "request", None), "body", None)
+    if isinstance(body, str):
+        body = body.encode()
+    if isinstance(body, bytes):
+        telemetry["request_bytes"] = len(body)
+
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        telemetry["response_bytes"] = len(content)
+    else:
+        length = (getattr(response, "headers", None) or {}).get("Content-Length")
+        if length is not None and str(length).isdigit():
+            telemetry["response_bytes"] = int(length)
+
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    if history is not None:
+        telemetry["retries"] = len(history)
+    return telemetry
+
+
+def summarize_telemetry(records: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Aggregate per-call telemetry for one config.
+
+    Parameters
+    ----------
+    records : iterable
+        ProtocolEvent.telemetry of each call (None entries are skipped)
+
+    Returns
+    -------
+    dict
+        {calls, latency_ms, ttfb_ms, status, errors, request_bytes,
+        response_bytes, retries}, with latencies as LatencyHistogram
+        dicts; empty if no call carried telemetry
+    """
+    latency, ttfb = LatencyHistogram(), LatencyHistogram()
+    status: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    totals = {"request_bytes": 0, "response_bytes": 0, "retries": 0}
+    calls = 0
+    for record in records:
+        if not record:
+            continue
+        calls += 1
+        if record.get("latency_ms") is not None:
+            latency.record(record["latency_ms"])
+        if record.get("ttfb_ms") is not None:
+            ttfb.record(record["ttfb_ms"])
+        if record.get("status") is not None:
+            key = str(record["status"])
+            status[key] = status.get(key, 0) + 1
+        if record.get("error"):
+            errors[record["error"]] = errors.get(record["error"], 0) + 1
+        for name in totals:
+            totals[name] += record.get(name) or 0
+    if not calls:
+        return {}
+    return {
+        "calls": calls,
+        "latency_ms": latency.to_dict(),
+        "ttfb_ms": ttfb.to_dict(),
+        "status": status,
+        "errors": errors,
+        **totals,
+    }
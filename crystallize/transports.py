@@ -0,0 +1,315 @@
+"""Transport hooks auditing HTTP clients other than ctx.http.
+
+Vendor SDKs bring their own HTTP clients and cannot be pointed at ctx.http.
+These hooks plug into those clients instead and feed the same protocol
+pipeline: every request made while a replicate runs is recorded on that
+replicate's ctx.http (found with context.current_context()), with field
+provenance and telemetry. Requests made outside a replicate, or with
+audit="none", pass through untracked.
+
+    httpx     httpx_transport() / httpx_async_transport()
+    urllib3   audited_pool_manager()
+    aiohttp   aiohttp_trace_config()
+
+Build clients once and reuse them across replicates; each request is
+attributed to the replicate that makes it.
+
+Example
+-------
+>>> client = openai.OpenAI(http_client=httpx.Client(transport=httpx_transport()))
+>>> def fn(config, ctx):
+...     client.chat.completions.create(model=config["model"], messages=[...])
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from .context import current_context
+from .http import InstrumentedHTTP
+
+
+def _import(module: str, extra: str) -> Any:
+    """Lazily import an optional HTTP client library."""
+    import importlib
+
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            f"The '{module}' library is required for this transport hook. "
+            f"Install it with: pip install {extra}"
+        )
+
+
+def decode_body(content: Any) -> Any:
+    """Decode a raw request body for provenance analysis.
+
+    Parameters
+    ----------
+    content : bytes or str
+        Body as sent
+
+    Returns
+    -------
+    Any
+        Parsed JSON (or form data, as a dict) or None if it is neither
+    """
+    if isinstance(content, (bytes, bytearray)):
+        try:
+            content = bytes(content).decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if not isinstance(content, str) or not content:
+        return None
+    if content.lstrip()[:1] in ("{", "["):
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+    pairs = parse_qsl(content, strict_parsing=False)
+    return dict(pairs) if pairs and "=" in content else None
+
+
+def begin_call(method: str, url: str, content: Any) -> Optional[Dict[str, Any]]:
+    """Record a request on the current replicate's ctx.http.
+
+    Parameters
+    ----------
+    method : str
+        HTTP method
+    url : str
+        Request URL
+    content : bytes or str
+        Raw request body
+
+    Returns
+    -------
+    dict or None
+        Telemetry dict to fill in (see finish_call()), or None if the call
+        is not tracked. Its ``_start`` entry is private and never recorded.
+    """
+    ctx = current_context()
+    http = ctx._http if ctx is not None else None
+    if not isinstance(http, InstrumentedHTTP):
+        return None
+    telemetry = http.observe(str(method), str(url), decode_body(content))
+    if telemetry is not None:
+        telemetry["_start"] = time.perf_counter()
+        if isinstance(content, (bytes, bytearray, str)):
+            telemetry["request_bytes"] = len(
+                content.encode() if isinstance(content, str) else content
+            )
+    return telemetry
+
+
+def finish_call(
+    telemetry: Optional[Dict[str, Any]],
+    status: Optional[int] = None,
+    headers: Any = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Fill in the telemetry of a call started with begin_call().
+
+    Latency is measured up to the response headers; the body is read by
+    the client later. The response size comes from Content-Length.
+    """
+    if telemetry is None:
+        return
+    start = telemetry.pop("_start", None)
+    if start is not None:
+        latency = (time.perf_counter() - start) * 1000
+        telemetry["latency_ms"] = telemetry["ttfb_ms"] = latency
+    if status is not None:
+        telemetry["status"] = int(status)
+    length = headers.get("Content-Length") if headers is not None else None
+    if length is not None and str(length).isdigit():
+        telemetry["response_bytes"] = int(length)
+    if error is not None:
+        telemetry["error"] = type(error).__name__
+
+
+def _httpx_content(request: Any) -> Any:
+    """Body of an httpx request, or None if it is an unread stream."""
+    try:
+        return request.content
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _httpx_transports() -> Tuple[type, type]:
+    """Define the httpx transport classes (httpx is imported on first use)."""
+    httpx = _import("httpx", "httpx")
+
+    class AuditedTransport(httpx.BaseTransport):
+        """httpx transport recording requests on the current replicate."""
+
+        def __init__(self, transport: Optional[Any] = None):
+            self.transport = transport or httpx.HTTPTransport()
+
+        def handle_request(self, request: Any) -> Any:
+            content = _httpx_content(request)
+            telemetry = begin_call(request.method, str(request.url), content)
+            try:
+                response = self.transport.handle_request(request)
+            except Exception as e:
+                finish_call(telemetry, error=e)
+                raise
+            finish_call(telemetry, response.status_code, response.headers)
+            return response
+
+        def close(self) -> None:
+            self.transport.close()
+
+    class AsyncAuditedTransport(httpx.AsyncBaseTransport):
+        """Async httpx transport recording requests on the current replicate."""
+
+        def __init__(self, transport: Optional[Any] = None):
+            self.transport = transport or httpx.AsyncHTTPTransport()
+
+        async def handle_async_request(self, request: Any) -> Any:
+            content = _httpx_content(request)
+            telemetry = begin_call(request.method, str(request.url), content)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                finish_call(telemetry, error=e)
+                raise
+            finish_call(telemetry, response.status_code, response.headers)
+            return response
+
+        async def aclose(self) -> None:
+            await self.transport.aclose()
+
+    return AuditedTransport, AsyncAuditedTransport
+
+
+def httpx_transport(transport: Optional[Any] = None) -> Any:
+    """Create an httpx transport that audits requests.
+
+    Parameters
+    ----------
+    transport : httpx.BaseTransport, optional
+        Transport to wrap (defaults to httpx.HTTPTransport(), which keeps
+        httpx's connection pooling)
+
+    Returns
+    -------
+    httpx.BaseTransport
+        Pass as ``httpx.Client(transport=...)``
+    """
+    return _httpx_transports()[0](transport)
+
+
+def httpx_async_transport(transport: Optional[Any] = None) -> Any:
+    """Create an async httpx transport that audits requests.
+
+    Parameters
+    ----------
+    transport : httpx.AsyncBaseTransport, optional
+        Transport to wrap (defaults to httpx.AsyncHTTPTransport())
+
+    Returns
+    -------
+    httpx.AsyncBaseTransport
+        Pass as ``httpx.AsyncClient(transport=...)``
+    """
+    return _httpx_transports()[1](transport)
+
+
+@lru_cache(maxsize=None)
+def _pool_manager_class() -> type:
+    """Define AuditedPoolManager (urllib3 is imported on first use)."""
+    urllib3 = _import("urllib3", "urllib3")
+
+    class AuditedPoolManager(urllib3.PoolManager):
+        """urllib3 PoolManager recording requests on the current replicate.
+
+        urllib3 follows redirects by calling urlopen() again, so each hop
+        is recorded as a request of its own (whose telemetry includes the
+        hops after it).
+        """
+
+        def urlopen(
+            self, method: str, url: str, redirect: bool = True, **kw: Any
+        ) -> Any:
+            telemetry = begin_call(method, url, kw.get("body"))
+            try:
+                response = super().urlopen(method, url, redirect=redirect, **kw)
+            except Exception as e:
+                finish_call(telemetry, error=e)
+                raise
+            finish_call(telemetry, response.status, response.headers)
+            retries = getattr(response, "retries", None)
+            if telemetry is not None and retries is not None:
+                telemetry["retries"] = len(retries.history)
+            return response
+
+    return AuditedPoolManager
+
+
+def audited_pool_manager(*args: Any, **kwargs: Any) -> Any:
+    """Create a urllib3 PoolManager that audits requests.
+
+    Takes the same arguments as urllib3.PoolManager.
+
+    Returns
+    -------
+    urllib3.PoolManager
+        Pool manager recording each request on the current replicate
+    """
+    return _pool_manager_class()(*args, **kwargs)
+
+
+async def _aiohttp_on_request_start(session: Any, trace: Any, params: Any) -> None:
+    trace.chunks = []
+    trace.start = time.perf_counter()
+
+
+async def _aiohttp_on_request_chunk_sent(
+    session: Any, trace: Any, params: Any
+) -> None:
+    trace.chunks.append(params.chunk)
+
+
+def _aiohttp_begin(trace: Any, params: Any) -> Optional[Dict[str, Any]]:
+    """Record an aiohttp request once it is done, timed from its start."""
+    telemetry = begin_call(params.method, str(params.url), b"".join(trace.chunks))
+    if telemetry is not None:
+        telemetry["_start"] = trace.start
+    return telemetry
+
+
+async def _aiohttp_on_request_end(session: Any, trace: Any, params: Any) -> None:
+    response = params.response
+    finish_call(_aiohttp_begin(trace, params), response.status, response.headers)
+
+
+async def _aiohttp_on_request_exception(
+    session: Any, trace: Any, params: Any
+) -> None:
+    finish_call(_aiohttp_begin(trace, params), error=params.exception)
+
+
+def aiohttp_trace_config() -> Any:
+    """Create an aiohttp TraceConfig that audits requests.
+
+    The request body is captured from the chunks aiohttp reports as sent.
+
+    Returns
+    -------
+    aiohttp.TraceConfig
+        Pass as ``aiohttp.ClientSession(trace_configs=[...])``
+    """
+    aiohttp = _import("aiohttp", "aiohttp")
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_aiohttp_on_request_start)
+    config.on_request_chunk_sent.append(_aiohttp_on_request_chunk_sent)
+    config.on_request_end.append(_aiohttp_on_request_end)
+    config.on_request_exception.append(_aiohttp_on_request_exception)
+    return config
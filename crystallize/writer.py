@@ -0,0 +1,106 @@
+"""Background writer thread for Crystallize store I/O.
+
+Store writes (ledger updates, manifests, event-log batches, blobs) can be
+handed to a single writer thread so a slow disk does not stall the replicate
+loop. Tasks run in submission order; a bounded queue provides backpressure.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import warnings
+from typing import Any, Callable, Optional
+
+# Error policies:
+#   raise - re-raise the first failed write on the next submit()/flush()
+#   warn  - emit a RuntimeWarning from the writer thread and carry on
+ERROR_POLICIES = ("raise", "warn")
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Single worker thread executing write tasks in FIFO order.
+
+    Parameters
+    ----------
+    maxsize : int
+        Queue capacity; submit() blocks while the queue is full
+    on_error : str
+        "raise" or "warn" (see ERROR_POLICIES)
+    """
+
+    def __init__(self, maxsize: int = 256, on_error: str = "raise"):
+        if on_error not in ERROR_POLICIES:
+            raise ValueError(f"Unknown on_error {on_error!r}; expected one of {ERROR_POLICIES}")
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._on_error = on_error
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="crystallize-store-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is _STOP:
+                    return
+                fn, args = task
+                fn(*args)
+            except BaseException as e:  # noqa: BLE001 - surfaced per policy
+                if self._on_error == "raise":
+                    if self._error is None:
+                        self._error = e
+                else:
+                    warnings.warn(f"Background store write failed: {e!r}", RuntimeWarning)
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending(self) -> None:
+        """Re-raise (and clear) the first error from the writer thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Queue a write task, blocking while the queue is full.
+
+        Raises
+        ------
+        Exception
+            A previous task's error, under the "raise" policy
+        """
+        self._raise_pending()
+        if self._closed:
+            raise RuntimeError("Background writer is closed")
+        if threading.current_thread() is self._thread:
+            fn(*args)  # nested submit from a task: run inline to avoid deadlock
+            return
+        self._queue.put((fn, args))
+
+    def flush(self) -> None:
+        """Block until every queued task has run, then surface any error."""
+        if threading.current_thread() is not self._thread:
+            self._queue.join()
+        self._raise_pending()
+
+    def close(self) -> None:
+        """Flush, stop the worker thread and surface any error."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_pending()
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of queued tasks."""
+        return self._queue.qsize()
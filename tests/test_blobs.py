@@ -0,0 +1,156 @@
+"""Tests for the content-addressed blob store."""
+
+import json
+import os
+import tempfile
+import threading
+
+import pytest
+
+from crystallize import Experiment, explore
+from crystallize.blobs import BlobStore, Codec, externalize, is_blob_ref, register_codec, resolve
+from crystallize.store import Store
+
+
+class Transcript:
+    """A non-JSON return value."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __eq__(self, other):
+        return isinstance(other, Transcript) and other.lines == self.lines
+
+
+class TestBlobStore:
+    """Tests for BlobStore and externalize()."""
+
+    def test_put_is_content_addressed_and_deduplicated(self):
+        """Identical bytes are stored once under their hash."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            blobs = BlobStore(tmpdir)
+
+            d1 = blobs.put(b"hello")
+            d2 = blobs.put(b"hello")
+            assert d1 == d2
+            assert blobs.get(d1) == b"hello"
+            assert sum(len(files) for _, _, files in os.walk(tmpdir)) == 1
+
+    def test_small_json_values_stay_inline(self):
+        """Values under the threshold are returned unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            blobs = BlobStore(tmpdir)
+            assert externalize(blobs, {"x": 1}, threshold=1024) == {"x": 1}
+
+    def test_large_values_become_refs(self):
+        """Large values are JSON blobs; non-JSON values are stringified by default."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            blobs = BlobStore(tmpdir)
+
+            big = {"transcript": ["line"] * 1000}
+            ref = externalize(blobs, big, threshold=100)
+            assert is_blob_ref(ref) and ref["codec"] == "json"
+            assert resolve(blobs, ref) == big
+
+            obj = Transcript(["a", "b"])
+            assert externalize(blobs, {"t": obj}, threshold=10_000) == {"t": str(obj)}
+
+    def test_pickle_is_opt_in(self):
+        """codec="pickle" keeps objects; unpicklable values are stringified."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            blobs = BlobStore(tmpdir)
+
+            obj = Transcript(["a", "b"])
+            ref = externalize(blobs, obj, threshold=10_000, codec="pickle")
+            assert ref["codec"] == "pickle"
+            assert resolve(blobs, ref) == obj
+
+            lock = threading.Lock()
+            value = externalize(blobs, {"lock": lock, "f": lambda: 1}, 10_000, "pickle")
+            assert value["lock"] == str(lock)
+            assert not is_blob_ref(value)
+
+    def test_unpicklable_return_values(self):
+        """explore() stores return values that cannot be pickled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            exp = explore(
+                lambda config: {"lock": threading.Lock(), "fn": lambda: 1},
+                {"a": {}},
+                replicates=1,
+                progress=False,
+                store=store,
+            )
+            stored = store.read_run_manifest(exp.run_id)["results"]["a"][0]
+            assert stored["lock"].startswith("<unlocked _thread.lock")
+            assert "lambda" in stored["fn"]
+
+    def test_custom_codec(self):
+        """Registered codecs can be selected by name."""
+        register_codec(Codec("upper", lambda v: v.upper().encode(), lambda b: b.decode()))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            blobs = BlobStore(tmpdir)
+            ref = externalize(blobs, "abc", threshold=0, codec="upper")
+            assert ref["codec"] == "upper"
+            assert resolve(blobs, ref) == "ABC"
+
+            with pytest.raises(ValueError, match="Unknown blob codec"):
+                externalize(blobs, "abc", threshold=0, codec="missing")
+
+
+class TestExploreBlobs:
+    """Tests for blob references in run manifests."""
+
+    def test_manifest_holds_refs_and_load_resolves(self):
+        """Large return values are referenced in the manifest and deduplicated."""
+
+        def fn(config, ctx):
+            ctx.record("score", 1)
+            return {"transcript": ["same long line"] * 200}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, blob_threshold=256)
+            from crystallize import store as store_module
+
+            store_module._store = store
+            try:
+                exp = explore(
+                    fn=fn,
+                    configs={"a": {}, "b": {"y": 1}},
+                    replicates=3,
+                    progress=False,
+                    store_root=tmpdir,
+                )
+            finally:
+                store_module.reset_store()
+
+            with open(exp.paths["manifest"]) as f:
+                manifest = json.load(f)
+            assert all(is_blob_ref(v) for v in manifest["results"]["a"])
+            digests = {v["$blob"] for vals in manifest["results"].values() for v in vals}
+            assert len(digests) == 1
+
+            loaded = Experiment.load(exp.run_id, store_root=tmpdir)
+            assert loaded.results == exp.results
+
+    def test_numpy_results_round_trip_as_lists(self):
+        """NumPy return values are stored as lists, inline or as blobs."""
+        np = pytest.importorskip("numpy")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, blob_threshold=64)
+            exp = explore(
+                lambda config: {"small": np.arange(3), "large": np.arange(100)},
+                {"a": {}},
+                replicates=1,
+                progress=False,
+                store=store,
+            )
+            assert is_blob_ref(store.read_run_manifest(exp.run_id)["results"]["a"][0])
+            assert externalize(store.blobs, np.arange(3), threshold=64) == [0, 1, 2]
+
+            loaded = Experiment.load(exp.run_id, store=store)
+            assert loaded.results["a"][0] == {
+                "small": [0, 1, 2],
+                "large": list(range(100)),
+            }
@@ -1,9 +1,10 @@
 """Tests for exp.crystallize() and ConfirmRun."""
 
+import random
 import tempfile
 import pytest
 
-from crystallize import explore, ConfirmRun
+from crystallize import explore, ConfirmRun, Experiment
 
 
 class TestCrystallize:
@@ -261,3 +262,190 @@ class TestConfirmRunSerialization:
             assert "supported" in d
             assert "integrity" in d
             assert "hypothesis_result" in d
+
+
+class TestLoad:
+    """Tests for Experiment.load() and ConfirmRun.load()."""
+
+    def test_load_experiment_and_crystallize(self):
+        """A stored explore run can be reloaded and crystallized."""
+
+        def fn(config, ctx):
+            ctx.record("score", config["x"])
+            return {"x": config["x"]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp = explore(
+                fn=fn,
+                configs={"low": {"x": 1}, "high": {"x": 10}},
+                replicates=3,
+                progress=False,
+                store_root=tmpdir,
+            )
+
+            loaded = Experiment.load(exp.run_id, fn=fn, store_root=tmpdir)
+            assert loaded.configs == exp.configs
+            assert loaded.metrics == exp.metrics
+            assert loaded.results == exp.results
+            assert loaded.protocol["low"].audit_evidence == exp.protocol["low"].audit_evidence
+
+            result = loaded.crystallize("high.score > low.score", replicates=5, progress=False)
+            assert result.parent_run_id == exp.run_id
+            assert result.replicate_range[0] == 3
+
+    def test_load_is_lazy(self):
+        """Heavy sections are read on access and refreshed when the file changes."""
+        import json
+        import os
+
+        def fn(config, ctx):
+            ctx.record("score", config["x"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp = explore(
+                fn=fn,
+                configs={"a": {"x": 1}},
+                replicates=2,
+                progress=False,
+                store_root=tmpdir,
+            )
+
+            loaded = Experiment.load(exp.run_id, store_root=tmpdir)
+            assert "_metrics_value" in vars(loaded)
+            assert loaded._loader._cache == {}
+
+            assert loaded.metrics == {"a": {"score": [1, 1]}}
+            assert set(loaded._loader._cache) == {"metrics"}
+
+            path = exp.paths["manifest"]
+            with open(path) as f:
+                manifest = json.load(f)
+            manifest["metrics"]["a"]["score"] = [5, 5, 5]
+            with open(path, "w") as f:
+                json.dump(manifest, f)
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+            assert loaded.metrics == {"a": {"score": [5, 5, 5]}}
+
+    def test_load_confirm_run(self):
+        """ConfirmRun.load() restores metadata and lazily loads metrics."""
+
+        def fn(config, ctx):
+            ctx.record("score", config["x"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp = explore(
+                fn=fn,
+                configs={"a": {"x": 1}, "b": {"x": 10}},
+                replicates=2,
+                progress=False,
+                store_root=tmpdir,
+            )
+            result = exp.crystallize("b.score > a.score", replicates=5, progress=False)
+
+            loaded = ConfirmRun.load(result.run_id, store_root=tmpdir)
+            assert loaded.integrity == result.integrity
+            assert loaded.hypothesis_result == result.hypothesis_result
+            assert loaded.replicate_range == result.replicate_range
+            assert loaded.metrics == result.metrics
+
+            with pytest.raises(ValueError, match="explore run"):
+                ConfirmRun.load(exp.run_id, store_root=tmpdir)
+
+    def test_loaded_experiment_without_fn_cannot_crystallize(self):
+        """crystallize() on a run loaded without fn raises."""
+
+        def fn(config, ctx):
+            ctx.record("score", config["x"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp = explore(
+                fn=fn,
+                configs={"a": {"x": 1}, "b": {"x": 2}},
+                replicates=1,
+                progress=False,
+                store_root=tmpdir,
+            )
+
+            loaded = Experiment.load(exp.run_id, store_root=tmpdir)
+            with pytest.raises(ValueError, match="no function"):
+                loaded.crystallize("b.score > a.score", replicates=5, progress=False)
+
+            with pytest.raises(FileNotFoundError):
+                Experiment.load("exp_missing", store_root=tmpdir)
+
+
+class TestBatchedDurability:
+    """Tests for crystallize() with a batched-durability store."""
+
+    def test_prereg_flushed_before_replicates(self):
+        """Prereg and ledger are committed before the first confirm replicate."""
+        from crystallize import store as store_module
+        from crystallize.store import Store
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, durability="batched")
+            seen = []
+
+            def fn(config, ctx):
+                if ctx.replicate_id is not None:
+                    seen.append((bool(store._unsynced), bool(store._pending_ledgers)))
+                ctx.record("score", config["x"])
+
+            store_module._store = store
+            try:
+                exp = explore(
+                    fn=fn,
+                    configs={"a": {"x": 1}, "b": {"x": 2}},
+                    replicates=2,
+                    progress=False,
+                    store_root=tmpdir,
+                )
+                result = exp.crystallize("b.score > a.score", replicates=5, progress=False)
+            finally:
+                store_module.reset_store()
+
+            assert seen[0] == (False, False)
+            assert not store._unsynced and not store._pending_ledgers
+            assert store.read_prereg(result.run_id)["parent_run_id"] == exp.run_id
+            assert Store(tmpdir).read_ledger(exp.lineage_id, exp.config_fingerprints["a"]) == 7
+
+
+class TestAsyncWrites:
+    """Tests for explore()/crystallize() with a background-writer store."""
+
+    def test_explore_and_crystallize(self):
+        """Everything is on disk when explore()/crystallize() return."""
+        from crystallize import store as store_module
+        from crystallize.store import Store
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, async_writes=True)
+
+            def fn(config, ctx):
+                ctx.record("score", config["x"] + random.random())
+                return [0] * 20000  # large enough to become a blob
+
+            store_module._store = store
+            try:
+                exp = explore(
+                    fn=fn,
+                    configs={"a": {"x": 1}, "b": {"x": 2}},
+                    replicates=2,
+                    progress=False,
+                    store_root=tmpdir,
+                )
+                assert store._writer.pending == 0
+                result = exp.crystallize("b.score > a.score", replicates=3, progress=False)
+                assert store._writer.pending == 0
+            finally:
+                store_module.reset_store()
+                store.close()
+
+            fresh = Store(tmpdir)
+            assert fresh.read_run_manifest(exp.run_id) is not None
+            assert fresh.read_run_manifest(result.run_id) is not None
+            assert len(list(fresh.read_event_log(result.run_id))) > 0
+            loaded = Experiment.load(exp.run_id, store_root=tmpdir)
+            assert loaded.results["a"][0] == [0] * 20000
@@ -0,0 +1,111 @@
+"""Tests for append-only run event logs."""
+
+import json
+import os
+import tempfile
+
+from crystallize import explore
+from crystallize.events import EventLog, compact_events, read_events
+from crystallize.protocol import ProtocolEvent
+
+
+class TestEventLog:
+    """Tests for EventLog."""
+
+    def test_batches_writes_until_flush(self):
+        """Events are buffered until the batch fills or flush() is called."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "run.jsonl")
+            log = EventLog(path, batch_size=3)
+
+            log.append({"type": "replicate_start", "config": "a", "replicate": 0})
+            log.append({"type": "replicate_end", "config": "a", "replicate": 0})
+            assert list(read_events(path)) == []
+
+            log.append({"type": "replicate_start", "config": "a", "replicate": 1})
+            assert [e["seq"] for e in read_events(path)] == [0, 1, 2]
+
+            log.append({"type": "end", "run_id": "exp_x"})
+            log.close()
+            assert len(list(read_events(path))) == 4
+
+    def test_read_skips_torn_last_line(self):
+        """A partially written trailing line is ignored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "run.jsonl")
+            with EventLog(path) as log:
+                log.append({"type": "start", "run_id": "exp_x", "configs": ["a"]})
+            with open(path, "a") as f:
+                f.write('{"type": "metric", "con')
+
+            assert [e["type"] for e in read_events(path)] == ["start"]
+
+    def test_compact_events(self):
+        """compact_events() folds events into results and metrics."""
+        events = [
+            {"type": "start", "run_id": "exp_x", "configs": ["a"]},
+            {"type": "replicate_start", "config": "a", "replicate": 0},
+            {"type": "metric", "config": "a", "replicate": 0, "metric": "score", "value": 1},
+            {"type": "replicate_end", "config": "a", "replicate": 0, "result": {"v": 1}},
+        ]
+
+        compacted = compact_events(events)
+        assert compacted["complete"] is False
+        assert compacted["results"] == {"a": [{"v": 1}]}
+        assert compacted["metrics"] == {"a": {"score": [1]}}
+        assert compacted["protocol"]["a"]["audit_evidence"]["instrumented_call_count"] == 0
+
+    def test_compact_events_uses_counted_calls(self):
+        """Call totals come from replicate_end events, in every audit mode."""
+        event = ProtocolEvent.create("a", "cfg", "POST", "http://api.test/v1", {}).to_dict()
+        events = [
+            {"type": "start", "run_id": "exp_x", "configs": ["a"]},
+            {"type": "protocol", "config": "a", "replicate": 0, "event": event},
+            {"type": "replicate_end", "config": "a", "replicate": 0, "result": 1, "calls": 3},
+            {"type": "replicate_end", "config": "a", "replicate": 1, "result": 1, "calls": 2},
+        ]
+
+        evidence = compact_events(events)["protocol"]["a"]["audit_evidence"]
+        assert evidence["level"] == "calls"
+        assert evidence["instrumented_call_count"] == 5
+
+
+class TestExploreEventLog:
+    """Tests for event logs written by explore() and crystallize()."""
+
+    def test_manifest_matches_compacted_log(self):
+        """The explore manifest sections equal the compaction of its log."""
+
+        def fn(config, ctx):
+            ctx.record("score", config["x"])
+            return {"x": config["x"]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp = explore(
+                fn=fn,
+                configs={"a": {"x": 1}, "b": {"x": 2}},
+                replicates=3,
+                progress=False,
+                store_root=tmpdir,
+            )
+
+            with open(exp.paths["manifest"]) as f:
+                manifest = json.load(f)
+
+            compacted = exp._store.compact_event_log(exp.run_id)
+            assert compacted["complete"] is True
+            assert compacted["results"] == manifest["results"]
+            assert compacted["metrics"] == manifest["metrics"]
+            assert compacted["protocol"] == manifest["protocol"]
+
+            result = exp.crystallize("b.score > a.score", replicates=5, progress=False)
+            types = [e["type"] for e in exp._store.read_event_log(result.run_id)]
+            assert types[0] == "start"
+            assert types[-1] == "end"
+            assert types.count("replicate_end") == 10
+
+            with open(result.results_path) as f:
+                confirm_manifest = json.load(f)
+            compacted = exp._store.compact_event_log(result.run_id)
+            assert compacted["results"] == confirm_manifest["results"]
+            assert compacted["metrics"] == confirm_manifest["metrics"]
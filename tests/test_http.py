@@ -0,0 +1,447 @@
+"""Tests for the instrumented HTTP client."""
+
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from crystallize import HTTPPool, explore  # noqa: E402
+from crystallize.cassette import CassetteMiss, request_key  # noqa: E402
+from crystallize.http import CallSampler, InstrumentedHTTP  # noqa: E402
+from crystallize.memory import MemoryStore  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Echo server recording the client port of each request."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(body.get("delay", 0))
+        self.server.requests.append((self.client_address[1], body))
+        payload = json.dumps({"echo": body, "n": len(self.server.requests)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        # /stream?n=N&gap=S: N server-sent events, S seconds apart (chunked)
+        from urllib.parse import parse_qs, urlparse
+
+        query = parse_qs(urlparse(self.path).query)
+        n, gap = int(query.get("n", ["3"])[0]), float(query.get("gap", ["0"])[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(n + 1):
+            time.sleep(gap)
+            data = f"data: {'[DONE]' if i == n else f'tok{i}'}\n\n".encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server; yields (base_url, server)."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}", httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+class TestHTTPPool:
+    """Tests for the shared per-run connection pool."""
+
+    def test_connection_reused_across_replicates(self, server):
+        """All replicates share one keep-alive connection."""
+        url, httpd = server
+
+        def fn(config, ctx):
+            r = ctx.http.post(url, json={"model": config["model"], "temperature": 0})
+            ctx.record("n", r.json()["n"])
+
+        exp = explore(
+            fn,
+            {"a": {"model": "m1"}, "b": {"model": "m2"}},
+            replicates=3,
+            progress=False,
+            store=MemoryStore(),
+        )
+        assert len(httpd.requests) == 6
+        assert len({port for port, _ in httpd.requests}) == 1
+        # Provenance is still recorded per replicate
+        assert exp.protocol["a"].audit_evidence["instrumented_call_count"] == 3
+
+    def test_pool_closes_and_reopens(self, server):
+        """A pool is closed at the end of a run and reopens on next use."""
+        url, httpd = server
+        pool = HTTPPool(pool_size=2, keep_alive=False)
+
+        def fn(config, ctx):
+            ctx.http.post(url, json={"x": config["x"]})
+
+        explore(
+            fn,
+            {"a": {"x": 1}},
+            replicates=2,
+            progress=False,
+            store=MemoryStore(),
+            http_pool=pool,
+        )
+        assert pool._session is None
+        assert len({port for port, _ in httpd.requests}) == 2  # keep_alive=False
+
+        assert pool.session().post(url, json={}).status_code == 200
+        pool.close()
+
+
+class TestCassette:
+    """Tests for http_mode="record" / "replay"."""
+
+    @staticmethod
+    def _fn(url):
+        def fn(config, ctx):
+            r = ctx.http.post(url, json={"model": config["model"], "seed": ctx.replicate})
+            ctx.record("echo", r.json()["echo"]["seed"])
+
+        return fn
+
+    def test_record_then_replay(self, server):
+        """Replay serves recorded responses with no network traffic."""
+        url, httpd = server
+        configs = {"a": {"model": "m1"}}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recorded = explore(
+                self._fn(url), configs, replicates=3, progress=False,
+                store_root=tmpdir, http_mode="record",
+            )
+            assert len(httpd.requests) == 3
+            httpd.requests.clear()
+
+            replayed = explore(
+                self._fn(url), configs, replicates=3, progress=False,
+                store_root=tmpdir, http_mode="replay",
+            )
+            assert httpd.requests == []
+            assert replayed.metrics == recorded.metrics
+            assert replayed.http_mode == "replay"
+            # Protocol events are still recorded on replay
+            assert replayed.protocol["a"].audit_evidence["instrumented_call_count"] == 3
+
+    def test_replay_miss_raises(self, server):
+        """An unrecorded request fails instead of going to the network."""
+        url, httpd = server
+
+        with pytest.raises(CassetteMiss):
+            explore(
+                self._fn(url), {"a": {"model": "m1"}}, replicates=1, progress=False,
+                store=MemoryStore(), http_mode="replay",
+            )
+        assert httpd.requests == []
+
+    def test_key_ignores_headers(self):
+        """Keys ignore headers unless include_headers is set (as for single-flight)."""
+        base = request_key("POST", "http://x", {"json": {"a": 1, "b": 2}})
+        assert base == request_key(
+            "post", "http://x", {"json": {"b": 2, "a": 1}, "headers": {"Authorization": "k"}}
+        )
+        assert base != request_key("POST", "http://x", {"json": {"a": 1, "b": 3}})
+
+        keyed = request_key("POST", "http://x", {"json": {"a": 1}}, include_headers=True)
+        assert keyed != request_key(
+            "POST", "http://x", {"json": {"a": 1}, "headers": {"Authorization": "k"}},
+            include_headers=True,
+        )
+        assert request_key(
+            "POST", "http://x", {"json": {"a": 1}, "headers": {"X-Model": "m"}},
+            include_headers=True,
+        ) == request_key(
+            "POST", "http://x", {"json": {"a": 1}, "headers": {"x-model": "m"}},
+            include_headers=True,
+        )
+
+    def test_crystallize_rejects_replay(self, server):
+        """Confirmatory runs must make live calls."""
+        url, _ = server
+        exp = explore(
+            self._fn(url), {"a": {"model": "m1"}, "b": {"model": "m2"}},
+            replicates=2, progress=False, store=MemoryStore(), http_mode="record",
+        )
+        with pytest.raises(ValueError, match="replay"):
+            exp.crystallize(hypothesis="a.echo > b.echo", replicates=2, http_mode="replay")
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical requests."""
+
+    def test_concurrent_identical_requests_coalesce(self, server):
+        """Identical in-flight requests share one round-trip, each audited."""
+        url, httpd = server
+
+        def fn(config, ctx):
+            barrier = threading.Barrier(5)
+            results = []
+
+            def call():
+                barrier.wait()
+                body = {"model": config["model"], "temperature": 0, "delay": 0.3}
+                results.append(ctx.http.post(url, json=body).json()["n"])
+
+            threads = [threading.Thread(target=call) for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            ctx.record("distinct", len(set(results)))
+
+        exp = explore(
+            fn,
+            {"a": {"model": "m1"}},
+            replicates=1,
+            progress=False,
+            store=MemoryStore(),
+            http_pool=HTTPPool(single_flight=True),
+        )
+        assert len(httpd.requests) == 1
+        assert exp.metrics["a"]["distinct"] == [1]
+        evidence = exp.protocol["a"].audit_evidence
+        assert evidence["instrumented_call_count"] == 5
+        assert evidence["coalesced_call_count"] == 4
+
+    def test_different_headers_not_coalesced(self, server):
+        """Requests that differ only in headers each hit the network."""
+        url, httpd = server
+
+        def fn(config, ctx):
+            barrier = threading.Barrier(2)
+
+            def call(key):
+                barrier.wait()
+                body = {"model": "m", "delay": 0.3}
+                ctx.http.post(url, json=body, headers={"Authorization": key})
+
+            threads = [threading.Thread(target=call, args=(k,)) for k in ("k1", "k2")]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        exp = explore(
+            fn,
+            {"a": {}},
+            replicates=1,
+            progress=False,
+            store=MemoryStore(),
+            http_pool=HTTPPool(single_flight=True),
+        )
+        assert len(httpd.requests) == 2
+        assert exp.protocol["a"].audit_evidence["coalesced_call_count"] == 0
+
+    def test_disabled_by_default(self, server):
+        """Without single_flight every call goes to the network."""
+        url, httpd = server
+
+        def fn(config, ctx):
+            ctx.http.post(url, json={"model": "m"})
+            ctx.http.post(url, json={"model": "m"})
+
+        exp = explore(fn, {"a": {}}, replicates=1, progress=False, store=MemoryStore())
+        assert len(httpd.requests) == 2
+        assert exp.protocol["a"].audit_evidence["coalesced_call_count"] == 0
+
+
+class TestDeferredAnalysis:
+    """Tests for analyzing provenance after the request path."""
+
+    def test_analysis_deferred_until_events_read(self, monkeypatch):
+        """Requests only snapshot; events are analyzed in bulk on read."""
+        http = InstrumentedHTTP({"model": "m1"}, "a", "fp")
+        monkeypatch.setattr(http, "_send", lambda *args, **kwargs: None)
+        analyzed = []
+        original = http._analyze_fields
+        monkeypatch.setattr(
+            http, "_analyze_fields", lambda *a: analyzed.append(1) or original(*a)
+        )
+
+        body = {"model": "m1", "temperature": 0.5}
+        for _ in range(3):
+            http.post("http://example.invalid/v1", json=body)
+        body["temperature"] = 1.0  # the snapshot is taken at call time
+        assert analyzed == []
+
+        events = http.events
+        assert len(analyzed) == 3
+        assert [e.fields["temperature"]["value"] for e in events] == [0.5] * 3
+        assert events[0].fields["model"]["source"] == "config.model"
+        assert events[0].ts.endswith("Z")
+
+    def test_nested_body_snapshot(self, monkeypatch):
+        """Appending to a sent messages list does not change recorded calls."""
+        http = InstrumentedHTTP({}, "a", "fp")
+        monkeypatch.setattr(http, "_send", lambda *args, **kwargs: None)
+
+        messages = [{"role": "user", "content": "hi"}]
+        body = {"model": "m", "messages": messages}
+        http.post("http://example.invalid/v1", json=body)
+        messages.append({"role": "assistant", "content": "hello"})
+        messages.append({"role": "user", "content": "again"})
+        http.post("http://example.invalid/v1", json=body)
+
+        events = http.events
+        assert events[0].ts <= events[1].ts
+        first, second = (e.fields["messages[].content"]["value"] for e in events)
+        assert first == ["hi"]
+        assert second == ["hi", "hello", "again"]
+
+
+class TestSampledAudit:
+    """Tests for audit="sample"."""
+
+    def test_sampler_deterministic_and_covers_shapes(self):
+        """Decisions depend only on the replicate and call index; new shapes are kept."""
+        decisions = []
+        for _ in range(2):
+            sampler = CallSampler(0.2)
+            assert sampler.keep("a", "rep_1", 0, "POST", "http://x/v1", {"model": 1})
+            assert sampler.keep("a", "rep_1", 1, "POST", "http://x/v2", {"model": 1})
+            decisions.append(
+                [sampler.keep("a", "rep_1", i, "POST", "http://x/v1", {"model": 1})
+                 for i in range(2, 500)]
+            )
+        assert decisions[0] == decisions[1]
+        assert 50 < sum(decisions[0]) < 150
+
+    def test_explore_samples_calls(self, monkeypatch):
+        """Only sampled calls are analyzed; coverage is reported."""
+        monkeypatch.setattr(InstrumentedHTTP, "_send", lambda self, *args, **kwargs: None)
+
+        def fn(config, ctx):
+            for i in range(50):
+                ctx.http.post("http://x/v1", json={"model": config["model"], "seed": 1})
+            ctx.http.get("http://x/health")
+
+        exp = explore(
+            fn,
+            {"a": {"model": "m1"}, "b": {"model": "m2"}},
+            replicates=2,
+            progress=False,
+            store=MemoryStore(),
+            audit="sample",
+            audit_rate=0.1,
+        )
+        assert exp.audit_level == "sample" and exp.audit_rate == 0.1
+        for name in ("a", "b"):
+            evidence = exp.protocol[name].audit_evidence
+            assert evidence["level"] == "sample"
+            assert evidence["instrumented_call_count"] == 102
+            assert 2 <= evidence["sampled_call_count"] < 40
+            paths = {call["path"] for call in exp.protocol[name].api_calls}
+            assert paths == {"/v1", "/health"}
+
+        report = exp.hidden_variables()
+        assert report.audit_evidence_level == "sample"
+        assert report.instrumented_call_count == 204
+        assert 0 < report.coverage < 0.4
+        assert "Audit coverage" in report.pretty()
+
+
+class TestTelemetry:
+    """Tests for per-call latency, status and size telemetry."""
+
+    def test_calls_are_timed(self, server):
+        """Events carry telemetry; summaries carry latency histograms."""
+        url, _ = server
+
+        def fn(config, ctx):
+            ctx.http.post(url, json={"model": config["model"], "delay": config["delay"]})
+
+        exp = explore(
+            fn,
+            {"fast": {"model": "m", "delay": 0}, "slow": {"model": "m", "delay": 0.05}},
+            replicates=3,
+            progress=False,
+            store=MemoryStore(),
+        )
+        slow = exp.protocol["slow"]
+        assert slow.telemetry["calls"] == 3
+        assert slow.telemetry["status"] == {"200": 3}
+        assert slow.telemetry["request_bytes"] > 0 and slow.telemetry["response_bytes"] > 0
+        assert slow.latency().percentile(50) >= 50
+        assert slow.latency("ttfb_ms").count == 3
+        assert exp.protocol["fast"].latency().percentile(50) < slow.latency().percentile(50)
+        assert "Latency: p50" in exp.protocol_report()
+
+    def test_errors_recorded(self):
+        """Failed calls record their latency and exception type."""
+        http = InstrumentedHTTP({}, "a", "fp")
+        with pytest.raises(Exception):
+            http.get("http://127.0.0.1:9/unreachable", timeout=1)
+        (event,) = http.events
+        assert event.telemetry["error"] == "ConnectionError"
+        assert event.telemetry["latency_ms"] >= 0
+
+
+class TestStreaming:
+    """Tests for ctx.http.stream()."""
+
+    def test_stream_records_metrics(self, server):
+        """Chunks arrive lazily; timings become replicate metrics and telemetry."""
+        url, _ = server
+        seen = []
+
+        def fn(config, ctx):
+            events = ctx.http.stream(
+                "GET",
+                f"{url}/stream?n=5&gap=0.02",
+                lines=True,
+                count_tokens=lambda line: line != b"data: [DONE]",
+            )
+            for line in events:
+                seen.append((line, time.perf_counter()))
+
+        exp = explore(fn, {"a": {}}, replicates=1, progress=False, store=MemoryStore())
+        assert [line for line, _ in seen] == [f"data: tok{i}".encode() for i in range(5)] + [
+            b"data: [DONE]"
+        ]
+        assert seen[-1][1] - seen[0][1] >= 0.08  # not buffered
+        metrics = exp.metrics["a"]
+        assert metrics["stream_tokens"] == [5]
+        assert metrics["stream_chunks"] == [6]
+        assert metrics["stream_ttfb_ms"][0] >= 15
+        assert 15 <= metrics["stream_chunk_p50_ms"][0] <= metrics["stream_chunk_p99_ms"][0]
+        telemetry = exp.protocol["a"].telemetry
+        assert telemetry["response_bytes"] == metrics["stream_bytes"][0]
+        assert exp.protocol["a"].latency().max_ms >= 100
+
+    def test_early_close(self, server):
+        """Closing a stream early records the partial metrics once."""
+        url, _ = server
+        recorded = []
+        http = InstrumentedHTTP({}, "a", "fp", record=lambda name, value: recorded.append(name))
+        with http.stream("GET", f"{url}/stream?n=50&gap=0.001", lines=True) as events:
+            for _ in zip(range(2), events):
+                pass
+        assert events.metrics["stream_chunks"] == 2
+        assert recorded.count("stream_chunks") == 1
+        with pytest.raises(RuntimeError):
+            list(events)
@@ -172,6 +172,57 @@ class TestComputeIntegrity:
         assert status == IntegrityStatus.VALID
         assert "LOW_N" in flags
 
+    def test_sampled_audit(self):
+        """Sampled audit evidence is sufficient unless below the minimum coverage."""
+        report = HiddenVariablesReport(
+            audit_evidence_level="sample",
+            instrumented_call_count=100,
+            analyzed_call_count=10,
+        )
+        kwargs = dict(
+            prereg_exists=True,
+            replicates_fresh=True,
+            hidden_vars=report,
+            audit_sufficient=True,
+            fn_changed=False,
+        )
+
+        status, flags = compute_integrity(**kwargs)
+        assert status == IntegrityStatus.VALID
+        assert flags == ["AUDIT_SAMPLED"]
+
+        status, flags = compute_integrity(**kwargs, min_audit_coverage=0.5)
+        assert status == IntegrityStatus.NO_AUDIT
+
+    def test_sampled_audit_with_other_warnings(self):
+        """AUDIT_SAMPLED together with other warnings still gives VALID."""
+        report = HiddenVariablesReport(
+            audit_evidence_level="sample",
+            instrumented_call_count=100,
+            analyzed_call_count=10,
+        )
+        status, flags = compute_integrity(
+            prereg_exists=True,
+            replicates_fresh=True,
+            hidden_vars=report,
+            audit_sufficient=True,
+            fn_changed=False,
+            sample_size=5,
+        )
+
+        assert flags == ["AUDIT_SAMPLED", "LOW_N"]
+        assert status == IntegrityStatus.VALID
+
+        status, flags = compute_integrity(
+            prereg_exists=True,
+            replicates_fresh=True,
+            hidden_vars=report,
+            audit_sufficient=True,
+            fn_changed=True,
+            sample_size=5,
+        )
+        assert status == IntegrityStatus.FN_CHANGED
+
 
 class TestFormatIntegrityHeader:
     """Tests for format_integrity_header()."""
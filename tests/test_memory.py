@@ -0,0 +1,69 @@
+"""Tests for the in-memory store."""
+
+import os
+import tempfile
+
+from crystallize import ConfirmRun, Experiment, explore
+from crystallize.memory import MemoryStore
+from crystallize.store import Store, get_store, reset_store
+
+
+def fn(config, ctx):
+    ctx.record("score", config["x"] + ctx.replicate * 0.01)
+    return {"payload": [config["x"]] * 40000}
+
+
+CONFIGS = {"a": {"x": 1}, "b": {"x": 2}}
+
+
+class TestMemoryStore:
+    """Tests for MemoryStore."""
+
+    def test_explore_memory_root_touches_no_disk(self, monkeypatch):
+        """store_root=":memory:" runs explore and crystallize without files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            reset_store()
+            try:
+                exp = explore(fn, CONFIGS, replicates=2, progress=False, store_root=":memory:")
+                result = exp.crystallize("b.score > a.score", replicates=3, progress=False)
+                store = get_store(":memory:")
+                assert isinstance(store, MemoryStore)
+
+                loaded = ConfirmRun.load(result.run_id, store_root=":memory:")
+                assert loaded.metrics["b"]["score"] == result.metrics["b"]["score"]
+                assert store.read_ledger(exp.lineage_id, exp.config_fingerprints["a"]) == 5
+                assert [r["run_id"] for r in store.query(run_type="confirm")] == [result.run_id]
+            finally:
+                reset_store()
+            assert os.listdir(tmpdir) == []
+
+    def test_injected_store_and_snapshot(self):
+        """An injected MemoryStore can be snapshotted to disk and reloaded."""
+        store = MemoryStore()
+        exp = explore(fn, CONFIGS, replicates=2, progress=False, store=store)
+        result = exp.crystallize("b.score > a.score", replicates=3, progress=False)
+        assert Experiment.load(exp.run_id, store=store).results["a"][0]["payload"][0] == 1
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            disk = store.snapshot(tmpdir)
+            assert list(disk.blobs.root.glob("*/*"))  # large results became blobs
+
+            fresh = Store(tmpdir)
+            assert fresh.read_prereg(result.run_id)["parent_run_id"] == exp.run_id
+            assert fresh.read_ledger(exp.lineage_id, exp.config_fingerprints["b"]) == 5
+            loaded = Experiment.load(exp.run_id, store=fresh)
+            assert loaded.results["b"][1]["payload"][0] == 2
+            assert len(list(fresh.read_event_log(exp.run_id))) > 0
+
+    def test_gc_keeps_referenced_runs(self):
+        """gc() drops unreferenced explore runs only."""
+        store = MemoryStore()
+        exp = explore(fn, CONFIGS, replicates=2, progress=False, store=store)
+        exp.crystallize("b.score > a.score", replicates=3, progress=False)
+        throwaway = explore(fn, CONFIGS, replicates=2, progress=False, store=store)
+
+        report = store.gc(keep=0)
+        assert report.removed_runs == [throwaway.run_id]
+        assert store.read_run_manifest(throwaway.run_id) is None
+        assert store.read_run_manifest(exp.run_id) is not None
@@ -0,0 +1,93 @@
+"""Tests for cross-run meta-analysis."""
+
+import math
+import random
+
+import pytest
+
+from crystallize.memory import MemoryStore
+from crystallize.meta import pool, sufficient_stats
+
+
+def _write_confirm(store, run_id, left, right, metric="score"):
+    store.write_run_manifest(
+        run_id,
+        {
+            "run_id": run_id,
+            "lineage_id": "lin_test",
+            "parent_run_id": "exp_test",
+            "hypothesis": "b.score > a.score",
+            "hypothesis_result": {"left_config": "b", "right_config": "a", "metric": metric},
+            "metrics": {"a": {metric: right}, "b": {metric: left}},
+        },
+    )
+
+
+class TestPool:
+    """Tests for the pooling math."""
+
+    def test_fixed_and_random_effects(self):
+        """Matches hand-computed inverse-variance and DerSimonian-Laird values."""
+        effects, variances = [1.0, 2.0, 4.0], [0.5, 0.25, 1.0]
+        fixed, random_, tau2, q, i2 = pool(effects, variances)
+
+        w = [2.0, 4.0, 1.0]
+        fixed_est = (2 * 1 + 4 * 2 + 1 * 4) / 7
+        assert fixed.estimate == pytest.approx(fixed_est)
+        assert fixed.se == pytest.approx(math.sqrt(1 / 7))
+
+        expected_q = sum(wi * (y - fixed_est) ** 2 for wi, y in zip(w, effects))
+        c = 7 - (4 + 16 + 1) / 7
+        assert q == pytest.approx(expected_q)
+        assert tau2 == pytest.approx((expected_q - 2) / c)
+        assert i2 == pytest.approx((expected_q - 2) / expected_q)
+
+        w_star = [1 / (v + tau2) for v in variances]
+        assert random_.estimate == pytest.approx(
+            sum(wi * y for wi, y in zip(w_star, effects)) / sum(w_star)
+        )
+        assert random_.se > fixed.se
+
+    def test_sufficient_stats(self):
+        """n, mean and m2 skip non-numeric values."""
+        n, mean, m2 = sufficient_stats([1, 2, 3, None, "x"])
+        assert (n, mean, m2) == (3, 2.0, 2.0)
+        assert sufficient_stats([]) == (0, 0.0, 0.0)
+
+
+class TestLineageSummary:
+    """Tests for store.lineage_summary()."""
+
+    def test_pools_runs_and_caches_stats(self, monkeypatch):
+        """Runs are pooled; repeat queries read only cached statistics."""
+        rng = random.Random(0)
+        store = MemoryStore()
+        for i in range(4):
+            left = [1.0 + rng.gauss(0, 0.5) for _ in range(20)]
+            right = [rng.gauss(0, 0.5) for _ in range(20)]
+            _write_confirm(store, f"conf_{i}", left, right)
+        _write_confirm(store, "conf_other", [1.0, 2.0], [0.0, 1.0], metric="latency")
+
+        summary = store.lineage_summary("lin_test", "score")
+        assert [r.run_id for r in summary.runs] == [f"conf_{i}" for i in range(4)]
+        assert "conf_other" in summary.skipped
+        assert summary.fixed.ci[0] < summary.fixed.estimate < summary.fixed.ci[1]
+        assert summary.fixed.estimate == pytest.approx(1.0, abs=0.3)
+        assert "fixed" in summary.pretty()
+
+        def fail(run_id):
+            raise AssertionError("manifest re-read")
+
+        monkeypatch.setattr(store, "read_run_manifest", fail)
+        again = store.lineage_summary("lin_test", "score")
+        assert again.fixed == summary.fixed and again.random == summary.random
+
+    def test_rewritten_manifest_invalidates_cache(self):
+        """Rewriting a manifest drops its cached statistics."""
+        store = MemoryStore()
+        _write_confirm(store, "conf_a", [1.0, 2.0, 3.0], [0.0, 1.0, 2.0])
+        first = store.lineage_summary("lin_test", "score")
+        _write_confirm(store, "conf_a", [5.0, 6.0, 7.0], [0.0, 1.0, 2.0])
+        assert store.lineage_summary("lin_test", "score").fixed.estimate == pytest.approx(
+            first.fixed.estimate + 4.0
+        )
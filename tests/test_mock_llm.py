@@ -0,0 +1,81 @@
+"""Tests for the mock LLM server and the instrumentation benchmark."""
+
+import json
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from crystallize import explore  # noqa: E402
+from crystallize.bench import benchmark_http, format_results  # noqa: E402
+from crystallize.memory import MemoryStore  # noqa: E402
+from crystallize.mock_llm import MockLLMServer  # noqa: E402
+
+
+class TestMockLLMServer:
+    """Tests for MockLLMServer."""
+
+    def test_chat_completion(self):
+        """Completions follow the chat-completions response format."""
+        with MockLLMServer(completion_tokens=4) as server:
+            r = requests.post(
+                f"{server.url}/chat/completions",
+                json={"model": "m1", "messages": [{"role": "user", "content": "hi"}]},
+            )
+            models = requests.get(f"{server.url}/models").json()
+        body = r.json()
+        assert r.status_code == 200
+        assert body["model"] == "m1"
+        assert body["choices"][0]["message"]["content"] == "tok0 tok1 tok2 tok3 "
+        assert body["usage"]["completion_tokens"] == 4
+        assert models["data"][0]["id"] == "mock-llm"
+
+    def test_streaming_through_ctx_http(self):
+        """Streamed completions work with ctx.http.stream()."""
+        server = MockLLMServer(token_latency_ms=5)
+
+        def fn(config, ctx):
+            with ctx.http.stream(
+                "POST",
+                f"{server.url}/chat/completions",
+                json={"model": "m1", "max_tokens": 8, "stream": True},
+                lines=True,
+            ) as lines:
+                events = [line[len(b"data: "):] for line in lines]
+            assert events[-1] == b"[DONE]"
+            deltas = [json.loads(e)["choices"][0]["delta"] for e in events[:-1]]
+            text = "".join(delta["content"] for delta in deltas)
+            ctx.record("words", len(text.split()))
+
+        with server:
+            exp = explore(
+                fn, {"a": {}}, replicates=1, progress=False, store=MemoryStore()
+            )
+        assert exp.metrics["a"]["words"] == [8]
+        assert exp.metrics["a"]["stream_chunk_p50_ms"][0] >= 4
+
+    def test_failure_injection(self):
+        """Rate limits and errors are injected at the configured rates."""
+        with MockLLMServer(rate_limit=0.3, error_rate=0.2, seed=1) as server:
+            with requests.Session() as session:
+                url = f"{server.url}/completions"
+                statuses = [
+                    session.post(url, json={"prompt": "x"}).status_code
+                    for _ in range(200)
+                ]
+        assert 40 < statuses.count(429) < 80
+        assert 20 < statuses.count(500) < 60
+        assert server.stats["requests"] == 200
+        assert server.stats["rate_limited"] == statuses.count(429)
+
+
+class TestBenchmark:
+    """Tests for the instrumentation benchmark."""
+
+    def test_benchmark_runs(self):
+        """Each level reports throughput for both modes."""
+        results = benchmark_http(levels=(1, 4), calls=20, repeats=1)
+        assert [r.concurrency for r in results] == [1, 4]
+        assert all(r.statuses == {200: 20} for r in results)
+        assert all(r.throughput > 0 and r.baseline_throughput > 0 for r in results)
+        assert "overhead" in format_results(results)
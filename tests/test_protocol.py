@@ -0,0 +1,289 @@
+"""Tests for protocol provenance analysis and compact event values."""
+
+import tempfile
+
+from crystallize import explore
+from crystallize.memory import MemoryStore
+from crystallize.protocol import (
+    VALUE_REF_KEY,
+    ConfigPairDiff,
+    HiddenVariableAggregator,
+    HiddenVariablesReport,
+    ProtocolDiff,
+    ProtocolEvent,
+    ProtocolSummary,
+    ProvenanceIndex,
+    ValueInterner,
+    classify_risk,
+    field_leaf,
+    is_value_ref,
+    nested_keys,
+)
+from crystallize.store import Store
+
+
+class TestProvenanceIndex:
+    """Tests for nested provenance resolution."""
+
+    def test_resolves_nested_config_values(self):
+        """Values nested in the config resolve to their dotted path."""
+        index = ProvenanceIndex({"model": "m1", "options": {"temperature": 0.2}})
+        assert index.resolve("m1") == "config.model"
+        assert index.resolve(0.2) == "config.options.temperature"
+        assert index.resolve({"temperature": 0.2}) == "config.options"
+        assert index.resolve("other") is None
+
+    def test_shallowest_path_wins(self):
+        """A value present at several depths resolves to the shallowest key."""
+        index = ProvenanceIndex({"outer": {"inner": "x"}, "top": "x"})
+        assert index.resolve("x") == "config.top"
+
+    def test_walks_nested_request_bodies(self):
+        """Leaves of nested request bodies are traced individually."""
+        index = ProvenanceIndex({"prompt": "Hello", "model": "m1"})
+        body = {
+            "model": "m1",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "options": {"temperature": 0.7},
+            "stop": ["\n"],
+        }
+        fields = {path: source for path, _, source in index.iter_fields(body)}
+        assert fields == {
+            "model": "config.model",
+            "stop": "hardcoded",
+            "messages[].role": "hardcoded",
+            "messages[].content": "config.prompt",
+            "options.temperature": "hardcoded",
+        }
+
+    def test_list_items_collapse_into_one_field(self):
+        """Each key of a list of objects is one field, however long the list."""
+        index = ProvenanceIndex({"system": "Be brief"})
+        messages = [{"role": "system", "content": "Be brief"}] + [
+            {"role": "user", "content": f"q{i}"} for i in range(50)
+        ]
+        fields = {
+            path: (value, source)
+            for path, value, source in index.iter_fields({"messages": messages})
+        }
+        assert set(fields) == {"messages[].role", "messages[].content"}
+        contents, source = fields["messages[].content"]
+        assert len(contents) == 51 and contents[0] == "Be brief"
+        assert source == "hardcoded"  # some items are not from the config
+
+    def test_field_cap(self):
+        """Giant payloads keep top-level fields and stop expanding."""
+        index = ProvenanceIndex({})
+        body = {"a": 1, "docs": [{"text": str(i)} for i in range(1000)]}
+        fields = list(index.iter_fields(body, max_fields=10))
+        assert [path for path, _, _ in fields] == ["a", "docs"]
+
+
+class TestRiskClassification:
+    """Tests for risk classification of nested fields."""
+
+    def test_risk_uses_last_path_segment(self):
+        """Nested sensitive fields are classified like top-level ones."""
+        assert field_leaf("options.temperature") == "temperature"
+        assert field_leaf("messages[].content") == "content"
+        assert classify_risk("options.temperature", "hardcoded") == "MED"
+        assert classify_risk("messages[].content", "hardcoded") == "LOW"
+
+    def test_nested_keys(self):
+        """Sensitive fields set in nested objects count as present."""
+        assert "temperature" in nested_keys({"options": {"temperature": 0}})
+
+
+class TestValueInterner:
+    """Tests for compact protocol field values."""
+
+    MESSAGES = [{"role": "user", "content": "word " * 200}]
+
+    def test_small_values_inline(self):
+        """Short values are kept as-is."""
+        interner = ValueInterner()
+        assert interner.compact(0.7) == 0.7
+        assert interner.compact("gpt-4") == "gpt-4"
+        assert interner.compact([{"role": "user", "content": "hi"}]) == [
+            {"role": "user", "content": "hi"}
+        ]
+
+    def test_large_values_interned(self):
+        """Equal large values share one reference with hash, size and preview."""
+        interner = ValueInterner()
+        ref = interner.compact(self.MESSAGES)
+        assert is_value_ref(ref)
+        assert ref["size"] > 1000 and len(ref["preview"]) < 100
+        assert interner.compact([dict(m) for m in self.MESSAGES]) is ref
+
+    def test_spill_to_blob_store(self):
+        """Spilled values can be read back in full from the store."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            ref = store.value_interner().compact(self.MESSAGES)
+            assert store.blobs.exists(ref[VALUE_REF_KEY])
+            assert store.read_protocol_value(ref) == self.MESSAGES
+
+    def test_hidden_variables_compare_on_hashes(self):
+        """Identical large values count as one observed value."""
+        interner = ValueInterner()
+
+        def summary(name):
+            fields = {"messages": {"value": self.MESSAGES, "source": "hardcoded"}}
+            event = ProtocolEvent.create(name, "fp", "POST", "http://x/v1", fields)
+            interner.compact_fields(event.fields)
+            return ProtocolSummary.from_events(name, [event])
+
+        report = HiddenVariablesReport.from_protocol_summaries(
+            {"a": summary("a"), "b": summary("b")}
+        )
+        (item,) = report.items
+        assert item.seen_in == ["a", "b"]
+        assert "chars, sha256" in item.why
+
+
+class TestCallShapes:
+    """Tests for grouping protocol events by call shape."""
+
+    def test_groups_identical_calls(self):
+        """Calls with the same method, endpoint and fields form one shape."""
+        events = []
+        for i in range(100):
+            temperature = 0.0 if i % 10 else 1.0
+            fields = {"temperature": {"value": temperature, "source": "hardcoded"}}
+            events.append(ProtocolEvent.create("a", "fp", "POST", "http://x/v1", fields))
+
+        summary = ProtocolSummary.from_events("a", events)
+        assert [c["count"] for c in summary.api_calls] == [10, 90]
+        first, second = summary.api_calls
+        assert first["examples"] == [0, 10, 20]
+        assert first["first_ts"] == events[0].ts and first["last_ts"] == events[90].ts
+        assert second["fields"]["temperature"]["value"] == 0.0
+        assert summary.audit_evidence["instrumented_call_count"] == 100
+
+    def test_reads_ungrouped_summaries(self):
+        """Summaries written before grouping still load and analyze."""
+        call = {"method": "POST", "host": "x", "path": "/v1",
+                "fields": {"seed": {"value": 1, "source": "hardcoded"}}}
+        summary = ProtocolSummary.from_dict({"config_name": "a", "api_calls": [call, call]})
+        report = HiddenVariablesReport.from_protocol_summaries({"a": summary})
+        assert [item.field for item in report.items] == ["seed"]
+
+
+class TestHiddenVariableAggregator:
+    """Tests for incremental hidden-variable aggregation."""
+
+    @staticmethod
+    def _event(config_name, **values):
+        fields = {k: {"value": v, "source": "hardcoded"} for k, v in values.items()}
+        fields["model"] = {"value": "m", "source": "config.model"}
+        return ProtocolEvent.create(config_name, "fp", "POST", "http://x/v1", fields)
+
+    def test_incremental_matches_summaries(self):
+        """Feeding events gives the same report as rebuilding from summaries."""
+        events = {
+            "a": [self._event("a", temperature=0.7, seed=i) for i in range(3)],
+            "b": [self._event("b", temperature=0.7)],
+        }
+        aggregator = HiddenVariableAggregator()
+        for name, evts in events.items():
+            aggregator.add_events(name, evts)
+        summaries = {name: ProtocolSummary.from_events(name, evts) for name, evts in events.items()}
+
+        expected = HiddenVariablesReport.from_protocol_summaries(summaries)
+        assert aggregator.report().to_dict() == expected.to_dict()
+        assert [item.field for item in expected.items] == ["seed", "temperature"]
+        assert expected.instrumented_call_count == 4
+
+    def test_report_cached_until_new_events(self):
+        """The report is reused until more events are added."""
+        aggregator = HiddenVariableAggregator()
+        aggregator.add_events("a", [self._event("a", temperature=0.7)])
+        report = aggregator.report()
+        assert aggregator.report() is report
+        aggregator.add_events("b", [self._event("b", top_p=0.9)])
+        assert aggregator.report() is not report
+        assert len(aggregator.report().items) == 2
+
+    def test_experiment_caches_report(self):
+        """Experiment.hidden_variables() is cached and follows protocol changes."""
+        exp = explore(
+            lambda config, ctx: ctx.record("x", 1),
+            {"a": {}},
+            replicates=1,
+            progress=False,
+            store=MemoryStore(),
+        )
+        report = exp.hidden_variables()
+        assert exp.hidden_variables() is report
+
+        exp.protocol = {"a": ProtocolSummary.from_events("a", [self._event("a", seed=1)])}
+        assert [item.field for item in exp.hidden_variables().items] == ["seed"]
+
+
+class TestProtocolDiff:
+    """Tests for the grouping-based protocol diff."""
+
+    @staticmethod
+    def _summary(name, **fields):
+        fields = {k: {"value": v, "source": src} for k, (v, src) in fields.items()}
+        event = ProtocolEvent.create(name, "fp", "POST", "http://x/v1", fields)
+        return ProtocolSummary.from_events(name, [event])
+
+    def test_confound_detected(self):
+        """Undeclared observed differences are confounds; declared ones are not."""
+        configs = {"a": {"model": "m1"}, "b": {"model": "m2"}}
+        summaries = {
+            "a": self._summary("a", model=("m1", "config.model"), temperature=(0.0, "hardcoded")),
+            "b": self._summary("b", model=("m2", "config.model"), temperature=(0.7, "hardcoded")),
+        }
+        diff = ProtocolDiff.from_configs_and_summaries(configs, summaries)
+        assert diff.has_confounds()
+        assert diff.confounded_fields == {"temperature": [["a", "b"]]}
+        pair = diff.pair("a", "b")
+        assert pair.declared_diffs == {"model": ("m1", "m2")}
+        assert pair.confounds == ["temperature"]
+        assert diff.pairs == [pair]
+
+    def test_pairs_argument_still_accepted(self):
+        """ProtocolDiff(pairs=...) seeds the pairwise cache."""
+        pair = ConfigPairDiff(
+            config_a="a",
+            config_b="b",
+            declared_diffs={},
+            observed_diffs={"temperature": (0.0, 0.7)},
+            confounds=["temperature"],
+        )
+        diff = ProtocolDiff(pairs=[pair])
+        assert diff.pairs == [pair]
+        assert diff.pair("a", "b") is pair
+        assert diff.config_names == ["a", "b"]
+        assert diff.has_confounds()
+        assert "CONFOUNDS: temperature" in diff.pretty()
+
+    def test_provenance_explains_renamed_fields(self):
+        """A field traced to a differing config key is not a confound."""
+        configs = {"a": {"temp": 0.0}, "b": {"temp": 0.7}}
+        summaries = {
+            "a": self._summary("a", temperature=(0.0, "config.temp")),
+            "b": self._summary("b", temperature=(0.7, "config.temp")),
+        }
+        diff = ProtocolDiff.from_configs_and_summaries(configs, summaries)
+        assert not diff.has_confounds()
+        assert diff.pair("a", "b").observed_diffs == {"temperature": (0.0, 0.7)}
+
+    def test_large_sweep_is_lazy(self):
+        """A 300-config grid builds no pairs unless asked."""
+        configs = {f"c{i}": {"lr": i % 30, "bs": i // 30} for i in range(300)}
+        summaries = {
+            name: self._summary(name, lr=(cfg["lr"], "config.lr"), seed=(1, "hardcoded"))
+            for name, cfg in configs.items()
+        }
+        summaries["c7"] = self._summary("c7", lr=(7, "config.lr"), seed=(2, "hardcoded"))
+
+        diff = ProtocolDiff.from_configs_and_summaries(configs, summaries)
+        assert list(diff.confounded_fields) == ["seed"]
+        assert diff._pairs == {}
+        assert diff.pair("c7", "c8").confounds == ["seed"]
+        assert "CONFOUND seed" in diff.pretty()
+        assert "pairs" not in diff.to_dict(include_pairs=False)
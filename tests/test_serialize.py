@@ -0,0 +1,107 @@
+"""Tests for the serializer layer."""
+
+import hashlib
+import json
+import math
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import pytest
+
+from crystallize.ids import manifest_hash
+from crystallize.serialize import get_serializer, hash_canonical
+from crystallize.store import Store
+
+np = pytest.importorskip("numpy")
+
+BACKENDS = ["json", "orjson", "msgspec"]
+
+
+@dataclass
+class Point:
+    x: int
+    y: float
+
+
+class TestSerializers:
+    """Tests for the serializer backends."""
+
+    @pytest.mark.parametrize("name", BACKENDS)
+    def test_numpy_and_dataclasses(self, name):
+        """NumPy values and dataclasses are encoded natively, not as repr strings."""
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            pytest.skip(f"{name} not installed")
+
+        data = {
+            "array": np.arange(3),
+            "matrix": np.ones((2, 2), dtype=np.float32),
+            "scalar": np.int64(7),
+            "point": Point(1, 2.5),
+        }
+        for indent in (2, None):
+            loaded = json.loads(serializer.dumps(data, indent))
+            assert loaded == {
+                "array": [0, 1, 2],
+                "matrix": [[1.0, 1.0], [1.0, 1.0]],
+                "scalar": 7,
+                "point": {"x": 1, "y": 2.5},
+            }
+
+    def test_default_is_canonical(self):
+        """The default backend is the stdlib encoder the hashes are based on."""
+        assert get_serializer().name == "json"
+        assert get_serializer("auto").name == "json"
+
+    def test_unknown_serializer_rejected(self):
+        """An unknown serializer name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            get_serializer("yaml")
+
+
+class TestHashCanonical:
+    """Tests for streaming manifest hashing."""
+
+    def test_matches_full_encoding(self):
+        """The streamed digest equals hashing the whole canonical string."""
+        manifest = {
+            "run_id": "exp_test",
+            "results": {"a": [1, 2.5, None, "é"]},
+            "metrics": {"a": {"score": [0.1, 0.2]}},
+            "nested": {"z": 1, "a": [{"b": 2, "a": 1}]},
+        }
+        canonical = json.dumps(manifest, sort_keys=True, separators=(",", ":"))
+        assert hash_canonical(manifest) == hashlib.sha256(canonical.encode()).hexdigest()
+
+    def test_numpy_manifest_verifies_after_reload(self):
+        """A manifest with NumPy values hashes the same once stored and reloaded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            manifest = {"run_id": "exp_test", "results": {"a": [np.float32(0.1), np.arange(4)]}}
+            manifest["manifest_hash"] = manifest_hash(manifest)
+            store.write_run_manifest("exp_test", manifest)
+
+            loaded = store.read_run_manifest("exp_test")
+            assert loaded["results"]["a"][1] == [0, 1, 2, 3]
+            assert manifest_hash({k: v for k, v in loaded.items() if k != "manifest_hash"}) == (
+                loaded["manifest_hash"]
+            )
+
+    def test_default_store_manifest_rehashes(self):
+        """NaN and datetimes survive a default Store, so the stored hash verifies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            manifest = {
+                "run_id": "exp_test",
+                "created": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                "metrics": {"a": {"score": [0.5, float("nan"), float("inf")]}},
+            }
+            manifest["manifest_hash"] = manifest_hash(manifest)
+            store.write_run_manifest("exp_test", manifest)
+
+            loaded = store.read_run_manifest("exp_test")
+            assert math.isnan(loaded["metrics"]["a"]["score"][1])
+            stored = loaded.pop("manifest_hash")
+            assert manifest_hash(loaded) == stored
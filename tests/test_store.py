@@ -2,8 +2,13 @@
 
 import tempfile
 import os
+import threading
+import time
+from datetime import timedelta
 
-from crystallize.store import Store
+import pytest
+
+from crystallize.store import GC_GRACE_SECONDS, Store, get_store, reset_store
 
 
 class TestStore:
@@ -97,3 +102,462 @@ class TestStore:
 
             result = store.read_run_manifest("nonexistent")
             assert result is None
+
+    def test_read_run_meta_excludes_heavy_sections(self):
+        """read_run_meta() returns the manifest without results/metrics/protocol."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+
+            manifest = {
+                "run_id": "exp_test",
+                "lineage_id": "lin_test",
+                "results": {"a": [1, 2, 3]},
+                "metrics": {"a": {"score": [0.9]}},
+                "protocol": {},
+            }
+            store.write_run_manifest("exp_test", manifest)
+
+            meta = store.read_run_meta("exp_test")
+            assert meta == {"run_id": "exp_test", "lineage_id": "lin_test"}
+            assert store.read_run_meta("nonexistent") is None
+
+    def test_get_store_closes_replaced_store(self, monkeypatch):
+        """get_store() closes the global store it replaces, and only that one."""
+        closed = []
+        reset_store()
+        try:
+            with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+                old = get_store(first)
+                monkeypatch.setattr(old, "close", lambda: closed.append(old))
+                assert get_store(first) is old
+                assert closed == []
+
+                new = get_store(second)
+                assert closed == [old]
+                assert new is not old
+                new.close()
+        finally:
+            reset_store()
+
+
+class TestCatalog:
+    """Tests for the run catalog."""
+
+    def _write_runs(self, store):
+        store.write_run_manifest(
+            "exp_one",
+            {"run_id": "exp_one", "lineage_id": "lin_a", "config_fingerprints": {"a": "fp_a"}},
+        )
+        store.write_prereg(
+            "conf_one",
+            {
+                "run_id": "conf_one",
+                "parent_run_id": "exp_one",
+                "lineage_id": "lin_a",
+                "hypothesis": "b.x > a.x",
+                "config_fingerprints": {"a": "fp_a", "b": "fp_b"},
+                "timestamp": "2026-01-01T00:00:00Z",
+            },
+        )
+        store.write_run_manifest(
+            "conf_one",
+            {
+                "run_id": "conf_one",
+                "parent_run_id": "exp_one",
+                "lineage_id": "lin_a",
+                "hypothesis": "b.x > a.x",
+                "integrity": "VALID",
+                "supported": True,
+                "results": {"a": [1]},
+            },
+        )
+        store.write_run_manifest("exp_two", {"run_id": "exp_two", "lineage_id": "lin_b"})
+
+    def test_writes_update_catalog(self):
+        """Manifest and prereg writes are indexed and queryable."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            self._write_runs(store)
+
+            rows = store.query(lineage="lin_a", run_type="confirm", integrity="VALID")
+            assert [r["run_id"] for r in rows] == ["conf_one"]
+            row = rows[0]
+            assert row["supported"] is True
+            assert row["parent_run_id"] == "exp_one"
+            assert row["has_prereg"] and row["has_manifest"]
+            assert row["created_at"] == "2026-01-01T00:00:00Z"
+            assert row["config_fingerprints"] == {"a": "fp_a", "b": "fp_b"}
+
+            assert {r["run_id"] for r in store.query(config_fingerprint="fp_a")} == {
+                "exp_one",
+                "conf_one",
+            }
+            assert [r["run_id"] for r in store.query(lineage="lin_b")] == ["exp_two"]
+            assert store.query(supported=False) == []
+
+    def test_rebuild_catalog(self):
+        """rebuild_catalog() recovers the index from files on disk."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            self._write_runs(store)
+            store.catalog.clear()
+            assert store.query() == []
+
+            assert store.rebuild_catalog() == 3
+            rows = store.query(lineage="lin_a", integrity="VALID")
+            assert [r["run_id"] for r in rows] == ["conf_one"]
+            assert rows[0]["hypothesis"] == "b.x > a.x"
+
+    def test_cli_rebuild(self, capsys):
+        """The CLI rebuilds and lists the catalog."""
+        from crystallize.cli import main
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._write_runs(Store(tmpdir))
+
+            assert main(["--root", tmpdir, "catalog", "rebuild"]) == 0
+            assert "Indexed 3 runs" in capsys.readouterr().out
+
+            assert main(["--root", tmpdir, "runs", "--type", "confirm"]) == 0
+            assert '"run_id": "conf_one"' in capsys.readouterr().out
+
+    def test_cli_missing_root(self, capsys):
+        """The CLI refuses a missing root instead of creating a store there."""
+        from crystallize.cli import main
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = os.path.join(tmpdir, "typo")
+            assert main(["--root", root, "runs"]) == 2
+            assert "no store at" in capsys.readouterr().err
+            assert not os.path.exists(root)
+
+    def test_cli_closes_store(self, monkeypatch):
+        """The CLI closes the store after running a command."""
+        from crystallize.cli import main
+
+        closed = []
+        monkeypatch.setattr(Store, "close", lambda self: closed.append(self.root))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            Store(tmpdir)
+            assert main(["--root", tmpdir, "runs"]) == 0
+        assert len(closed) == 1
+
+
+class TestCompression:
+    """Tests for compressed manifests and prereg artifacts."""
+
+    def test_gzip_roundtrip(self):
+        """gzip-compressed artifacts are written and read back transparently."""
+        import gzip
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, compression="gzip")
+
+            manifest = {"run_id": "exp_test", "lineage_id": "lin_x", "results": {"a": ["x" * 100] * 50}}
+            path = store.write_run_manifest("exp_test", manifest)
+            assert str(path).endswith(".json.gz")
+            with gzip.open(path) as f:
+                assert f.read().startswith(b"{")
+
+            prereg_path = store.write_prereg("conf_test", {"hypothesis": "a.x > b.x"})
+            assert str(prereg_path).endswith(".json.gz")
+
+            # Reading does not depend on the writer's setting
+            plain = Store(tmpdir)
+            assert plain.read_run_manifest("exp_test") == manifest
+            assert plain.read_prereg("conf_test") == {"hypothesis": "a.x > b.x"}
+            assert plain.read_run_meta("exp_test") == {"run_id": "exp_test", "lineage_id": "lin_x"}
+
+    def test_rewrite_replaces_other_format(self):
+        """Rewriting a run in another format leaves a single file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            Store(tmpdir).write_run_manifest("exp_test", {"run_id": "exp_test", "v": 1})
+            store = Store(tmpdir, compression="gzip")
+            store.write_run_manifest("exp_test", {"run_id": "exp_test", "v": 2})
+
+            files = sorted(os.listdir(os.path.join(tmpdir, "runs")))
+            assert files == ["exp_test.json.gz", "exp_test.meta.json"]
+            assert store.read_run_manifest("exp_test")["v"] == 2
+            assert store.rebuild_catalog() == 1
+
+    def test_manifest_hash_unaffected(self):
+        """manifest_hash verifies against the decompressed manifest."""
+        from crystallize.ids import manifest_hash
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, compression="gzip")
+            manifest = {"run_id": "conf_test", "metrics": {"a": {"score": [0.1, 0.2]}}}
+            manifest["manifest_hash"] = manifest_hash(manifest)
+            store.write_run_manifest("conf_test", manifest)
+
+            loaded = store.read_run_manifest("conf_test")
+            stored_hash = loaded.pop("manifest_hash")
+            assert manifest_hash(loaded) == stored_hash
+
+    def test_zstd_roundtrip(self):
+        """zstd-compressed artifacts round-trip when zstandard is installed."""
+        pytest.importorskip("zstandard")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, compression="zstd")
+            path = store.write_run_manifest("exp_test", {"run_id": "exp_test"})
+            assert str(path).endswith(".json.zst")
+            assert Store(tmpdir).read_run_manifest("exp_test") == {"run_id": "exp_test"}
+
+    def test_unknown_compression_rejected(self):
+        """An unknown compression name raises ValueError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError, match="Unknown compression"):
+                Store(tmpdir, compression="lz4")
+
+
+class TestDurability:
+    """Tests for the durability policy."""
+
+    def test_batched_defers_ledger_until_flush(self):
+        """Batched ledger updates are visible to reads but written on flush()."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, durability="batched")
+
+            for i in range(5):
+                store.update_ledger("lin_test", f"cfg_{i}", 3)
+            assert store.read_ledger("lin_test", "cfg_2") == 3
+            assert store.allocate_replicates("lin_test", "cfg_2", 2) == (3, 4)
+            assert os.listdir(os.path.join(tmpdir, "ledger")) == []
+
+            store.flush()
+            assert os.listdir(os.path.join(tmpdir, "ledger")) == ["lin_test.json"]
+
+            fresh = Store(tmpdir)
+            assert fresh.read_ledger("lin_test", "cfg_2") == 5
+            assert fresh.read_ledger("lin_test", "cfg_4") == 3
+
+    def test_batched_groups_fsyncs(self, monkeypatch):
+        """Batched mode fsyncs once per file at flush instead of per write."""
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or real_fsync(fd))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, durability="batched")
+            for i in range(20):
+                store.update_ledger("lin_test", f"cfg_{i}", i + 1)
+            store.write_run_manifest("exp_test", {"run_id": "exp_test"})
+            assert calls == []
+
+            store.flush()
+            # ledger + manifest + meta sidecar, then the two directories
+            assert len(calls) == 5
+
+    def test_none_never_fsyncs(self, monkeypatch):
+        """durability='none' skips fsync entirely."""
+        calls = []
+        monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, durability="none")
+            store.update_ledger("lin_test", "cfg_test", 1)
+            store.write_prereg("conf_test", {"hypothesis": "a.x > b.x"})
+            store.flush()
+            assert calls == []
+            assert store.read_ledger("lin_test", "cfg_test") == 1
+
+    def test_unknown_durability_rejected(self):
+        """An unknown durability mode raises ValueError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError, match="Unknown durability"):
+                Store(tmpdir, durability="eventual")
+
+
+class TestAsyncWrites:
+    """Tests for the background writer."""
+
+    def test_reads_see_queued_writes(self):
+        """Reads wait for queued writes to land."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, async_writes=True)
+            try:
+                store.update_ledger("lin_test", "cfg_test", 4)
+                store.write_run_manifest("exp_test", {"run_id": "exp_test", "results": {}})
+                assert store.read_ledger("lin_test", "cfg_test") == 4
+                assert store.read_run_manifest("exp_test")["run_id"] == "exp_test"
+                assert store.query(run_type="explore")[0]["run_id"] == "exp_test"
+            finally:
+                store.close()
+
+    def test_backpressure_and_order(self):
+        """A full queue blocks the caller; tasks run in submission order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, async_writes=True, write_queue_size=1)
+            gate = threading.Event()
+            order = []
+            store._submit(gate.wait)
+            store._submit(order.append, 1)
+
+            blocked = threading.Thread(target=store._submit, args=(order.append, 2))
+            blocked.start()
+            blocked.join(timeout=0.1)
+            assert blocked.is_alive()
+
+            gate.set()
+            blocked.join()
+            store.close()
+            assert order == [1, 2]
+
+    def test_error_raised_on_flush(self):
+        """A failed background write is re-raised by the next flush()."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, async_writes=True)
+
+            def fail():
+                raise OSError("disk full")
+
+            store._submit(fail)
+            with pytest.raises(OSError, match="disk full"):
+                store.flush()
+            store.flush()  # the error is reported once
+            store.close()
+
+    def test_error_warned(self):
+        """on_write_error='warn' reports failures without raising."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, async_writes=True, on_write_error="warn")
+
+            def fail():
+                raise OSError("disk full")
+
+            with pytest.warns(RuntimeWarning, match="disk full"):
+                store._submit(fail)
+                store.flush()
+            store.close()
+
+
+class TestGC:
+    """Tests for garbage collection."""
+
+    def _age(self, path, seconds):
+        """Backdate a file's mtime."""
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def _setup(self, store):
+        big = store.externalize(list(range(20000)))
+        for i, run_id in enumerate(["exp_old", "exp_parent", "exp_new"]):
+            store.write_run_manifest(
+                run_id, {"run_id": run_id, "results": {"a": [big if run_id == "exp_old" else 1]}}
+            )
+            with store.open_event_log(run_id) as log:
+                log.append({"type": "start", "run_id": run_id})
+            self._age(store.run_manifest_path(run_id), (2 - i) * 86400)
+        store.write_prereg("conf_one", {"run_id": "conf_one", "parent_run_id": "exp_parent"})
+        for path in store.blobs.root.glob("*/*"):
+            self._age(path, 2 * GC_GRACE_SECONDS)
+        return big
+
+    def test_keeps_referenced_and_recent_runs(self):
+        """Old unreferenced explore runs and their blobs are removed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            big = self._setup(store)
+
+            report = store.gc(older_than=timedelta(days=1))
+            assert report.removed_runs == ["exp_old"]
+            assert report.removed_blobs == 1
+            assert report.reclaimed_bytes > big["size"]
+            assert store.read_run_manifest("exp_old") is None
+            assert store.read_run_meta("exp_old") is None
+            assert list(store.read_event_log("exp_old")) == []
+            assert store.read_run_manifest("exp_parent") is not None
+            assert {r["run_id"] for r in store.query()} == {"exp_parent", "exp_new", "conf_one"}
+
+    def test_keeps_protocol_value_blobs(self):
+        """Spilled protocol values referenced by a kept run survive gc."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            ref = store.value_interner().compact(["x" * 1000])
+            call = {"fields": {"prompt": {"value": ref, "source": "hardcoded"}}}
+            store.write_run_manifest(
+                "exp_keep", {"run_id": "exp_keep", "protocol": {"a": {"api_calls": [call]}}}
+            )
+            for path in store.blobs.root.glob("*/*"):
+                self._age(path, 2 * GC_GRACE_SECONDS)
+
+            assert store.gc().removed_blobs == 0
+            assert store.read_protocol_value(ref) == ["x" * 1000]
+
+    def test_dry_run_and_keep(self):
+        """dry_run reports without deleting; keep protects the newest runs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            self._setup(store)
+
+            report = store.gc(keep=1, dry_run=True)
+            assert report.removed_runs == ["exp_old"]
+            assert report.reclaimed_bytes > 0
+            assert store.read_run_manifest("exp_old") is not None
+
+            assert store.gc(keep=3).removed_runs == []
+
+    def test_temp_files_and_ledger_compaction(self):
+        """Stale temp files are removed and per-config ledgers merged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir)
+            store.update_ledger("lin_test", "cfg_a", 4)
+            store.update_ledger("lin_test", "cfg_b", 2)
+            stale = store.runs_dir / ".tmp_crash.json"
+            stale.write_text("{")
+            self._age(stale, 2 * GC_GRACE_SECONDS)
+            fresh = store.runs_dir / ".tmp_live.json"
+            fresh.write_text("{")
+
+            report = store.gc()
+            assert report.removed_temp_files == 1
+            assert report.compacted_ledgers == 2
+            assert report.removed_runs == []
+            assert not stale.exists() and fresh.exists()
+            assert os.listdir(store.ledger_dir) == ["lin_test.json"]
+            assert store.read_ledger("lin_test", "cfg_a") == 4
+            assert store.read_ledger("lin_test", "cfg_b") == 2
+
+    @pytest.mark.parametrize("durability", ["strict", "batched"])
+    def test_ledger_compaction_is_durable_before_unlink(self, durability, monkeypatch):
+        """The merged ledger and its directory are fsynced before sources are removed."""
+        import json
+        from pathlib import Path
+
+        import crystallize.store as store_module
+
+        order = []
+        real_fsync_dir, real_unlink = store_module._fsync_dir, Path.unlink
+
+        def fsync_dir(directory):
+            order.append(("fsync_dir", Path(directory).name))
+            real_fsync_dir(directory)
+
+        def unlink(path, *args, **kwargs):
+            order.append(("unlink", path.name))
+            real_unlink(path, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = Store(tmpdir, durability=durability)
+            for fp in ("cfg_a", "cfg_b"):
+                data = {"lineage_id": "lin_test", "config_fingerprint": fp, "next_index": 3}
+                (store.ledger_dir / f"lin_test_{fp}.json").write_text(json.dumps(data))
+            monkeypatch.setattr(store_module, "_fsync_dir", fsync_dir)
+            monkeypatch.setattr(Path, "unlink", unlink)
+
+            assert store.gc().compacted_ledgers == 2
+            first_unlink = next(i for i, (op, _) in enumerate(order) if op == "unlink")
+            assert ("fsync_dir", "ledger") in order[:first_unlink]
+            assert store.read_ledger("lin_test", "cfg_b") == 3
+
+    def test_cli_gc(self, capsys):
+        """The CLI runs gc and prints a summary."""
+        from crystallize.cli import main
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._setup(Store(tmpdir))
+
+            assert main(["--root", tmpdir, "gc", "--older-than", "36h", "--dry-run"]) == 0
+            out = capsys.readouterr().out
+            assert "exp_old" in out and "Would remove 1 runs" in out
@@ -0,0 +1,62 @@
+"""Tests for call telemetry aggregation."""
+
+import random
+
+from crystallize.protocol import ProtocolEvent, ProtocolSummary
+from crystallize.telemetry import LatencyHistogram, summarize_telemetry
+
+
+class TestLatencyHistogram:
+    """Tests for the log-bucketed latency histogram."""
+
+    def test_percentiles_within_bucket_precision(self):
+        """Percentiles match exact values to about 2%."""
+        rng = random.Random(0)
+        values = sorted(rng.lognormvariate(4, 1) for _ in range(5000))
+        hist = LatencyHistogram()
+        for value in values:
+            hist.record(value)
+        for q in (50, 90, 99):
+            exact = values[int(len(values) * q / 100) - 1]
+            assert abs(hist.percentile(q) - exact) / exact < 0.02
+        assert hist.percentile(100) == values[-1]
+        assert abs(hist.mean - sum(values) / len(values)) < 1e-6
+        assert len(hist.counts) < 1000
+
+    def test_merge_and_round_trip(self):
+        """Merged histograms equal one built from all values; dicts round-trip."""
+        a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, ms in enumerate([1.5, 20.0, 300.0, 4000.0, 0.2]):
+            (a if i % 2 else b).record(ms)
+            both.record(ms)
+        merged = a.merge(b)
+        assert merged.to_dict() == both.to_dict()
+        restored = LatencyHistogram.from_dict(merged.to_dict())
+        assert restored.percentile(60) == both.percentile(60)
+        assert LatencyHistogram().percentile(50) is None
+
+
+class TestSummaryTelemetry:
+    """Tests for per-config telemetry in protocol summaries."""
+
+    def test_summary_aggregates_events(self):
+        """Status, errors and byte totals are aggregated; untimed events are skipped."""
+        records = [
+            {"latency_ms": 10.0, "status": 200, "request_bytes": 5, "response_bytes": 50},
+            {"latency_ms": 30.0, "status": 429, "retries": 2},
+            {"latency_ms": 5.0, "error": "ConnectionError"},
+            None,
+        ]
+        events = [
+            ProtocolEvent.create("a", "fp", "POST", "http://x/v1", {}, telemetry=record)
+            for record in records
+        ]
+        summary = ProtocolSummary.from_dict(ProtocolSummary.from_events("a", events).to_dict())
+        telemetry = summary.telemetry
+        assert telemetry["calls"] == 3
+        assert telemetry["status"] == {"200": 1, "429": 1}
+        assert telemetry["errors"] == {"ConnectionError": 1}
+        assert (telemetry["request_bytes"], telemetry["response_bytes"]) == (5, 50)
+        assert telemetry["retries"] == 2
+        assert summary.latency().max_ms == 30.0
+        assert summarize_telemetry([None]) == {}
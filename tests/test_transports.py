@@ -0,0 +1,183 @@
+"""Tests for transport hooks auditing third-party HTTP clients."""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crystallize import explore
+from crystallize.context import current_context
+from crystallize.memory import MemoryStore
+from crystallize.transports import (
+    _aiohttp_on_request_chunk_sent,
+    _aiohttp_on_request_end,
+    _aiohttp_on_request_exception,
+    _aiohttp_on_request_start,
+    audited_pool_manager,
+    begin_call,
+    decode_body,
+    finish_call,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Returns a small JSON document for any POST."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    """Base URL of a local HTTP server."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}/v1/chat"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+class TestCurrentContext:
+    """Tests for finding the running replicate's context."""
+
+    def test_set_during_replicate_only(self):
+        """The context is current inside the function and in its asyncio tasks."""
+        seen = []
+
+        async def in_task():
+            return current_context()
+
+        def fn(config, ctx):
+            seen.append(current_context() is ctx)
+            seen.append(asyncio.run(in_task()) is ctx)
+
+        explore(fn, {"a": {}}, replicates=2, progress=False, store=MemoryStore())
+        assert seen == [True] * 4
+        assert current_context() is None
+
+    def test_decode_body(self):
+        """JSON and form bodies are decoded; anything else is skipped."""
+        assert decode_body(b'{"model": "m"}') == {"model": "m"}
+        assert decode_body("a=1&b=2") == {"a": "1", "b": "2"}
+        assert decode_body(b"\xff\xfe") is None
+        assert decode_body(None) is None
+
+    def test_start_time_is_not_recorded(self):
+        """Events analyzed before a call finishes do not carry its private start time."""
+        seen = []
+
+        def fn(config, ctx):
+            telemetry = begin_call("POST", "http://api.test/v1/chat", b'{"model": "m1"}')
+            seen.extend(event.telemetry for event in ctx.http.events)
+            finish_call(telemetry, 200)
+
+        explore(fn, {"a": {"model": "m1"}}, replicates=1, progress=False, store=MemoryStore())
+        assert len(seen) == 1
+        assert not any(key.startswith("_") for key in seen[0] or {})
+
+
+class TestUrllib3:
+    """Tests for the audited urllib3 pool manager."""
+
+    def test_calls_feed_protocol(self, url):
+        """Requests through the pool are recorded on the current replicate."""
+        http = audited_pool_manager(maxsize=4)
+
+        def fn(config, ctx):
+            body = {"model": config["model"], "temperature": 0.3}
+            http.request("POST", url, body=json.dumps(body).encode())
+
+        exp = explore(
+            fn, {"a": {"model": "m1"}}, replicates=2, progress=False, store=MemoryStore()
+        )
+        summary = exp.protocol["a"]
+        assert summary.audit_evidence["instrumented_call_count"] == 2
+        (call,) = summary.api_calls
+        assert call["path"] == "/v1/chat"
+        assert call["fields"]["model"]["source"] == "config.model"
+        assert summary.telemetry["status"] == {"200": 2}
+        assert summary.telemetry["response_bytes"] == 24
+        sources = {item.field: item.source for item in exp.hidden_variables().items}
+        assert sources["temperature"] == "hardcoded" and "model" not in sources
+
+        http.request("POST", url, body=b"{}")  # outside a replicate: untracked
+
+
+class TestHttpx:
+    """Tests for the httpx transports."""
+
+    def test_sync_and_async(self, url):
+        """Both transports record calls made inside a replicate."""
+        httpx = pytest.importorskip("httpx")
+        from crystallize.transports import httpx_async_transport, httpx_transport
+
+        client = httpx.Client(transport=httpx_transport())
+
+        def fn(config, ctx):
+            client.post(url, json={"model": config["model"]})
+
+            async def call():
+                async with httpx.AsyncClient(transport=httpx_async_transport()) as ac:
+                    await ac.post(url, json={"model": config["model"]})
+
+            asyncio.run(call())
+
+        exp = explore(
+            fn, {"a": {"model": "m1"}}, replicates=1, progress=False, store=MemoryStore()
+        )
+        assert exp.protocol["a"].audit_evidence["instrumented_call_count"] == 2
+
+
+class TestAiohttp:
+    """Tests for the aiohttp trace callbacks (driven with fake trace params)."""
+
+    def test_callbacks_feed_protocol(self):
+        """The body is rebuilt from sent chunks, and failed calls are finished too."""
+        url = "http://api.test/v1/chat"
+
+        async def send(chunks, response=None, exception=None):
+            trace = SimpleNamespace()
+            await _aiohttp_on_request_start(None, trace, SimpleNamespace())
+            for chunk in chunks:
+                await _aiohttp_on_request_chunk_sent(None, trace, SimpleNamespace(chunk=chunk))
+            params = SimpleNamespace(
+                method="POST", url=url, response=response, exception=exception
+            )
+            if exception is None:
+                await _aiohttp_on_request_end(None, trace, params)
+            else:
+                await _aiohttp_on_request_exception(None, trace, params)
+
+        def fn(config, ctx):
+            ok = SimpleNamespace(status=200, headers={"Content-Length": "12"})
+            asyncio.run(send([b'{"model": ', f'"{config["model"]}"}}'.encode()], ok))
+            asyncio.run(send([b'{"model": "m1"}'], exception=ConnectionError()))
+
+        exp = explore(
+            fn, {"a": {"model": "m1"}}, replicates=1, progress=False, store=MemoryStore()
+        )
+        summary = exp.protocol["a"]
+        assert summary.audit_evidence["instrumented_call_count"] == 2
+        (call,) = summary.api_calls
+        assert call["fields"]["model"]["source"] == "config.model"
+        assert summary.telemetry["status"] == {"200": 1}
+        assert summary.telemetry["errors"] == {"ConnectionError": 1}
+        assert summary.telemetry["response_bytes"] == 12
+        assert summary.latency().count == 2